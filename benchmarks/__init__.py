@@ -0,0 +1 @@
+"""Performance benchmarks for the Open5e fetch pipeline"""
@@ -0,0 +1,88 @@
+"""Benchmark and equivalence check: per-item vs. page-at-a-time equipment normalization
+
+Replays /magicitems, /weapons and /armor from the response cache, so fetch
+them once first (python fetch_equipment_data.py), then from the repo root:
+
+    python -m benchmarks.bench_batch_normalizer
+    python -m benchmarks.bench_batch_normalizer --scale 10
+
+Every row built by normalize_equipment_page() is compared with the row
+normalize_equipment_item() builds for the same item; any difference is
+reported and the benchmark exits non-zero. --scale repeats the corpus to
+show how both paths behave on larger pages.
+"""
+import argparse
+import contextlib
+import io
+import timeit
+
+from fetch_equipment_data import EQUIPMENT_ENDPOINTS, Open5eEquipmentFetcher
+from open5e_sync.cache import DEFAULT_CACHE_DIR, ResponseCache
+from open5e_sync.session import create_session
+from open5e_sync.vectorized import parse_equipment_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--base-url', help="API base URL the cache was filled from (default: api.open5e.com)")
+    parser.add_argument('--scale', type=int, default=1, help="Times the corpus is repeated (default: 1)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    session = create_session('D&D Equipment Benchmark', cache=ResponseCache(args.cache_dir), offline=True)
+    fetcher = Open5eEquipmentFetcher(session=session)
+    if args.base_url:
+        fetcher.base_url = args.base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = {item_type: fetcher.fetch_paginated_data(endpoint) * args.scale
+                 for endpoint, item_type in EQUIPMENT_ENDPOINTS.items()}
+    if not any(pages.values()):
+        raise SystemExit("No cached equipment pages found; run fetch_equipment_data.py first")
+
+    total = sum(len(items) for items in pages.values())
+    print(f"Corpus: {total} items ({', '.join(f'{len(items)} {item_type}' for item_type, items in pages.items())})")
+
+    def run_items():
+        return [fetcher.normalize_equipment_item(item, item_type)
+                for item_type, items in pages.items() for item in items]
+
+    def run_pages():
+        return [row for item_type, items in pages.items()
+                for row in fetcher.normalize_equipment_page(items, item_type)]
+
+    # Equivalence first: the page path must build exactly the same rows
+    with contextlib.redirect_stdout(io.StringIO()):
+        item_rows = run_items()
+        page_rows = run_pages()
+    mismatches = [(a, b) for a, b in zip(item_rows, page_rows) if a != b]
+    if len(item_rows) != len(page_rows) or mismatches:
+        for a, b in mismatches[:5]:
+            fields = [field for field in a if a[field] != b.get(field)]
+            print(f"Mismatch for {a['slug']}: " + ", ".join(f"{f}={a[f]!r} vs {b.get(f)!r}" for f in fields))
+        raise SystemExit(f"{len(mismatches)} of {len(item_rows)} rows differ")
+    print(f"Rows identical: {len(item_rows)}/{len(item_rows)}")
+
+    def time_best(func):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+    # The parsed fields alone, then whole rows (properties, AC and logging included)
+    def parse_items():
+        return [fetcher.parse_equipment_fields(item) for items in pages.values() for item in items]
+
+    def parse_pages():
+        return [parse_equipment_columns(items) for items in pages.values()]
+
+    item_parse = time_best(parse_items)
+    page_parse = time_best(parse_pages)
+    item_time = time_best(run_items)
+    page_time = time_best(run_pages)
+    print(f"per-item fields:  {item_parse * 1000:8.2f} ms")
+    print(f"page columns:     {page_parse * 1000:8.2f} ms  ({item_parse / page_parse:.2f}x)")
+    print(f"per-item rows:    {item_time * 1000:8.2f} ms")
+    print(f"page rows:        {page_time * 1000:8.2f} ms  ({item_time / page_time:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""End-to-end fetcher benchmark against a local Open5e stub, with a stored baseline
+
+Starts benchmarks.stub_server in this process and runs fetch_equipment_data.py
+and fetch_character_data.py against it, each in its own process with
+--metrics, then reports per fetcher:
+
+- rows written per second over the whole run
+- p50/p99 latency of every page request
+- peak RSS of the fetcher process
+- normalization items/sec (all normalizers together)
+
+From the repo root:
+
+    python -m benchmarks.bench_fetch                      # compare with benchmarks/baseline.json
+    python -m benchmarks.bench_fetch --scale 10 --error-rate 0.02 --throttle-rps 40
+    python -m benchmarks.bench_fetch --save-baseline      # record this machine's baseline
+
+A result worse than the baseline by more than --tolerance exits non-zero.
+Baselines are only compared when they were recorded with the same scenario
+(scale, corpus, stub faults and fetcher options), and they are only
+meaningful on the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from benchmarks.stub_server import add_stub_arguments, stub_from_args
+from fetch_character_data import CHARACTER_TABLES
+from open5e_sync.delta import _write_json_atomic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baseline.json')
+
+# Script and output tables of each fetcher
+FETCHERS = {
+    'equipment': ('fetch_equipment_data.py', ['open5e_equipment']),
+    'character': ('fetch_character_data.py', [table for table, _ in CHARACTER_TABLES]),
+}
+
+# Reported results and whether a larger value is better
+RESULTS = [
+    ('rows_per_second', True),
+    ('p50_ms', False),
+    ('p99_ms', False),
+    ('peak_rss_mb', False),
+    ('normalize_items_per_second', True),
+]
+
+
+def run_fetcher(name: str, base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one fetcher against the stub and summarize its metrics report"""
+    script, tables = FETCHERS[name]
+    with tempfile.TemporaryDirectory(prefix='open5e-bench-') as workdir:
+        metrics_path = os.path.join(workdir, 'metrics.json')
+        command = [sys.executable, os.path.join(REPO_ROOT, script), '--base-url', base_url,
+                   '--no-cache', '--no-checkpoint', '--no-snapshot',
+                   '--workers', str(args.workers), '--rps', str(args.rps), '--retries', str(args.retries),
+                   '--metrics', metrics_path] + shlex.split(args.fetcher_args)
+        completed = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+        missing = [table for table in tables if not os.path.exists(os.path.join(workdir, f'{table}.csv'))]
+        if completed.returncode != 0 or missing or not os.path.exists(metrics_path):
+            sys.stderr.write(completed.stdout[-2000:] + completed.stderr[-2000:])
+            raise SystemExit(f"{script} failed against the stub (missing: {', '.join(missing) or 'none'})")
+        with open(metrics_path, encoding='utf-8') as f:
+            report = json.load(f)
+
+    stages = report['stages']
+    rows = stages.get('write', {}).get('items', 0)
+    normalizers = [stage for stage_name, stage in stages.items() if stage_name.startswith('normalize ')]
+    normalize_items = sum(stage['items'] for stage in normalizers)
+    normalize_seconds = sum(stage['wall_seconds'] or stage['cpu_seconds'] for stage in normalizers)
+    latency = report['request_latency']
+    return {
+        'rows': rows,
+        'wall_seconds': report['wall_seconds'],
+        'rows_per_second': rows / report['wall_seconds'],
+        'p50_ms': latency['p50'] * 1000 if latency['p50'] is not None else None,
+        'p99_ms': latency['p99'] * 1000 if latency['p99'] is not None else None,
+        'peak_rss_mb': report['peak_rss_bytes'] / 2 ** 20 if report['peak_rss_bytes'] else None,
+        'normalize_items_per_second': normalize_items / normalize_seconds if normalize_seconds else None,
+        'requests': latency['count'],
+        'retries': sum(report['retries'].values()),
+    }
+
+
+def median_results(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each result over repeated runs"""
+    merged = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        merged[key] = statistics.median(values) if values else None
+    return merged
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """Results worse than the baseline by more than `tolerance` (a fraction)"""
+    regressions = []
+    for name, result in results.items():
+        for key, higher_is_better in RESULTS:
+            current, previous = result.get(key), baseline.get(name, {}).get(key)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name} {key}: {current:.1f} vs baseline {previous:.1f} ({change:+.0%})")
+    return regressions
+
+
+def format_value(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_stub_arguments(parser)
+    parser.add_argument('--fetchers', nargs='+', choices=list(FETCHERS), default=list(FETCHERS),
+                        help="Fetchers to run (default: both)")
+    parser.add_argument('--workers', type=int, default=4, help="--workers passed to each fetcher (default: 4)")
+    parser.add_argument('--rps', type=float, default=50.0, help="--rps passed to each fetcher (default: 50)")
+    parser.add_argument('--retries', type=int, default=5, help="--retries passed to each fetcher (default: 5)")
+    parser.add_argument('--fetcher-args', default='',
+                        help="Extra fetcher options, e.g. \"--stream\" or \"--transport async\"")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per fetcher; medians are reported (default: 3)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="Baseline file to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed fraction a result may be worse than the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    scenario = {key: getattr(args, key) for key in ('scale', 'synthetic', 'latency', 'jitter', 'error_rate',
+                                                    'throttle_rps', 'seed', 'workers', 'rps', 'retries',
+                                                    'fetcher_args')}
+    stub = stub_from_args(args)
+    corpus_size = sum(len(items) for items in stub.corpus.values())
+    # Recorded corpora differ between caches, so the corpus size is part of the scenario
+    scenario['corpus_items'] = corpus_size
+    print(f"Stub corpus: {corpus_size} items at scale {args.scale}; latency {args.latency * 1000:.0f} ms, "
+          f"error rate {args.error_rate:.0%}, throttle {args.throttle_rps or 'off'}")
+
+    results = {}
+    with stub:
+        for name in args.fetchers:
+            runs = []
+            for _ in range(args.repeat):
+                runs.append(run_fetcher(name, stub.base_url, args))
+            results[name] = median_results(runs)
+    print(f"Stub served {stub.stats['requests']} requests, {stub.stats['errors']} errors, "
+          f"{stub.stats['throttled']} throttled\n")
+
+    print(f"{'fetcher':<10} {'rows':>8} {'rows/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'RSS MB':>8} {'norm/s':>10} {'retries':>8}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['rows']:>8.0f} {format_value(result['rows_per_second']):>10} "
+              f"{format_value(result['p50_ms']):>8} {format_value(result['p99_ms']):>8} "
+              f"{format_value(result['peak_rss_mb']):>8} "
+              f"{format_value(result['normalize_items_per_second']):>10} {result['retries']:>8.0f}")
+
+    if args.save_baseline:
+        _write_json_atomic(args.baseline, {'scenario': scenario, 'results': results})
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['scenario'] != scenario:
+        changed = sorted(key for key in scenario if baseline['scenario'].get(key) != scenario[key])
+        print(f"\nBaseline was recorded with a different scenario ({', '.join(changed)}); not compared")
+        return
+    regressions = compare(results, baseline['results'], args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print(f"\nWithin {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == '__main__':
+    main()
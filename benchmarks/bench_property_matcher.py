@@ -0,0 +1,85 @@
+"""Micro-benchmark: per-keyword substring scans vs. KeywordMatcher's compiled regex
+
+Runs over the full /magicitems corpus replayed from the response cache, so
+fetch it once first (python fetch_equipment_data.py), then from the repo root:
+
+    python -m benchmarks.bench_property_matcher
+    python -m benchmarks.bench_property_matcher --extra-keywords 200
+
+--extra-keywords pads the keyword list with random words to show how each
+approach scales: the substring scan makes one pass per keyword, the matcher
+one pass in total. At the default 27 keywords the substring scan is about
+2x faster, so KeywordMatcher only switches to the regex at REGEX_MIN_KEYWORDS.
+"""
+import argparse
+import contextlib
+import io
+import random
+import string
+import timeit
+from typing import List
+
+from fetch_equipment_data import (ARMOR_PROPERTIES, MAGIC_PROPERTIES, WEAPON_PROPERTIES,
+                                  Open5eEquipmentFetcher)
+from open5e_sync.cache import DEFAULT_CACHE_DIR, ResponseCache
+from open5e_sync.matching import REGEX_MIN_KEYWORDS, KeywordMatcher
+from open5e_sync.session import create_session
+
+
+def substring_scan(description: str, keywords: List[str]) -> List[str]:
+    """The previous implementation: one `in` scan over the description per keyword"""
+    desc_lower = description.lower()
+    return [prop for prop in keywords if prop in desc_lower]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--base-url', help="API base URL the cache was filled from (default: api.open5e.com)")
+    parser.add_argument('--extra-keywords', type=int, default=0,
+                        help="Random keywords added to the property list")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    session = create_session('D&D Equipment Benchmark', cache=ResponseCache(args.cache_dir), offline=True)
+    fetcher = Open5eEquipmentFetcher(session=session)
+    if args.base_url:
+        fetcher.base_url = args.base_url
+    with contextlib.redirect_stdout(io.StringIO()):
+        descriptions = [item.get('desc') or '' for item in fetcher.iter_paginated_data('/magicitems')]
+    if not descriptions:
+        raise SystemExit("No cached /magicitems pages found; run fetch_equipment_data.py first")
+
+    rng = random.Random(0)
+    keywords = list(dict.fromkeys(WEAPON_PROPERTIES + ARMOR_PROPERTIES + MAGIC_PROPERTIES))
+    keywords += [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+                 for _ in range(args.extra_keywords)]
+    # Always the regex, whatever the keyword count
+    matcher = KeywordMatcher(keywords, regex_min_keywords=0)
+
+    total_chars = sum(len(desc) for desc in descriptions)
+    print(f"Corpus: {len(descriptions)} descriptions, {total_chars} characters, {len(keywords)} keywords")
+
+    def run_scan():
+        for desc in descriptions:
+            substring_scan(desc, keywords)
+
+    def run_matcher():
+        for desc in descriptions:
+            matcher.find_all(desc)
+
+    scan_time = min(timeit.repeat(run_scan, number=1, repeat=args.repeat))
+    matcher_time = min(timeit.repeat(run_matcher, number=1, repeat=args.repeat))
+    print(f"substring scan:  {scan_time * 1000:8.2f} ms")
+    print(f"regex matcher:   {matcher_time * 1000:8.2f} ms  ({scan_time / matcher_time:.2f}x)")
+    mode = 'regex' if len(keywords) >= REGEX_MIN_KEYWORDS else 'substring scan'
+    print(f"KeywordMatcher uses the {mode} at {len(keywords)} keywords (regex from {REGEX_MIN_KEYWORDS})")
+
+    # Where the two disagree, the regex is dropping substring false positives
+    changed = sum(1 for desc in descriptions
+                  if set(substring_scan(desc, keywords)) != set(matcher.find_all(desc)))
+    print(f"Descriptions with different results: {changed}/{len(descriptions)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""Local stand-in for api.open5e.com, for benchmarks that must not touch the real API
+
+Serves every registered endpoint (/magicitems, /weapons, /armor, /races,
+/classes, /spells, /backgrounds) with Open5e-style page-number pagination:
+
+    GET /magicitems?limit=1000&page=2 -> {"count", "next", "previous", "results"}
+
+Items come from the response cache when the endpoint was fetched before
+(recorded pages), otherwise they are generated. --scale repeats the corpus
+with unique slugs and names, so a 100x corpus also dedups to 100x the rows.
+Each response can be delayed (--latency, --jitter), fail with a 500
+(--error-rate) or be throttled with a 429 and Retry-After (--throttle-rps).
+
+Run on its own and point a fetcher at it:
+
+    python -m benchmarks.stub_server --port 8765 --scale 10 --latency 0.05
+    python fetch_equipment_data.py --base-url http://127.0.0.1:8765 --no-cache
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Importing the fetchers registers their endpoints
+import fetch_character_data  # noqa: F401
+import fetch_equipment_data  # noqa: F401
+from open5e_sync.cache import DEFAULT_CACHE_DIR, ResponseCache
+from open5e_sync.engine import FetchEngine
+from open5e_sync.registry import ENDPOINTS
+from open5e_sync.session import create_session
+
+# Roughly the size of each endpoint on api.open5e.com, for generated corpora
+SYNTHETIC_COUNTS = {
+    '/magicitems': 1600,
+    '/weapons': 75,
+    '/armor': 25,
+    '/races': 50,
+    '/classes': 12,
+    '/spells': 1400,
+    '/backgrounds': 50,
+}
+
+# The API never returns more than this many items per page
+MAX_PAGE_SIZE = 1000
+
+DOCUMENTS = ['wotc-srd', 'tob', 'cc', 'a5e', 'kp']
+RARITIES = ['common', 'uncommon', 'rare', 'very rare', 'legendary', 'artifact', None]
+DAMAGE_TYPES = ['slashing', 'piercing', 'bludgeoning', 'fire', 'cold', 'lightning']
+SCHOOLS = ['Abjuration', 'Conjuration', 'Divination', 'Enchantment', 'Evocation', 'Illusion', 'Necromancy']
+CLASSES = ['Bard', 'Cleric', 'Druid', 'Paladin', 'Ranger', 'Sorcerer', 'Warlock', 'Wizard']
+
+DESCRIPTION = ("While wearing this item you gain a +1 bonus to AC. This very rare, light and finesse "
+               "item requires attunement by a spellcaster. It is a magical object that sheds dim light. ")
+
+
+def synthetic_item(endpoint: str, index: int) -> Dict[str, Any]:
+    """A deterministic fake item shaped like the endpoint's real ones"""
+    rng = random.Random(f"{endpoint}:{index}")
+    name = f"{endpoint.strip('/').title()} {index}"
+    item = {
+        'slug': name.lower().replace(' ', '-'),
+        'name': name,
+        'desc': DESCRIPTION * rng.randint(1, 6),
+        'document__slug': rng.choice(DOCUMENTS),
+    }
+    if endpoint == '/magicitems':
+        item.update(type='Wondrous item', rarity=rng.choice(RARITIES),
+                    requires_attunement=rng.choice(['requires attunement', '']))
+    elif endpoint == '/weapons':
+        item.update(category=rng.choice(['Simple Melee Weapons', 'Martial Ranged Weapons']),
+                    cost=f"{rng.randint(1, 50)} gp", weight=f"{rng.choice(['1/2', '2', '3'])} lb.",
+                    damage=f"1d{rng.choice([4, 6, 8, 10, 12])} {rng.choice(DAMAGE_TYPES)}",
+                    properties=rng.sample(['light', 'finesse', 'thrown', 'versatile (1d10)', 'heavy'], 2))
+    elif endpoint == '/armor':
+        item.update(category=rng.choice(['Light Armor', 'Medium Armor', 'Heavy Armor']),
+                    cost=f"{rng.randint(5, 1500):,} gp", weight=f"{rng.randint(8, 65)} lb.",
+                    ac_base=rng.randint(11, 18), ac_add_dex=rng.choice([True, False]),
+                    ac_cap_dex=rng.choice([None, 2]), stealth_disadvantage=rng.choice([True, False]))
+        if index % 10 == 0:
+            item['name'] = item['name'] + ' Shield'
+    elif endpoint == '/races':
+        item.update(asi_desc="Your Dexterity score increases by 2.",
+                    asi=[{'attributes': ['Dexterity'], 'value': 2}], age="Adults at 20.",
+                    alignment="Usually neutral.", size="Medium", speed={'walk': 30},
+                    languages="Common and one other.", traits="Darkvision.")
+    elif endpoint == '/classes':
+        item.update(hit_dice='1d10', hit_die=rng.choice([6, 8, 10, 12]), prof_armor='Light armor',
+                    prof_weapons='Simple weapons', prof_tools='None', prof_saving_throws='Strength, Constitution',
+                    prof_skills='Choose two', equipment='A longsword', spellcasting_ability='',
+                    subtypes_name='Archetypes', archetypes=[])
+    elif endpoint == '/spells':
+        level = rng.randint(0, 9)
+        item.update(level=f"{level}th-level" if level else 'Cantrip', level_int=level,
+                    school=rng.choice(SCHOOLS), casting_time='1 action', range='60 feet',
+                    components='V, S, M', material='A pinch of salt', duration='Instantaneous',
+                    ritual=rng.choice(['yes', 'no']), concentration=rng.choice(['yes', 'no']),
+                    dnd_class=', '.join(rng.sample(CLASSES, 3)),
+                    higher_level='The damage increases by 1d6 for each slot level above 1st.')
+    elif endpoint == '/backgrounds':
+        item.update(skill_proficiencies='Insight, Religion', languages='Two of your choice',
+                    equipment='A holy symbol', feature='Shelter of the Faithful', feature_desc='...')
+    return item
+
+
+def recorded_items(cache_dir: str, base_url: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Items of every endpoint found in the response cache, keyed by endpoint"""
+    if not os.path.isdir(cache_dir):
+        return {}
+    session = create_session('D&D Benchmark Stub', cache=ResponseCache(cache_dir), offline=True)
+    engine = FetchEngine(session=session)
+    if base_url:
+        engine.base_url = base_url
+    items = {}
+    for endpoint in ENDPOINTS:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                items[endpoint] = engine.fetch_paginated_data(endpoint)
+        except Exception:
+            # Never fetched into this cache; the stub generates this endpoint
+            continue
+    return items
+
+
+def build_corpus(scale: int = 1, cache_dir: Optional[str] = None,
+                 base_url: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Items per endpoint: recorded where the cache has them, generated otherwise, repeated `scale` times"""
+    recorded = recorded_items(cache_dir, base_url) if cache_dir else {}
+    corpus = {}
+    for endpoint in ENDPOINTS:
+        base = recorded.get(endpoint) or [synthetic_item(endpoint, index)
+                                          for index in range(SYNTHETIC_COUNTS.get(endpoint, 100))]
+        items = list(base)
+        for copy in range(1, scale):
+            for item in base:
+                # Unique slug and name, so the copies survive dedup like real items would
+                items.append(dict(item, slug=f"{item.get('slug', '')}-x{copy}",
+                                  name=f"{item.get('name', '')} x{copy}"))
+        corpus[endpoint] = items
+    return corpus
+
+
+class StubServer:
+    """Threaded HTTP server answering paginated Open5e requests from an in-memory corpus"""
+
+    def __init__(self, corpus: Dict[str, List[Dict[str, Any]]], host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rps: Optional[float] = None, seed: int = 0):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                status, headers, body = stub.respond(self.path, self.headers.get('Host'))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def _throttled(self) -> bool:
+        """Sliding one-second window: more than throttle_rps requests in it are refused"""
+        if not self.throttle_rps:
+            return False
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] >= 1.0:
+            self.recent.popleft()
+        if len(self.recent) >= self.throttle_rps:
+            return True
+        self.recent.append(now)
+        return False
+
+    def respond(self, path: str, host: str):
+        parsed = urlparse(path)
+        endpoint = '/' + parsed.path.strip('/').split('/')[-1]
+        if endpoint not in self.corpus:
+            return 404, {}, b''
+        query = parse_qs(parsed.query)
+        limit = min(int(query.get('limit', ['50'])[0]), MAX_PAGE_SIZE)
+        page = int(query.get('page', ['1'])[0])
+
+        with self.lock:
+            self.stats['requests'] += 1
+            if self._throttled():
+                self.stats['throttled'] += 1
+                return 429, {'Retry-After': '1'}, b''
+            failed = self.rng.random() < self.error_rate
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            if failed:
+                self.stats['errors'] += 1
+        time.sleep(delay)
+        if failed:
+            return 500, {}, b''
+        return 200, {'Content-Type': 'application/json'}, self._page(endpoint, limit, page, host)
+
+    @lru_cache(maxsize=4096)
+    def _page(self, endpoint: str, limit: int, page: int, host: str) -> bytes:
+        items = self.corpus[endpoint]
+        start = (page - 1) * limit
+        next_url = f"http://{host}{endpoint}/?limit={limit}&page={page + 1}" if start + limit < len(items) else None
+        previous_url = f"http://{host}{endpoint}/?limit={limit}&page={page - 1}" if page > 1 else None
+        return json.dumps({'count': len(items), 'next': next_url, 'previous': previous_url,
+                           'results': items[start:start + limit]}).encode('utf-8')
+
+    def start(self) -> 'StubServer':
+        self.thread = threading.Thread(target=self.server.serve_forever, name='open5e-stub', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    """Corpus and fault-injection options shared by the stub and the benchmark harness"""
+    parser.add_argument('--scale', type=int, default=1, help="Times the corpus is repeated (default: 1)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="Serve endpoints recorded in this response cache; others are generated")
+    parser.add_argument('--synthetic', action='store_true', help="Generate every endpoint, ignoring the cache")
+    parser.add_argument('--recorded-base-url',
+                        help="API base URL the cache was filled from (default: api.open5e.com)")
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every response (default: 0.05)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Random +/- seconds around --latency (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fraction of requests answered with a 500 (default: 0)")
+    parser.add_argument('--throttle-rps', type=float,
+                        help="Answer 429 + Retry-After beyond this many requests per second (default: off)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for injected latency and errors (default: 0)")
+
+
+def stub_from_args(args: argparse.Namespace, port: int = 0) -> StubServer:
+    corpus = build_corpus(args.scale, None if args.synthetic else args.cache_dir, args.recorded_base_url)
+    return StubServer(corpus, port=port, latency=args.latency, jitter=args.jitter,
+                      error_rate=args.error_rate, throttle_rps=args.throttle_rps, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_from_args(args, args.port)
+    counts = ", ".join(f"{endpoint} {len(items)}" for endpoint, items in stub.corpus.items())
+    print(f"Serving {counts} at {stub.base_url} (Ctrl+C to stop)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        print(f"{stub.stats['requests']} requests, {stub.stats['errors']} errors, "
+              f"{stub.stats['throttled']} throttled")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+# The same run as `python -m open5e_sync sync`; see open5e_sync/cli.py for the options
+from open5e_sync.cli import sync_main
+
+def main():
+    sync_main()
+
+if __name__ == "__main__":
+    main()
@@ -1,130 +1,86 @@
 
 import requests
-import csv
 import json
-from typing import List, Dict, Any, Optional
-import time
-import re
+from typing import List, Dict, Any, Optional, Iterator
 
-class Open5eCharacterDataFetcher:
-    def __init__(self):
-        self.base_url = 'https://api.open5e.com'
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'D&D Character Data Fetcher'
-        })
-        # Increase timeout for problematic endpoints
-        self.timeout = 60
-        self.max_retries = 3
-    
-    def fetch_paginated_data(self, endpoint: str) -> List[Dict[str, Any]]:
-        """Fetch all data from a paginated endpoint with retry logic"""
-        all_results = []
-        url = f"{self.base_url}{endpoint}?limit=100"  # Smaller page size to reduce timeout risk
-        
-        while url:
-            print(f"Fetching: {url}")
-            
-            # Retry logic for failed requests
-            for attempt in range(self.max_retries):
-                try:
-                    response = self.session.get(url, timeout=self.timeout)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    all_results.extend(data.get('results', []))
-                    url = data.get('next')
-                    
-                    # Rate limiting - be nice to the API
-                    time.sleep(1.0)  # Increased delay
-                    break
-                    
-                except requests.exceptions.Timeout as e:
-                    print(f"Timeout on attempt {attempt + 1}/{self.max_retries}: {e}")
-                    if attempt < self.max_retries - 1:
-                        wait_time = (attempt + 1) * 5  # Progressive backoff
-                        print(f"Waiting {wait_time} seconds before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"Failed to fetch {url} after {self.max_retries} attempts")
-                        return all_results  # Return what we have so far
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"Error fetching {url}: {e}")
-                    if attempt < self.max_retries - 1:
-                        wait_time = (attempt + 1) * 2
-                        print(f"Waiting {wait_time} seconds before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"Failed to fetch {url} after {self.max_retries} attempts")
-                        return all_results
-                
-        print(f"Fetched {len(all_results)} items from {endpoint}")
-        return all_results
+from open5e_sync.async_transport import AsyncTransport
+from open5e_sync.checkpoint import CheckpointStore
+from open5e_sync.cli import SyncPreset, sync_main
+from open5e_sync.dedup import MergeSpec, is_empty, register_merge
+from open5e_sync.engine import FetchEngine
+from open5e_sync.log import item_logger
+from open5e_sync.metrics import Metrics
+from open5e_sync.parsing import (ARCHETYPE_PATTERNS, SUBRACE_PATTERNS, format_parse_cache_stats, parse_asi,
+                                  parse_hit_die, parse_speed, parse_spell_classes, parse_spell_mechanics)
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.registry import EndpointSpec, register_endpoint
+from open5e_sync.snapshot import SnapshotRun
+from open5e_sync.stats import StatsSpec, register_stats
+
+USER_AGENT = 'D&D Character Data Fetcher'
+
+# CSV fieldnames for each data type, matching the Supabase tables
+RACE_FIELDNAMES = [
+    'slug', 'name', 'description', 'asi', 'age', 'alignment', 'size',
+    'speed', 'languages', 'proficiencies', 'traits', 'document_slug', 'subraces'
+]
+
+CLASS_FIELDNAMES = [
+    'slug', 'name', 'description', 'hit_die', 'prof_armor', 'prof_weapons',
+    'prof_tools', 'prof_saving_throws', 'prof_skills', 'equipment',
+    'spellcasting_ability', 'subtypes_name', 'document_slug', 'archetypes'
+]
+
+SPELL_FIELDNAMES = [
+    'slug', 'name', 'description', 'level', 'school', 'casting_time', 'range_value',
+    'components', 'material', 'duration', 'ritual', 'concentration', 'classes',
+    'higher_level', 'attack_type', 'damage_type', 'save_type', 'document_slug'
+]
+
+BACKGROUND_FIELDNAMES = [
+    'slug', 'name', 'description', 'skill_proficiencies', 'languages',
+    'equipment', 'feature', 'feature_desc', 'document_slug'
+]
+
+# Supabase table and CSV columns for each dataset, in output order
+CHARACTER_TABLES = [
+    ('open5e_races', RACE_FIELDNAMES),
+    ('open5e_classes', CLASS_FIELDNAMES),
+    ('open5e_spells', SPELL_FIELDNAMES),
+    ('open5e_backgrounds', BACKGROUND_FIELDNAMES),
+]
+
+class Open5eCharacterDataFetcher(FetchEngine):
+    def __init__(self, max_workers: int = 1, requests_per_second: float = 1.0,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 normalize_workers: int = 1,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 transport: Optional[AsyncTransport] = None,
+                 snapshot: Optional[SnapshotRun] = None,
+                 replay: Optional[SnapshotRun] = None,
+                 metrics: Optional[Metrics] = None):
+        # Session, cache, limiter, pagination and CSV output come from the shared engine
+        super().__init__(max_workers=max_workers, requests_per_second=requests_per_second,
+                         session=session, rate_limiter=rate_limiter, normalize_workers=normalize_workers,
+                         checkpoints=checkpoints, transport=transport, snapshot=snapshot,
+                         replay=replay, metrics=metrics, user_agent=USER_AGENT)
     
     def parse_asi_data(self, asi_data: Any) -> List[Dict[str, Any]]:
         """Parse ability score improvement data"""
-        if not asi_data:
-            return []
-        
-        if isinstance(asi_data, str):
-            # Try to parse simple formats like "Dex +2, Con +1"
-            asi_list = []
-            # Match patterns like "Dex +2", "Constitution +1", etc.
-            matches = re.findall(r'(\w+)\s*\+(\d+)', asi_data)
-            for attr, value in matches:
-                # Normalize attribute names
-                attr_map = {
-                    'str': 'strength', 'dex': 'dexterity', 'con': 'constitution',
-                    'int': 'intelligence', 'wis': 'wisdom', 'cha': 'charisma',
-                    'strength': 'strength', 'dexterity': 'dexterity', 
-                    'constitution': 'constitution', 'intelligence': 'intelligence',
-                    'wisdom': 'wisdom', 'charisma': 'charisma'
-                }
-                normalized_attr = attr_map.get(attr.lower(), attr.lower())
-                asi_list.append({
-                    'attributes': [normalized_attr],
-                    'value': int(value)
-                })
-            return asi_list
-        
-        if isinstance(asi_data, list):
-            return asi_data
-        
-        return []
+        return parse_asi(asi_data)
     
     def parse_speed_data(self, speed_data: Any) -> Dict[str, int]:
         """Parse speed data from various formats"""
-        if not speed_data:
-            return {'walk': 30}  # Default walking speed
-        
-        if isinstance(speed_data, dict):
-            return speed_data
-        
-        if isinstance(speed_data, str):
-            # Try to parse formats like "30 feet", "25 ft", etc.
-            speed_match = re.search(r'(\d+)', speed_data)
-            if speed_match:
-                return {'walk': int(speed_match.group(1))}
-        
-        if isinstance(speed_data, int):
-            return {'walk': speed_data}
-        
-        return {'walk': 30}  # Default fallback
+        return parse_speed(speed_data)
     
     def extract_subraces_from_desc(self, description: str, name: str) -> List[Dict[str, str]]:
         """Extract subrace information from description"""
         subraces = []
         
         # Look for common subrace patterns in descriptions
-        subrace_patterns = [
-            r'(\w+)\s+(?:dwarf|elf|halfling|gnome|dragonborn)',
-            r'(?:variant|subrace):\s*(\w+)',
-            r'(\w+)\s+heritage',
-        ]
-        
-        for pattern in subrace_patterns:
-            matches = re.findall(pattern, description, re.IGNORECASE)
+        for pattern in SUBRACE_PATTERNS:
+            matches = pattern.findall(description)
             for match in matches:
                 if match.lower() not in name.lower():
                     subraces.append({
@@ -139,13 +95,8 @@ class Open5eCharacterDataFetcher:
         archetypes = []
         
         # Look for common archetype patterns
-        archetype_patterns = [
-            r'(?:archetype|path|tradition|circle|oath|domain|patron|school):\s*([^.\n]+)',
-            r'(\w+\s+\w+)(?:\s+archetype|\s+path|\s+tradition)',
-        ]
-        
-        for pattern in archetype_patterns:
-            matches = re.findall(pattern, description, re.IGNORECASE)
+        for pattern in ARCHETYPE_PATTERNS:
+            matches = pattern.findall(description)
             for match in matches:
                 clean_match = match.strip()
                 if len(clean_match) > 3:  # Avoid single letters/short matches
@@ -159,7 +110,7 @@ class Open5eCharacterDataFetcher:
     def normalize_race_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize a race item to match Supabase schema"""
         
-        print(f"Processing race: {item.get('name', 'Unknown')}")
+        item_logger.debug("Processing race: %s", item.get('name', 'Unknown'))
         
         # Parse ASI data
         asi_data = self.parse_asi_data(item.get('asi'))
@@ -168,225 +119,265 @@ class Open5eCharacterDataFetcher:
         speed_data = self.parse_speed_data(item.get('speed'))
         
         # Extract subraces from description
-        subraces = self.extract_subraces_from_desc(item.get('desc', ''), item.get('name', ''))
+        subraces = self.extract_subraces_from_desc(item.get('desc') or '', item.get('name') or '')
         
         normalized_item = {
-            'slug': item.get('slug', ''),
-            'name': item.get('name', ''),
-            'description': item.get('desc', ''),
+            'slug': item.get('slug') or '',
+            'name': item.get('name') or '',
+            'description': item.get('desc') or '',
             'asi': json.dumps(asi_data),
-            'age': item.get('age', ''),
-            'alignment': item.get('alignment', ''),
-            'size': item.get('size', ''),
+            'age': item.get('age') or '',
+            'alignment': item.get('alignment') or '',
+            'size': item.get('size') or '',
             'speed': json.dumps(speed_data),
-            'languages': item.get('languages', ''),
-            'proficiencies': item.get('proficiencies', ''),
-            'traits': item.get('traits', ''),
-            'document_slug': item.get('document__slug', ''),
+            'languages': item.get('languages') or '',
+            'proficiencies': item.get('proficiencies') or '',
+            'traits': item.get('traits') or '',
+            'document_slug': item.get('document__slug') or '',
             'subraces': json.dumps(subraces)
         }
         
         # Log what we extracted for debugging
         if asi_data:
-            print(f"  ASI: {json.dumps(asi_data)}")
+            item_logger.debug("  ASI: %s", normalized_item['asi'])
         if speed_data:
-            print(f"  Speed: {json.dumps(speed_data)}")
+            item_logger.debug("  Speed: %s", normalized_item['speed'])
         if subraces:
-            print(f"  Subraces: {json.dumps(subraces)}")
+            item_logger.debug("  Subraces: %s", normalized_item['subraces'])
         
         return normalized_item
     
     def normalize_class_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize a class item to match Supabase schema"""
         
-        print(f"Processing class: {item.get('name', 'Unknown')}")
+        item_logger.debug("Processing class: %s", item.get('name', 'Unknown'))
         
         # Extract archetypes from description
-        archetypes = self.extract_archetypes_from_desc(item.get('desc', ''))
+        archetypes = self.extract_archetypes_from_desc(item.get('desc') or '')
         
         normalized_item = {
-            'slug': item.get('slug', ''),
-            'name': item.get('name', ''),
-            'description': item.get('desc', ''),
-            'hit_die': item.get('hit_die', 8),  # Default to d8
-            'prof_armor': item.get('prof_armor', ''),
-            'prof_weapons': item.get('prof_weapons', ''),
-            'prof_tools': item.get('prof_tools', ''),
-            'prof_saving_throws': item.get('prof_saving_throws', ''),
-            'prof_skills': item.get('prof_skills', ''),
-            'equipment': item.get('equipment', ''),
-            'spellcasting_ability': item.get('spellcasting_ability', ''),
-            'subtypes_name': item.get('subtypes_name', ''),
-            'document_slug': item.get('document__slug', ''),
+            'slug': item.get('slug') or '',
+            'name': item.get('name') or '',
+            'description': item.get('desc') or '',
+            'hit_die': parse_hit_die(item.get('hit_die')),  # "1d10" -> 10; d8 when missing
+            'prof_armor': item.get('prof_armor') or '',
+            'prof_weapons': item.get('prof_weapons') or '',
+            'prof_tools': item.get('prof_tools') or '',
+            'prof_saving_throws': item.get('prof_saving_throws') or '',
+            'prof_skills': item.get('prof_skills') or '',
+            'equipment': item.get('equipment') or '',
+            'spellcasting_ability': item.get('spellcasting_ability') or '',
+            'subtypes_name': item.get('subtypes_name') or '',
+            'document_slug': item.get('document__slug') or '',
             'archetypes': json.dumps(archetypes)
         }
         
         # Log what we extracted for debugging
         if archetypes:
-            print(f"  Archetypes: {json.dumps(archetypes)}")
-        print(f"  Hit Die: d{normalized_item['hit_die']}")
+            item_logger.debug("  Archetypes: %s", normalized_item['archetypes'])
+        item_logger.debug("  Hit Die: d%s", normalized_item['hit_die'])
+        
+        return normalized_item
+    
+    def parse_flag(self, value: Any) -> bool:
+        """Read Open5e "yes"/"no" flags as well as real booleans"""
+        if isinstance(value, str):
+            return value.strip().lower() in ('yes', 'true')
+        return bool(value)
+    
+    def normalize_spell_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a spell item to match Supabase schema"""
+        
+        item_logger.debug("Processing spell: %s", item.get('name', 'Unknown'))
+        
+        # Attack, damage and save types only appear in the description text
+        attack_type, damage_type, save_type = parse_spell_mechanics(item.get('desc') or '')
+        
+        # "Bard, Wizard" -> [{"name": "Bard"}, {"name": "Wizard"}], as the frontend expects
+        classes = parse_spell_classes(item.get('dnd_class'))
+        
+        # Numeric level ("0" for cantrips), which the frontend parses with parseInt
+        level_int = item.get('level_int')
+        level = str(level_int) if level_int is not None else item.get('level') or '0'
+        
+        normalized_item = {
+            'slug': item.get('slug') or '',
+            'name': item.get('name') or '',
+            'description': item.get('desc') or '',
+            'level': level,
+            'school': item.get('school') or '',
+            'casting_time': item.get('casting_time') or '',
+            'range_value': item.get('range') or '',
+            'components': item.get('components') or '',
+            'material': item.get('material') or '',
+            'duration': item.get('duration') or '',
+            'ritual': self.parse_flag(item.get('can_be_cast_as_ritual', item.get('ritual'))),
+            'concentration': self.parse_flag(item.get('requires_concentration', item.get('concentration'))),
+            'classes': json.dumps(classes),
+            'higher_level': item.get('higher_level') or '',
+            'attack_type': attack_type,
+            'damage_type': damage_type,
+            'save_type': save_type,
+            'document_slug': item.get('document__slug') or ''
+        }
+        
+        # Log what we extracted for debugging
+        item_logger.debug("  Level: %s, School: %s", level, normalized_item['school'])
+        if classes:
+            item_logger.debug("  Classes: %s", normalized_item['classes'])
         
         return normalized_item
     
-    def fetch_character_data(self) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Fetch races and classes data from the API"""
-        
-        # Fetch races
-        print("Fetching races...")
-        races_data = self.fetch_paginated_data('/races')
-        races = []
-        for item in races_data:
-            try:
-                normalized = self.normalize_race_item(item)
-                races.append(normalized)
-            except Exception as e:
-                print(f"Error processing race {item.get('name', 'Unknown')}: {e}")
-                continue
-        
-        # Fetch classes
-        print("Fetching classes...")
-        classes_data = self.fetch_paginated_data('/classes')
-        classes = []
-        for item in classes_data:
-            try:
-                normalized = self.normalize_class_item(item)
-                classes.append(normalized)
-            except Exception as e:
-                print(f"Error processing class {item.get('name', 'Unknown')}: {e}")
-                continue
-        
-        # Deduplicate by name (case-insensitive)
-        def deduplicate_by_name(items):
-            seen_names = set()
-            unique_items = []
-            
-            for item in items:
-                name_lower = item['name'].lower()
-                if name_lower not in seen_names:
-                    seen_names.add(name_lower)
-                    unique_items.append(item)
-                else:
-                    print(f"Skipping duplicate: {item['name']}")
-            
-            return unique_items
-        
-        races = deduplicate_by_name(races)
-        classes = deduplicate_by_name(classes)
+    def normalize_background_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a background item to match Supabase schema"""
+        
+        item_logger.debug("Processing background: %s", item.get('name', 'Unknown'))
+        
+        return {
+            'slug': item.get('slug') or '',
+            'name': item.get('name') or '',
+            'description': item.get('desc') or '',
+            'skill_proficiencies': item.get('skill_proficiencies') or '',
+            'languages': item.get('languages') or '',
+            'equipment': item.get('equipment') or '',
+            'feature': item.get('feature') or '',
+            'feature_desc': item.get('feature_desc') or '',
+            'document_slug': item.get('document__slug') or ''
+        }
+    
+    def iter_races(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized, deduplicated races while pages are still being fetched"""
+        return self.iter_table('open5e_races')
+    
+    def iter_classes(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized, deduplicated classes while pages are still being fetched"""
+        return self.iter_table('open5e_classes')
+    
+    def iter_spells(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized, deduplicated spells while pages are still being fetched"""
+        return self.iter_table('open5e_spells')
+    
+    def iter_backgrounds(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized, deduplicated backgrounds while pages are still being fetched"""
+        return self.iter_table('open5e_backgrounds')
+    
+    def fetch_character_data(self, parallel: bool = False) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]],
+                                                                    List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch races, classes, spells and backgrounds data from the API
+        
+        With parallel=True all endpoints are pulled at once; normalization and
+        dedup still run in the same order as a sequential fetch.
+        """
+        
+        print("Fetching races, classes, spells and backgrounds...")
+        tables = self.fetch_tables([table for table, _ in CHARACTER_TABLES], parallel)
+        races, classes, spells, backgrounds = (tables[table] for table, _ in CHARACTER_TABLES)
         
         print(f"Total after deduplication:")
         print(f"  Races: {len(races)}")
         print(f"  Classes: {len(classes)}")
+        print(f"  Spells: {len(spells)}")
+        print(f"  Backgrounds: {len(backgrounds)}")
         
-        return races, classes
-    
-    def save_to_csv(self, data: List[Dict[str, Any]], filename: str, fieldnames: List[str]):
-        """Save data to CSV file"""
-        if not data:
-            print(f"No data to save for {filename}")
-            return
-        
-        print(f"Saving {len(data)} items to {filename}...")
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for item in data:
-                # Ensure all fields are present
-                row = {}
-                for field in fieldnames:
-                    value = item.get(field)
-                    # Convert None to empty string for CSV
-                    if value is None:
-                        row[field] = ''
-                    elif isinstance(value, bool):
-                        row[field] = str(value).lower()  # Convert boolean to lowercase string
-                    else:
-                        row[field] = str(value)
-                
-                writer.writerow(row)
-        
-        print(f"Data saved to {filename}")
+        return races, classes, spells, backgrounds
     
-    def generate_stats_report(self, races: List[Dict[str, Any]], classes: List[Dict[str, Any]]):
-        """Generate a stats report of the fetched data"""
+    def generate_stats_report(self, races: Optional[List[Dict[str, Any]]] = None,
+                              classes: Optional[List[Dict[str, Any]]] = None,
+                              spells: Optional[List[Dict[str, Any]]] = None,
+                              backgrounds: Optional[List[Dict[str, Any]]] = None):
+        """Generate a stats report of the fetched data
+        
+        Uses the stats gathered while this fetcher's rows were produced, so it
+        also works after a streamed run; a list is only scanned (once) when
+        this fetcher didn't fetch that table. Tables that were neither fetched
+        nor passed in are left out of the report.
+        """
+        labels = ('races', 'classes', 'spells', 'backgrounds')
+        reported = {
+            label: self.table_stats(table, rows)
+            for label, (table, _), rows in zip(labels, CHARACTER_TABLES, (races, classes, spells, backgrounds))
+            if rows is not None or table in self.stats
+        }
         print("\n=== CHARACTER DATA STATISTICS ===")
         
-        print(f"Total races: {len(races)}")
-        print(f"Total classes: {len(classes)}")
+        for label, stats in reported.items():
+            print(f"Total {label}: {stats.count}")
         
         # Count by document source
-        def count_by_source(items):
-            source_counts = {}
-            for item in items:
-                source = item.get('document_slug', 'unknown')
-                source_counts[source] = source_counts.get(source, 0) + 1
-            return source_counts
-        
-        print("\nRaces by source:")
-        race_sources = count_by_source(races)
-        for source, count in sorted(race_sources.items()):
-            print(f"  {source}: {count}")
-        
-        print("\nClasses by source:")
-        class_sources = count_by_source(classes)
-        for source, count in sorted(class_sources.items()):
-            print(f"  {source}: {count}")
-        
-        # Sample data
-        print("\nSample races with ASI data:")
-        for race in races[:3]:
-            if race.get('asi') and race['asi'] != '[]':
+        for label, stats in reported.items():
+            print(f"\n{label.capitalize()} by source:")
+            for source, count in stats.breakdown('document_slug'):
+                print(f"  {source}: {count}")
+        
+        if 'spells' in reported:
+            print("\nSpells by level:")
+            for level, count in reported['spells'].breakdown('level'):
+                print(f"  {level}: {count}")
+        
+        # Sample data, drawn from the whole table
+        if 'races' in reported:
+            print("\nSample races with ASI data:")
+            for race in reported['races'].sample('ASI'):
                 print(f"  {race['name']}: ASI {race['asi']}")
         
-        print("\nSample classes with hit dice:")
-        for cls in classes[:3]:
-            print(f"  {cls['name']}: d{cls['hit_die']} hit die")
+        if 'classes' in reported:
+            print("\nSample classes with hit dice:")
+            for cls in reported['classes'].sample('hit die'):
+                print(f"  {cls['name']}: d{cls['hit_die']} hit die")
+        
+        cache_lines = format_parse_cache_stats()
+        if cache_lines:
+            print("\nParser cache:")
+            for line in cache_lines:
+                print(line)
+
+_normalizer: Optional[Open5eCharacterDataFetcher] = None
+
+def _get_normalizer() -> Open5eCharacterDataFetcher:
+    """Fetcher whose normalize methods the registered endpoints use, one per process"""
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = Open5eCharacterDataFetcher()
+    return _normalizer
+
+def normalize_race(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _get_normalizer().normalize_race_item(item)
+
+def normalize_class(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _get_normalizer().normalize_class_item(item)
+
+def normalize_spell(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _get_normalizer().normalize_spell_item(item)
+
+def normalize_background(item: Dict[str, Any]) -> Dict[str, Any]:
+    return _get_normalizer().normalize_background_item(item)
+
+# Smaller pages and a longer timeout: these endpoints have timed out on large pages
+for path, (table, fieldnames), normalize, kind in [
+    ('/races', CHARACTER_TABLES[0], normalize_race, 'race'),
+    ('/classes', CHARACTER_TABLES[1], normalize_class, 'class'),
+    ('/spells', CHARACTER_TABLES[2], normalize_spell, 'spell'),
+    ('/backgrounds', CHARACTER_TABLES[3], normalize_background, 'background'),
+]:
+    register_endpoint(EndpointSpec(path, table, fieldnames, normalize, kind, page_size=100, timeout=60))
+
+register_stats('open5e_races', StatsSpec(samples=[('ASI', lambda row: not is_empty(row.get('asi')))]))
+register_stats('open5e_classes', StatsSpec(samples=[('hit die', lambda row: bool(row.get('hit_die')))]))
+register_stats('open5e_spells', StatsSpec(breakdowns=['level', 'school']))
+
+# The text columns merge; hit_die, level and the spell flags always hold a value
+# (defaults of 8, '0' and false), so a copy's can't be told from a real one
+register_merge('open5e_races', MergeSpec(RACE_FIELDNAMES))
+register_merge('open5e_classes', MergeSpec([field for field in CLASS_FIELDNAMES if field != 'hit_die']))
+register_merge('open5e_spells', MergeSpec([field for field in SPELL_FIELDNAMES
+                                           if field not in ('level', 'ritual', 'concentration')]))
+register_merge('open5e_backgrounds', MergeSpec(BACKGROUND_FIELDNAMES))
 
 def main():
-    print("Starting Open5e Character Data Fetch...")
-    
-    fetcher = Open5eCharacterDataFetcher()
-    
-    try:
-        # Fetch races and classes data only
-        races, classes = fetcher.fetch_character_data()
-        
-        # Generate stats report
-        fetcher.generate_stats_report(races, classes)
-        
-        # Define CSV fieldnames for each data type
-        race_fieldnames = [
-            'slug', 'name', 'description', 'asi', 'age', 'alignment', 'size',
-            'speed', 'languages', 'proficiencies', 'traits', 'document_slug', 'subraces'
-        ]
-        
-        class_fieldnames = [
-            'slug', 'name', 'description', 'hit_die', 'prof_armor', 'prof_weapons',
-            'prof_tools', 'prof_saving_throws', 'prof_skills', 'equipment',
-            'spellcasting_ability', 'subtypes_name', 'document_slug', 'archetypes'
-        ]
-        
-        # Save to CSV files
-        fetcher.save_to_csv(races, 'open5e_races.csv', race_fieldnames)
-        fetcher.save_to_csv(classes, 'open5e_classes.csv', class_fieldnames)
-        
-        print("\n=== FETCH COMPLETE ===")
-        print("Generated files:")
-        print("- open5e_races.csv")
-        print("- open5e_classes.csv")
-        print("\nTo upload to Supabase:")
-        print("1. Go to your Supabase dashboard")
-        print("2. Navigate to Table Editor > [table_name]")
-        print("3. Click 'Insert' > 'Import data from CSV'")
-        print("4. Upload the respective CSV file")
-        print("5. Map the columns (they should auto-match)")
-        print("6. Import the data")
-        
-    except Exception as e:
-        print(f"Error during fetch: {e}")
-        import traceback
-        traceback.print_exc()
+    # The same run as `python -m open5e_sync sync character`; see open5e_sync/cli.py for the options
+    sync_main(preset=SyncPreset(description="Fetch Open5e character data into CSV files", datasets=['character'],
+                                banner="Starting Open5e Character Data Fetch...", parallel=False, user_agent=USER_AGENT,
+                                rps=1.0))
 
 if __name__ == "__main__":
     main()
@@ -1,135 +1,101 @@
 
 import requests
-import csv
 import json
-from typing import List, Dict, Any, Optional
-import time
-import re
+from functools import partial
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 
-class Open5eEquipmentFetcher:
-    def __init__(self):
-        self.base_url = 'https://api.open5e.com'
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'D&D Equipment Data Fetcher'
-        })
-    
-    def fetch_paginated_data(self, endpoint: str) -> List[Dict[str, Any]]:
-        """Fetch all data from a paginated endpoint"""
-        all_results = []
-        url = f"{self.base_url}{endpoint}?limit=1000"
-        
-        while url:
-            print(f"Fetching: {url}")
-            try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                all_results.extend(data.get('results', []))
-                url = data.get('next')
-                
-                # Rate limiting - be nice to the API
-                time.sleep(0.5)
-                
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching {url}: {e}")
-                break
-                
-        print(f"Fetched {len(all_results)} items from {endpoint}")
-        return all_results
+from open5e_sync.async_transport import AsyncTransport
+from open5e_sync.checkpoint import CheckpointStore
+from open5e_sync.cli import SyncPreset, sync_main
+from open5e_sync.dedup import MergeSpec, register_merge
+from open5e_sync.engine import FetchEngine
+from open5e_sync.log import item_logger
+from open5e_sync.matching import KeywordMatcher
+from open5e_sync.metrics import Metrics
+from open5e_sync.parsing import AC_PATTERN, format_parse_cache_stats, parse_cost, parse_damage, parse_weight
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.registry import EndpointSpec, register_endpoint
+from open5e_sync.snapshot import SnapshotRun
+from open5e_sync.stats import StatsSpec, format_share, register_stats
+from open5e_sync.vectorized import parse_equipment_columns
+
+USER_AGENT = 'D&D Equipment Data Fetcher'
+
+# Endpoints in fetch order, mapped to the equipment type their items get
+EQUIPMENT_ENDPOINTS = {
+    '/magicitems': 'magic-item',
+    '/weapons': 'weapon',
+    '/armor': 'armor',
+}
+
+# Common weapon properties
+WEAPON_PROPERTIES = [
+    'light', 'finesse', 'thrown', 'two-handed', 'versatile', 'heavy',
+    'reach', 'loading', 'ammunition', 'special', 'silvered', 'adamantine'
+]
+
+# Common armor properties
+ARMOR_PROPERTIES = [
+    'stealth disadvantage', 'heavy armor', 'medium armor', 'light armor',
+    'shield', 'magical', 'cursed'
+]
+
+# Magic item properties
+MAGIC_PROPERTIES = [
+    'requires attunement', 'cursed', 'sentient', 'artifact', 'legendary',
+    'very rare', 'rare', 'uncommon', 'common'
+]
+
+# CSV headers matching Supabase table structure
+EQUIPMENT_FIELDNAMES = [
+    'slug', 'name', 'type', 'rarity', 'requires_attunement',
+    'cost_quantity', 'cost_unit', 'weight', 'description', 'document_slug',
+    'ac', 'ac_base', 'ac_add_dex', 'ac_cap_dex', 'dex_bonus', 'max_dex_bonus',
+    'damage_dice', 'damage_type', 'category', 'properties'
+]
+
+class Open5eEquipmentFetcher(FetchEngine):
+    def __init__(self, max_workers: int = 1, requests_per_second: float = 2.0,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 normalize_workers: int = 1,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 transport: Optional[AsyncTransport] = None,
+                 vectorized: bool = False,
+                 snapshot: Optional[SnapshotRun] = None,
+                 replay: Optional[SnapshotRun] = None,
+                 metrics: Optional[Metrics] = None):
+        # Session, cache, limiter, pagination and CSV output come from the shared engine
+        super().__init__(max_workers=max_workers, requests_per_second=requests_per_second,
+                         session=session, rate_limiter=rate_limiter, normalize_workers=normalize_workers,
+                         checkpoints=checkpoints, transport=transport, vectorized=vectorized,
+                         snapshot=snapshot, replay=replay, metrics=metrics, user_agent=USER_AGENT)
+        # Compiled once and reused for every item description
+        self.property_matcher = KeywordMatcher(WEAPON_PROPERTIES + ARMOR_PROPERTIES + MAGIC_PROPERTIES)
     
     def parse_cost_from_string(self, cost_str: str) -> tuple[Optional[int], Optional[str]]:
         """Parse cost from various string formats"""
-        if not cost_str or cost_str.lower() in ['—', '-', 'varies', 'special']:
-            return None, None
-        
-        # Handle formats like "2 gp", "50 sp", "1,500 gp", etc.
-        cost_patterns = [
-            r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*([a-z]{2})',  # "1,500 gp" or "2.5 gp"
-            r'(\d+(?:,\d{3})*)\s*([a-z]{2})',           # "50 sp"
-            r'(\d+)\s*([a-z]{2})',                       # "2 gp"
-        ]
-        
-        for pattern in cost_patterns:
-            match = re.search(pattern, cost_str.lower())
-            if match:
-                quantity_str = match.group(1).replace(',', '')
-                try:
-                    quantity = int(float(quantity_str))
-                    unit = match.group(2)
-                    return quantity, unit
-                except ValueError:
-                    continue
-        
-        return None, None
+        return parse_cost(cost_str)
     
     def parse_weight_from_string(self, weight_str: str) -> Optional[float]:
         """Parse weight from string format"""
-        if not weight_str or weight_str.lower() in ['—', '-', 'varies']:
-            return None
-        
-        # Handle formats like "3 lb.", "1/2 lb.", "0.5 lb", etc.
-        weight_patterns = [
-            r'(\d+(?:\.\d+)?)\s*lbs?\.?',               # "3 lb." or "3.5 lbs"
-            r'(\d+)/(\d+)\s*lbs?\.?',                   # "1/2 lb."
-            r'(\d+(?:\.\d+)?)',                         # Just numbers
-        ]
-        
-        for pattern in weight_patterns:
-            match = re.search(pattern, weight_str.lower())
-            if match:
-                if '/' in pattern and len(match.groups()) == 2:
-                    # Handle fractions
-                    numerator = float(match.group(1))
-                    denominator = float(match.group(2))
-                    return numerator / denominator
-                else:
-                    try:
-                        return float(match.group(1))
-                    except ValueError:
-                        continue
-        
-        return None
+        return parse_weight(weight_str)
     
     def extract_properties_from_desc(self, description: str, item_type: str) -> List[str]:
         """Extract properties from item description"""
         if not description:
             return []
         
-        properties = []
-        desc_lower = description.lower()
-        
-        # Common weapon properties
-        weapon_properties = [
-            'light', 'finesse', 'thrown', 'two-handed', 'versatile', 'heavy',
-            'reach', 'loading', 'ammunition', 'special', 'silvered', 'adamantine'
-        ]
-        
-        # Common armor properties
-        armor_properties = [
-            'stealth disadvantage', 'heavy armor', 'medium armor', 'light armor',
-            'shield', 'magical', 'cursed'
-        ]
-        
-        # Magic item properties
-        magic_properties = [
-            'requires attunement', 'cursed', 'sentient', 'artifact', 'legendary',
-            'very rare', 'rare', 'uncommon', 'common'
-        ]
-        
-        all_properties = weapon_properties + armor_properties + magic_properties
-        
-        for prop in all_properties:
-            if prop in desc_lower:
-                properties.append(prop.title())
-        
-        return properties
+        return [prop.title() for prop in self.property_matcher.find_all(description)]
     
     def normalize_equipment_item(self, item: Dict[str, Any], item_type: str) -> Dict[str, Any]:
         """Normalize an equipment item to match Supabase schema"""
         
-        print(f"Processing {item_type}: {item.get('name', 'Unknown')}")
+        item_logger.debug("Processing %s: %s", item_type, item.get('name', 'Unknown'))
+        return self.build_equipment_row(item, item_type, self.parse_equipment_fields(item))
+    
+    def parse_equipment_fields(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse cost, weight, damage, rarity and attunement from a raw item"""
         
         # Handle cost data with improved parsing
         cost_quantity = None
@@ -158,18 +124,59 @@ class Open5eEquipmentFetcher:
                 damage_type = item['damage'].get('damage_type')
             elif isinstance(item['damage'], str):
                 # Try to parse damage string
-                damage_match = re.search(r'(\d+d\d+(?:\+\d+)?)\s+(\w+)', item['damage'])
-                if damage_match:
-                    damage_dice = damage_match.group(1)
-                    damage_type = damage_match.group(2)
+                damage_dice, damage_type = parse_damage(item['damage'])
+        
+        # Handle rarity with better defaults
+        rarity = item.get('rarity', 'common')
+        if not rarity or (isinstance(rarity, str) and rarity.lower() == 'none'):
+            rarity = 'common'
+        
+        # Handle attunement
+        requires_attunement = item.get('requires_attunement', False)
+        if not requires_attunement and item.get('desc'):
+            requires_attunement = 'requires attunement' in item['desc'].lower()
+        
+        return {
+            'cost_quantity': cost_quantity,
+            'cost_unit': cost_unit,
+            'weight': weight,
+            'damage_dice': damage_dice,
+            'damage_type': damage_type,
+            'rarity': rarity,
+            'requires_attunement': requires_attunement,
+        }
+    
+    def normalize_equipment_page(self, items: List[Dict[str, Any]], item_type: str) -> List[Dict[str, Any]]:
+        """Normalize a whole page of items, parsing the scalar fields column by column
+        
+        Produces the same rows as calling normalize_equipment_item on each item;
+        parse_equipment_columns does the work of parse_equipment_fields for the
+        whole page at once.
+        """
+        columns = parse_equipment_columns(items)
+        fields = list(columns)
+        rows = []
+        for item, values in zip(items, zip(*columns.values())):
+            item_logger.debug("Processing %s: %s", item_type, item.get('name', 'Unknown'))
+            rows.append(self.build_equipment_row(item, item_type, dict(zip(fields, values))))
+        return rows
+    
+    def build_equipment_row(self, item: Dict[str, Any], item_type: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Finish a normalized row from the raw item and its parsed cost, weight,
+        damage, rarity and attunement fields"""
+        cost_quantity = parsed['cost_quantity']
+        cost_unit = parsed['cost_unit']
+        weight = parsed['weight']
+        damage_dice = parsed['damage_dice']
+        damage_type = parsed['damage_type']
         
         # Handle properties with better extraction
         properties = item.get('properties', [])
         if isinstance(properties, list):
-            # Add extracted properties from description
-            desc_properties = self.extract_properties_from_desc(item.get('desc', ''), item_type)
-            properties.extend(desc_properties)
-            properties = list(set(properties))  # Remove duplicates
+            # Add extracted properties from description (on a copy; the raw item is left alone)
+            desc_properties = self.extract_properties_from_desc(item.get('desc') or '', item_type)
+            properties = properties + desc_properties
+            properties = list(dict.fromkeys(properties))  # Remove duplicates, keeping a stable order
             properties_json = json.dumps(properties)
         else:
             properties_json = json.dumps([])
@@ -180,7 +187,7 @@ class Open5eEquipmentFetcher:
         
         # For armor, use more specific typing
         if item_type == 'armor':
-            if 'shield' in item.get('name', '').lower():
+            if 'shield' in (item.get('name') or '').lower():
                 equipment_type = 'shield'
                 category = 'shield'
             else:
@@ -199,33 +206,23 @@ class Open5eEquipmentFetcher:
         
         # Extract AC info from description if not in structured data
         if not ac and item_type in ['armor', 'shield']:
-            desc = item.get('desc', '')
-            ac_match = re.search(r'AC (\d+)', desc)
+            desc = item.get('desc') or ''
+            ac_match = AC_PATTERN.search(desc)
             if ac_match:
                 ac = int(ac_match.group(1))
                 ac_base = ac
         
-        # Handle rarity with better defaults
-        rarity = item.get('rarity', 'common')
-        if not rarity or rarity.lower() == 'none':
-            rarity = 'common'
-        
-        # Handle attunement
-        requires_attunement = item.get('requires_attunement', False)
-        if not requires_attunement and item.get('desc', ''):
-            requires_attunement = 'requires attunement' in item['desc'].lower()
-        
         normalized_item = {
-            'slug': item.get('slug', ''),
-            'name': item.get('name', ''),
+            'slug': item.get('slug') or '',
+            'name': item.get('name') or '',
             'type': equipment_type,
-            'rarity': rarity,
-            'requires_attunement': requires_attunement,
+            'rarity': parsed['rarity'],
+            'requires_attunement': parsed['requires_attunement'],
             'cost_quantity': cost_quantity,
             'cost_unit': cost_unit,
             'weight': weight,
-            'description': item.get('desc', ''),
-            'document_slug': item.get('document__slug', ''),
+            'description': item.get('desc') or '',
+            'document_slug': item.get('document__slug') or '',
             'ac': ac,
             'ac_base': ac_base,
             'ac_add_dex': ac_add_dex,
@@ -240,183 +237,135 @@ class Open5eEquipmentFetcher:
         
         # Log what we extracted for debugging
         if cost_quantity:
-            print(f"  Cost: {cost_quantity} {cost_unit}")
+            item_logger.debug("  Cost: %s %s", cost_quantity, cost_unit)
         if weight:
-            print(f"  Weight: {weight} lbs")
+            item_logger.debug("  Weight: %s lbs", weight)
         if ac:
-            print(f"  AC: {ac}")
+            item_logger.debug("  AC: %s", ac)
         if damage_dice:
-            print(f"  Damage: {damage_dice} {damage_type}")
+            item_logger.debug("  Damage: %s %s", damage_dice, damage_type)
         if properties and properties != '[]':
-            print(f"  Properties: {properties_json}")
+            item_logger.debug("  Properties: %s", properties_json)
         
         return normalized_item
     
-    def fetch_all_equipment(self) -> List[Dict[str, Any]]:
-        """Fetch all equipment data from multiple endpoints"""
-        all_equipment = []
-        
-        # Fetch magic items
-        print("Fetching magic items...")
-        magic_items = self.fetch_paginated_data('/magicitems')
-        for item in magic_items:
-            normalized = self.normalize_equipment_item(item, 'magic-item')
-            all_equipment.append(normalized)
-        
-        # Fetch weapons
-        print("Fetching weapons...")
-        weapons = self.fetch_paginated_data('/weapons')
-        for item in weapons:
-            normalized = self.normalize_equipment_item(item, 'weapon')
-            all_equipment.append(normalized)
-        
-        # Fetch armor
-        print("Fetching armor...")
-        armor = self.fetch_paginated_data('/armor')
-        for item in armor:
-            normalized = self.normalize_equipment_item(item, 'armor')
-            all_equipment.append(normalized)
+    def iter_all_equipment(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized, deduplicated equipment while pages are still being fetched
         
-        # Deduplicate by name (case-insensitive)
-        seen_names = set()
-        unique_equipment = []
+        Endpoints are read one after another and items are normalized one at a
+        time, so raw pages never pile up in memory.
+        """
+        return self.iter_table('open5e_equipment')
+    
+    def fetch_all_equipment(self, parallel: bool = False) -> List[Dict[str, Any]]:
+        """Fetch all equipment data from multiple endpoints
         
-        for item in all_equipment:
-            name_lower = item['name'].lower()
-            if name_lower not in seen_names:
-                seen_names.add(name_lower)
-                unique_equipment.append(item)
-            else:
-                print(f"Skipping duplicate: {item['name']}")
+        With parallel=True the endpoints are pulled at once; normalization and
+        dedup still run in the same order as a sequential fetch.
+        """
+        print("Fetching magic items, weapons and armor...")
+        unique_equipment = self.fetch_tables(['open5e_equipment'], parallel)['open5e_equipment']
         
         print(f"Total equipment after deduplication: {len(unique_equipment)}")
         return unique_equipment
     
-    def save_to_csv(self, equipment: List[Dict[str, Any]], filename: str = 'open5e_equipment.csv'):
+    def save_to_csv(self, equipment: Iterable[Dict[str, Any]], filename: str = 'open5e_equipment.csv',
+                    fieldnames: List[str] = EQUIPMENT_FIELDNAMES) -> int:
         """Save equipment data to CSV file"""
-        if not equipment:
-            print("No equipment data to save")
-            return
-        
-        # Define CSV headers matching Supabase table structure
-        fieldnames = [
-            'slug', 'name', 'type', 'rarity', 'requires_attunement',
-            'cost_quantity', 'cost_unit', 'weight', 'description', 'document_slug',
-            'ac', 'ac_base', 'ac_add_dex', 'ac_cap_dex', 'dex_bonus', 'max_dex_bonus',
-            'damage_dice', 'damage_type', 'category', 'properties'
-        ]
-        
-        print(f"Saving {len(equipment)} equipment items to {filename}...")
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for item in equipment:
-                # Ensure all fields are present
-                row = {}
-                for field in fieldnames:
-                    value = item.get(field)
-                    # Convert None to empty string for CSV
-                    if value is None:
-                        row[field] = ''
-                    elif isinstance(value, bool):
-                        row[field] = str(value).lower()  # Convert boolean to lowercase string
-                    else:
-                        row[field] = str(value)
-                
-                writer.writerow(row)
-        
-        print(f"Equipment data saved to {filename}")
+        return super().save_to_csv(equipment, filename, fieldnames)
     
-    def generate_stats_report(self, equipment: List[Dict[str, Any]]):
-        """Generate a stats report of the fetched data"""
+    def generate_stats_report(self, equipment: Optional[List[Dict[str, Any]]] = None):
+        """Generate a stats report of the fetched data
+        
+        Uses the stats gathered while this fetcher's rows were produced, so it
+        also works after a streamed run; `equipment` is only scanned (once)
+        when this fetcher didn't fetch it.
+        """
+        stats = self.table_stats('open5e_equipment', equipment)
         print("\n=== EQUIPMENT DATA STATISTICS ===")
-        print(f"Total items: {len(equipment)}")
-        
-        # Count by type
-        type_counts = {}
-        for item in equipment:
-            item_type = item.get('type', 'unknown')
-            type_counts[item_type] = type_counts.get(item_type, 0) + 1
+        print(f"Total items: {stats.count}")
         
         print("\nItems by type:")
-        for item_type, count in sorted(type_counts.items()):
+        for item_type, count in stats.breakdown('type'):
             print(f"  {item_type}: {count}")
         
-        # Count by rarity
-        rarity_counts = {}
-        for item in equipment:
-            rarity = item.get('rarity', 'unknown')
-            rarity_counts[rarity] = rarity_counts.get(rarity, 0) + 1
-        
         print("\nItems by rarity:")
-        for rarity, count in sorted(rarity_counts.items()):
+        for rarity, count in stats.breakdown('rarity'):
             print(f"  {rarity}: {count}")
         
-        # Count items with cost data
-        items_with_cost = len([item for item in equipment if item.get('cost_quantity')])
-        print(f"\nItems with cost data: {items_with_cost}/{len(equipment)} ({items_with_cost/len(equipment)*100:.1f}%)")
-        
-        # Count items with weight data
-        items_with_weight = len([item for item in equipment if item.get('weight')])
-        print(f"Items with weight data: {items_with_weight}/{len(equipment)} ({items_with_weight/len(equipment)*100:.1f}%)")
-        
-        # Count armor with AC data
-        armor_items = [item for item in equipment if item.get('type') in ['armor', 'shield']]
-        armor_with_ac = len([item for item in armor_items if item.get('ac')])
-        if armor_items:
-            print(f"Armor/shields with AC data: {armor_with_ac}/{len(armor_items)} ({armor_with_ac/len(armor_items)*100:.1f}%)")
+        print("\nItems by source:")
+        for source, count in stats.breakdown('document_slug'):
+            print(f"  {source}: {count}")
         
-        # Count weapons with damage data
-        weapon_items = [item for item in equipment if item.get('type') == 'weapon']
-        weapons_with_damage = len([item for item in weapon_items if item.get('damage_dice')])
-        if weapon_items:
-            print(f"Weapons with damage data: {weapons_with_damage}/{len(weapon_items)} ({weapons_with_damage/len(weapon_items)*100:.1f}%)")
+        print(f"\nItems with cost data: {format_share(*stats.coverage_of('cost'))}")
+        print(f"Items with weight data: {format_share(*stats.coverage_of('weight'))}")
+        for label, name in (('armor AC', 'Armor/shields with AC data'), ('weapon damage', 'Weapons with damage data')):
+            filled, total = stats.coverage_of(label)
+            if total:
+                print(f"{name}: {format_share(filled, total)}")
         
-        # Sample of items with all properties
+        # Examples drawn from the whole table, not just its first rows
         print("\nSample armor with AC data:")
-        ac_items = [item for item in equipment if item.get('ac')]
-        for item in ac_items[:3]:
+        for item in stats.sample('AC'):
             print(f"  {item['name']}: AC {item['ac']}, Type: {item['type']}")
         
         print("\nSample weapons with damage:")
-        weapon_items = [item for item in equipment if item.get('damage_dice')]
-        for item in weapon_items[:3]:
+        for item in stats.sample('damage'):
             print(f"  {item['name']}: {item['damage_dice']} {item.get('damage_type', '')} damage")
         
         print("\nSample items with cost:")
-        cost_items = [item for item in equipment if item.get('cost_quantity')]
-        for item in cost_items[:3]:
+        for item in stats.sample('cost'):
             print(f"  {item['name']}: {item['cost_quantity']} {item.get('cost_unit', '')}")
+        
+        cache_lines = format_parse_cache_stats()
+        if cache_lines:
+            print("\nParser cache:")
+            for line in cache_lines:
+                print(line)
+
+_normalizer: Optional[Open5eEquipmentFetcher] = None
+
+def _get_normalizer() -> Open5eEquipmentFetcher:
+    """Fetcher whose normalize methods the registered endpoints use, one per process"""
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = Open5eEquipmentFetcher()
+    return _normalizer
+
+def normalize_equipment(item_type: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    return _get_normalizer().normalize_equipment_item(item, item_type)
+
+def normalize_equipment_page(item_type: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _get_normalizer().normalize_equipment_page(items, item_type)
+
+# All three endpoints feed open5e_equipment and are deduplicated together
+for path, item_type in EQUIPMENT_ENDPOINTS.items():
+    register_endpoint(EndpointSpec(path, 'open5e_equipment', EQUIPMENT_FIELDNAMES,
+                                   partial(normalize_equipment, item_type), item_type,
+                                   page_size=1000, timeout=30,
+                                   normalize_page=partial(normalize_equipment_page, item_type)))
+
+register_stats('open5e_equipment', StatsSpec(
+    breakdowns=['type', 'rarity'],
+    coverage=[('cost', 'cost_quantity', None),
+              ('weight', 'weight', None),
+              ('armor AC', 'ac', lambda row: row.get('type') in ('armor', 'shield')),
+              ('weapon damage', 'damage_dice', lambda row: row.get('type') == 'weapon')],
+    samples=[('AC', lambda row: bool(row.get('ac'))),
+             ('damage', lambda row: bool(row.get('damage_dice'))),
+             ('cost', lambda row: bool(row.get('cost_quantity')))]))
+
+# Rarity defaults to 'common' when the API gives none; copies only fill in copies of the same type
+register_merge('open5e_equipment', MergeSpec(
+    ['rarity', 'cost_quantity', 'cost_unit', 'weight', 'description', 'ac', 'ac_base', 'ac_add_dex',
+     'ac_cap_dex', 'dex_bonus', 'max_dex_bonus', 'damage_dice', 'damage_type', 'properties'],
+    defaults={'rarity': ['common']}, match=['type']))
 
 def main():
-    print("Starting Open5e Equipment Data Fetch...")
-    
-    fetcher = Open5eEquipmentFetcher()
-    
-    try:
-        # Fetch all equipment data
-        equipment = fetcher.fetch_all_equipment()
-        
-        # Generate stats report
-        fetcher.generate_stats_report(equipment)
-        
-        # Save to CSV
-        fetcher.save_to_csv(equipment)
-        
-        print("\n=== FETCH COMPLETE ===")
-        print("You can now upload 'open5e_equipment.csv' to your Supabase table.")
-        print("\nTo upload to Supabase:")
-        print("1. Go to your Supabase dashboard")
-        print("2. Navigate to Table Editor > open5e_equipment")
-        print("3. Click 'Insert' > 'Import data from CSV'")
-        print("4. Upload the generated CSV file")
-        
-    except Exception as e:
-        print(f"Error during fetch: {e}")
-        import traceback
-        traceback.print_exc()
+    # The same run as `python -m open5e_sync sync equipment`; see open5e_sync/cli.py for the options
+    sync_main(preset=SyncPreset(description="Fetch Open5e equipment data into CSV files", datasets=['equipment'],
+                                banner="Starting Open5e Equipment Data Fetch...", parallel=False, user_agent=USER_AGENT,
+                                rps=2.0))
 
 if __name__ == "__main__":
     main()
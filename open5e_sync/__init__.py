@@ -0,0 +1 @@
+"""Shared building blocks for the Open5e data fetch scripts"""
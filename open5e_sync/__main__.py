@@ -0,0 +1,3 @@
+from open5e_sync.cli import main
+
+main()
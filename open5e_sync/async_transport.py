@@ -0,0 +1,170 @@
+"""Optional asyncio HTTP transport built on httpx
+
+One event loop, running in a background thread, owns a single
+httpx.AsyncClient shared by every endpoint. Keep-alive connections are
+pooled and reused, responses are requested gzip/brotli compressed, and a
+semaphore caps the number of requests in flight across the whole process.
+Fetchers keep their synchronous fetch_page/fetch_paginated_data signatures
+and hand each page request to the loop through get_json(). Pagination,
+checkpoints, the response cache, the rate limiter and the retry policy all
+work as they do with requests.
+
+Requires httpx (pip install "httpx[brotli]"); brotli is used when installed.
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from open5e_sync.cache import OfflineCacheMiss, ResponseCache
+from open5e_sync.metrics import Metrics
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.retry import RETRY_STATUSES, RetryPolicy, parse_retry_after
+
+try:
+    import httpx
+except ImportError:  # Only needed for --transport async
+    httpx = None
+
+try:
+    import brotli  # noqa: F401 - httpx decodes "br" only when brotli is installed
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class TransportError(requests.exceptions.RequestException):
+    """A request sent through AsyncTransport failed"""
+
+
+class AsyncTransport:
+    """Pooled, compressed asyncio HTTP client behind a blocking get_json()"""
+
+    def __init__(self, user_agent: str, max_in_flight: int = 16,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None, offline: bool = False,
+                 metrics: Optional[Metrics] = None):
+        if httpx is None:
+            raise RuntimeError('The async transport needs httpx: pip install "httpx[brotli]"')
+        self.max_in_flight = max(1, max_in_flight)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics
+        self.stats = {'requests': 0, 'wire_bytes': 0, 'decoded_bytes': 0}
+        self.stats_lock = threading.Lock()
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='open5e-async-transport', daemon=True)
+        self.thread.start()
+        self.client = self._run(self._open(user_agent))
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def _open(self, user_agent: str):
+        # Created on the loop so they bind to it
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        limits = httpx.Limits(max_connections=self.max_in_flight,
+                              max_keepalive_connections=self.max_in_flight,
+                              keepalive_expiry=30.0)
+        return httpx.AsyncClient(headers={'User-Agent': user_agent, 'Accept-Encoding': ACCEPT_ENCODING},
+                                 limits=limits, follow_redirects=True)
+
+    async def _send(self, url: str, headers: Dict[str, str], timeout: float):
+        async with self.semaphore:
+            return await self.client.get(url, headers=headers, timeout=timeout)
+
+    def _request(self, url: str, headers: Dict[str, str], timeout: float):
+        """Send one GET, pacing and retrying it like RateLimitedAdapter does"""
+        retries = self.retry_policy.max_retries if self.retry_policy is not None else 0
+        for attempt in range(retries + 1):
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+                if self.metrics is not None:
+                    self.metrics.observe_sleep('rate_limit', waited)
+            started = time.perf_counter()
+            try:
+                response = self._run(self._send(url, headers, timeout))
+            except httpx.TransportError as e:
+                if self.metrics is not None:
+                    self.metrics.observe_request(url, time.perf_counter() - started, None)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_throttle()
+                if attempt == retries:
+                    raise TransportError(f"{type(e).__name__} for {url}: {e}") from e
+                self._retry(url, attempt, type(e).__name__)
+                continue
+            if self.metrics is not None:
+                self.metrics.observe_request(url, time.perf_counter() - started, response.status_code,
+                                             len(response.content))
+
+            with self.stats_lock:
+                self.stats['requests'] += 1
+                self.stats['wire_bytes'] += response.num_bytes_downloaded
+                self.stats['decoded_bytes'] += len(response.content)
+
+            if response.status_code not in RETRY_STATUSES:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(retry_after)
+            if attempt == retries:
+                return response
+            self._retry(url, attempt, f"HTTP {response.status_code}", retry_after)
+
+    def _retry(self, url: str, attempt: int, reason: str, retry_after: Optional[float] = None):
+        delay = self.retry_policy.wait(url, attempt, reason, retry_after)
+        if self.metrics is not None:
+            self.metrics.observe_retry(reason, delay)
+
+    def get_json(self, url: str, timeout: float = 30.0) -> Dict[str, Any]:
+        """Fetch a URL and decode its JSON body, going through the response cache"""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            self.cache.record('hits')
+            return json.loads(entry['body'])
+        if self.offline:
+            raise OfflineCacheMiss(f"Offline mode: {url} is not in the cache")
+
+        # Revalidate stale entries with a conditional request
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._request(url, headers, timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.record('revalidated')
+            return json.loads(entry['body'])
+        if response.status_code != 200:
+            raise TransportError(f"HTTP {response.status_code} for {url}")
+
+        if self.cache is not None:
+            self.cache.record('misses', len(response.content))
+            self.cache.store(url, response)
+        return response.json()
+
+    def summary(self) -> str:
+        with self.stats_lock:
+            return (f"Async transport: {self.stats['requests']} requests, "
+                    f"{self.stats['wire_bytes']} bytes on the wire "
+                    f"({self.stats['decoded_bytes']} bytes decoded)")
+
+    def close(self):
+        self._run(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -0,0 +1,139 @@
+"""Prebuilt, content-hashed JSON bundles of the normalized rows for the frontend
+
+Instead of walking every API page in each browser session, a client reads a
+small manifest and then downloads one immutable file per dataset:
+
+    open5e_bundles/
+        manifest.json                           # short cache lifetime; points at the current files
+        open5e_spells.3f9a1c2b7d4e.json         # rows as a JSON array, cacheable forever
+        open5e_spells.3f9a1c2b7d4e.json.gz      # precompressed copies for gzip_static/brotli_static
+        open5e_spells.3f9a1c2b7d4e.json.br
+
+The rows are the same deduplicated rows the CSV export writes. Values keep
+their types (numbers, booleans, null) and the JSON columns are embedded as
+real lists and objects, so clients don't parse JSON inside JSON. The file
+name carries a hash of the content, so an unchanged dataset keeps its URL
+and a changed one never collides with a cached copy.
+
+Brotli copies are written when the brotli package is installed
+(pip install brotli).
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # Brotli copies are skipped without it
+    brotli = None
+
+from open5e_sync.columnar import COLUMN_KINDS, _to_json, column_value
+from open5e_sync.delta import _write_json_atomic
+
+DEFAULT_BUNDLE_DIR = 'open5e_bundles'
+
+# Bumped when the bundle or manifest layout changes in a way clients must know about
+BUNDLE_FORMAT = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+# Hex digits of the content hash used in file names
+HASH_LENGTH = 12
+
+# Files this module writes, and so may prune
+BUNDLE_FILE_PATTERN = re.compile(r'^[\w-]+\.[0-9a-f]{%d}\.json(\.gz|\.br)?$' % HASH_LENGTH)
+
+
+def bundle_value(kind: str, value: Any) -> Any:
+    """Convert a normalized row value to its JSON bundle form"""
+    if kind == 'speed':
+        # An object of movement mode to feet, not the list of pairs Arrow needs
+        return _to_json(value) or None
+    if kind == 'string':
+        return value
+    return column_value(kind, value)
+
+
+def encode_rows(table: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Tuple[bytes, int]:
+    """Serialize rows to compact JSON, returning the bytes and the row count
+
+    Keys follow the export column order, so the same rows always encode to
+    the same bytes.
+    """
+    kinds = COLUMN_KINDS.get(table, {})
+    encoded = [{field: bundle_value(kinds.get(field, 'string'), row.get(field)) for field in fieldnames}
+               for row in rows]
+    data = json.dumps(encoded, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return data, len(encoded)
+
+
+def _write_file(path: str, data: bytes):
+    # Content-addressed: an existing file already holds these bytes
+    if os.path.exists(path):
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_bundles(bundle_dir: str, tables: Sequence[Tuple[str, Iterable[Dict[str, Any]], List[str]]]) -> Dict[str, Any]:
+    """Write a bundle per (table, rows, fieldnames) and update the manifest, returning it
+
+    Tables not written in this run keep their entry from the previous
+    manifest. Bundle files referenced by neither the new nor the previous
+    manifest are removed; the previous generation stays so clients that
+    loaded the old manifest can still fetch its files.
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    entries = dict(previous.get('tables', {})) if previous.get('format') == BUNDLE_FORMAT else {}
+
+    for table, rows, fieldnames in tables:
+        data, count = encode_rows(table, rows, fieldnames)
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{table}.{digest[:HASH_LENGTH]}.json"
+        entry = {'file': filename, 'sha256': digest, 'rows': count, 'bytes': len(data), 'columns': fieldnames,
+                 'encodings': {}}
+
+        _write_file(os.path.join(bundle_dir, filename), data)
+        # mtime=0 keeps the gzip bytes identical between runs
+        compressed = {'gzip': ('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))}
+        if brotli is not None:
+            compressed['br'] = ('.br', lambda: brotli.compress(data, quality=11))
+        for encoding, (suffix, compress) in compressed.items():
+            path = os.path.join(bundle_dir, filename + suffix)
+            if not os.path.exists(path):
+                _write_file(path, compress())
+            entry['encodings'][encoding] = {'file': filename + suffix, 'bytes': os.path.getsize(path)}
+        entries[table] = entry
+
+        sizes = ', '.join(f"{encoding} {info['bytes']:,}" for encoding, info in entry['encodings'].items())
+        print(f"{count} items saved to {os.path.join(bundle_dir, filename)} ({len(data):,} bytes; {sizes})")
+
+    # The catalog version changes exactly when some table's content does
+    version = hashlib.sha256(''.join(entries[table]['sha256'] for table in sorted(entries)).encode()).hexdigest()
+    manifest = {'format': BUNDLE_FORMAT, 'version': version[:HASH_LENGTH], 'tables': entries}
+    if previous.get('version') == manifest['version'] and previous.get('tables') == entries:
+        manifest['generated_at'] = previous.get('generated_at')
+    else:
+        manifest['generated_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    _write_json_atomic(manifest_path, manifest)
+
+    keep = {MANIFEST_NAME}
+    for entry in list(entries.values()) + list(previous.get('tables', {}).values()):
+        keep.add(entry['file'])
+        keep.update(info['file'] for info in entry.get('encodings', {}).values())
+    for name in os.listdir(bundle_dir):
+        if name not in keep and BUNDLE_FILE_PATTERN.match(name):
+            os.remove(os.path.join(bundle_dir, name))
+
+    return manifest
@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = '.open5e_cache'
+
+
+class OfflineCacheMiss(requests.exceptions.ConnectionError):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+class ResponseCache:
+    """On-disk cache of GET responses keyed by URL, stored zlib-compressed in SQLite
+
+    Entries younger than `ttl` seconds are served without touching the network.
+    Older entries are revalidated with If-None-Match/If-Modified-Since, and
+    entries not used for `max_age` seconds are dropped. When the stored bodies
+    grow beyond `max_bytes`, the least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = 24 * 3600,
+                 max_age: float = 30 * 24 * 3600, max_bytes: int = 512 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'responses.sqlite')
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_downloaded': 0}
+        self.evict()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a URL, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT etag, last_modified, content_type, body, stored_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self.conn.commit()
+        etag, last_modified, content_type, body, stored_at = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_type': content_type,
+            'body': zlib.decompress(body),
+            'stored_at': stored_at,
+        }
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def store(self, url: str, response: requests.Response):
+        """Store a 200 response body and its validators"""
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 response.headers.get('Content-Type'), body, len(body), now, now)
+            )
+            self.conn.commit()
+        self._evict_over_size()
+
+    def touch(self, url: str):
+        """Mark an entry as fresh again after a 304 Not Modified"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?',
+                              (now, now, url))
+            self.conn.commit()
+
+    def evict(self):
+        """Drop entries unused for longer than max_age, then enforce max_bytes"""
+        with self.lock:
+            self.conn.execute('DELETE FROM responses WHERE accessed_at < ?', (time.time() - self.max_age,))
+            self.conn.commit()
+        self._evict_over_size()
+
+    def _evict_over_size(self):
+        with self.lock:
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self.conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall()
+            for url, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                total -= size
+            self.conn.commit()
+
+    def record(self, outcome: str, nbytes: int = 0):
+        """Count a cache hit, revalidation or miss for the run summary"""
+        with self.lock:
+            self.stats[outcome] += 1
+            self.stats['bytes_downloaded'] += nbytes
+
+    def summary(self) -> str:
+        return (f"Cache: {self.stats['hits']} hits, {self.stats['revalidated']} revalidated, "
+                f"{self.stats['misses']} downloaded ({self.stats['bytes_downloaded']} bytes)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CachedSession(requests.Session):
+    """requests.Session that answers GETs from a ResponseCache when it can
+
+    In offline mode every GET is served from the cache regardless of age, and
+    a URL that was never cached raises OfflineCacheMiss.
+    """
+
+    def __init__(self, cache: ResponseCache, offline: bool = False):
+        super().__init__()
+        self.cache = cache
+        self.offline = offline
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET':
+            return super().request(method, url, *args, **kwargs)
+
+        if kwargs.get('params'):
+            url = requests.Request('GET', url, params=kwargs.pop('params')).prepare().url
+
+        entry = self.cache.get(url)
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            self.cache.record('hits')
+            return self._cached_response(url, entry)
+        if self.offline:
+            raise OfflineCacheMiss(f"Offline mode: {url} is not in the cache")
+
+        # Revalidate stale entries with a conditional request
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().request(method, url, *args, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.record('revalidated')
+            return self._cached_response(url, entry)
+
+        if response.status_code == 200:
+            self.cache.record('misses', len(response.content))
+            self.cache.store(url, response)
+        return response
+
+    def _cached_response(self, url: str, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response._content = entry['body']
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': entry['content_type'] or 'application/json'})
+        response.from_cache = True
+        return response
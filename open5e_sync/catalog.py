@@ -0,0 +1,334 @@
+"""Indexed SQLite catalog of the normalized rows, with full-text search
+
+The frontend loads whole catalogs and filters them client-side. The catalog
+written here holds the same rows as the CSV export in one SQLite file that
+can be served read-only:
+
+- one table per dataset, keyed by slug, with typed columns (the same column
+  kinds as the columnar export; JSON columns stay JSON text)
+- B-tree indexes on the filter columns: type, rarity, category,
+  document_slug, and a spell's level and school
+- an FTS5 index over name and description, ranked with bm25
+
+Catalog is the query API:
+
+    with Catalog('open5e_catalog.sqlite') as catalog:
+        catalog.search('open5e_spells', 'fire ball', school='Evocation')
+        catalog.filter('open5e_equipment', rarity=['rare', 'very rare'], type='weapon')
+
+or from the command line:
+
+    python -m open5e_sync.catalog open5e_catalog.sqlite open5e_spells "fire ball" --where school=Evocation
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from open5e_sync.columnar import COLUMN_KINDS, column_value
+
+DEFAULT_CATALOG = 'open5e_catalog.sqlite'
+
+# Columns that get a B-tree index wherever a table has them
+INDEXED_COLUMNS = ('type', 'rarity', 'category', 'document_slug', 'level', 'school')
+
+# Columns covered by each table's full-text index
+SEARCH_COLUMNS = ('name', 'description')
+
+SQL_TYPES = {'int': 'INTEGER', 'float': 'REAL', 'bool': 'INTEGER'}
+
+INSERT_BATCH_ROWS = 5000
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_value(kind: str, value: Any) -> Any:
+    if kind in SQL_TYPES or kind == 'string':
+        return column_value(kind, value)
+    if value is None:
+        return None
+    # JSON columns are stored as the JSON text the normalizers produced
+    if not isinstance(value, str):
+        return json.dumps(value)
+    return str(value)
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix
+
+    Words are quoted, so FTS5 operators typed by a user are searched for
+    literally instead of raising a syntax error.
+    """
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return ''
+    return ' '.join(f'"{word}"' for word in words[:-1]) + (' ' if len(words) > 1 else '') + f'"{words[-1]}"*'
+
+
+def require_fts5():
+    """Raise RuntimeError unless this Python's SQLite has FTS5 compiled in"""
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.execute('CREATE VIRTUAL TABLE fts5_check USING fts5(x)')
+    except sqlite3.OperationalError:
+        raise RuntimeError("The search catalog needs SQLite with FTS5; this Python's sqlite3 was built without it")
+    finally:
+        conn.close()
+
+
+class CatalogWriter:
+    """Writes tables into a new copy of the catalog and swaps it in on finish()
+
+    Tables not written in this run are kept from the existing catalog, so the
+    character and equipment fetchers can fill one catalog file between them.
+    Readers of the old file are never shown a half-written catalog.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG):
+        require_fts5()
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        if os.path.exists(path):
+            shutil.copyfile(path, self.tmp_path)
+        self.conn = sqlite3.connect(self.tmp_path)
+        # Build-time only: the file is swapped in whole, so a crash just discards it
+        self.conn.execute('PRAGMA journal_mode = OFF')
+        self.conn.execute('PRAGMA synchronous = OFF')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS catalog_tables '
+                          '(name TEXT PRIMARY KEY, row_count INTEGER NOT NULL, built_at REAL NOT NULL)')
+
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> int:
+        """Replace a table with the given rows, its indexes and its search index"""
+        kinds = COLUMN_KINDS.get(table, {})
+        fts_table = f"{table}_fts"
+        columns = ', '.join(f"{_quote(field)} {SQL_TYPES.get(kinds.get(field), 'TEXT')}"
+                            + (' NOT NULL UNIQUE' if field == 'slug' else '')
+                            for field in fieldnames)
+        insert = (f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(map(_quote, fieldnames))}) "
+                  f"VALUES ({', '.join('?' for _ in fieldnames)})")
+
+        written = 0
+        with self.conn:
+            self.conn.execute(f"DROP TABLE IF EXISTS {_quote(fts_table)}")
+            self.conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self.conn.execute(f"CREATE TABLE {_quote(table)} (rowid INTEGER PRIMARY KEY, {columns})")
+            batch = []
+            for row in rows:
+                batch.append([_sql_value(kinds.get(field, 'string'), row.get(field)) for field in fieldnames])
+                if len(batch) >= INSERT_BATCH_ROWS:
+                    self.conn.executemany(insert, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(insert, batch)
+                written += len(batch)
+            # A repeated slug replaces the earlier row, so count what was stored
+            count = self.conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+            if written > count:
+                print(f"{written - count} rows of {table} replaced an earlier row with the same slug")
+
+            # Indexes are built once after loading, which is faster than maintaining them per insert
+            for column in INDEXED_COLUMNS:
+                if column in fieldnames:
+                    self.conn.execute(f"CREATE INDEX {_quote(f'{table}_{column}_idx')} "
+                                      f"ON {_quote(table)} ({_quote(column)})")
+            search_columns = [column for column in SEARCH_COLUMNS if column in fieldnames]
+            if search_columns:
+                # External-content index: the text is stored once, in the table itself
+                self.conn.execute(f"CREATE VIRTUAL TABLE {_quote(fts_table)} USING fts5("
+                                  f"{', '.join(map(_quote, search_columns))}, content={_quote(table)}, "
+                                  f"content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', "
+                                  f"prefix='2 3')")
+                self.conn.execute(f"INSERT INTO {_quote(fts_table)}({_quote(fts_table)}) VALUES ('rebuild')")
+            self.conn.execute('INSERT OR REPLACE INTO catalog_tables VALUES (?, ?, ?)', (table, count, time.time()))
+
+        print(f"{count} items saved to {self.path} ({table})")
+        return count
+
+    def finish(self):
+        """Optimize the new catalog and replace the old file with it"""
+        for (fts_table,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                              "AND name LIKE '%\\_fts' ESCAPE '\\'").fetchall():
+            self.conn.execute(f"INSERT INTO {_quote(fts_table)}({_quote(fts_table)}) VALUES ('optimize')")
+        self.conn.commit()
+        # Planner statistics for the filter indexes, then compact the file
+        self.conn.execute('ANALYZE')
+        self.conn.execute('VACUUM')
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.conn.close()
+        os.remove(self.tmp_path)
+
+
+def write_catalog(path: str, tables: Sequence[Tuple[str, Iterable[Dict[str, Any]], List[str]]]) -> Dict[str, int]:
+    """Write (table, rows, fieldnames) triples into the catalog at `path`, returning row counts"""
+    writer = CatalogWriter(path)
+    try:
+        counts = {table: writer.write_table(table, rows, fieldnames) for table, rows, fieldnames in tables}
+    except BaseException:
+        writer.abort()
+        raise
+    writer.finish()
+    return counts
+
+
+class Catalog:
+    """Read-only queries against a catalog file
+
+    Rows come back as dicts with the catalog's column types (ints, floats,
+    0/1 flags, JSON text). Filters take a column name and a value, or a list
+    of values to match any of; only the table's own columns are accepted.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No catalog at {path}")
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.columns = {}
+        for (table,) in self.conn.execute('SELECT name FROM catalog_tables ORDER BY name'):
+            self.columns[table] = [row[1] for row in self.conn.execute(f"PRAGMA table_info({_quote(table)})")
+                                   if row[1] != 'rowid']
+
+    def tables(self) -> List[str]:
+        return list(self.columns)
+
+    def _check_table(self, table: str):
+        if table not in self.columns:
+            raise KeyError(f"No table {table} in the catalog")
+
+    def _where(self, table: str, filters: Dict[str, Any], prefix: str = '') -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in self.columns[table]:
+                raise KeyError(f"{table} has no column {column}")
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"{prefix}{_quote(column)} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            elif value is None:
+                clauses.append(f"{prefix}{_quote(column)} IS NULL")
+            else:
+                clauses.append(f"{prefix}{_quote(column)} = ?")
+                params.append(value)
+        return clauses, params
+
+    def get(self, table: str, slug: str) -> Optional[Dict[str, Any]]:
+        self._check_table(table)
+        row = self.conn.execute(f"SELECT * FROM {_quote(table)} WHERE slug = ?", (slug,)).fetchone()
+        return self._row(row) if row is not None else None
+
+    def filter(self, table: str, limit: Optional[int] = 50, offset: int = 0, order_by: str = 'name',
+               **filters: Any) -> List[Dict[str, Any]]:
+        """Rows matching every filter, ordered by a column"""
+        self._check_table(table)
+        if order_by not in self.columns[table]:
+            raise KeyError(f"{table} has no column {order_by}")
+        clauses, params = self._where(table, filters)
+        sql = f"SELECT * FROM {_quote(table)}"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f" ORDER BY {_quote(order_by)} LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        return [self._row(row) for row in self.conn.execute(sql, params)]
+
+    def count(self, table: str, **filters: Any) -> int:
+        self._check_table(table)
+        clauses, params = self._where(table, filters)
+        sql = f"SELECT COUNT(*) FROM {_quote(table)}"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def facets(self, table: str, column: str, **filters: Any) -> Dict[Any, int]:
+        """Row count per distinct value of a column, e.g. to fill a filter dropdown"""
+        self._check_table(table)
+        if column not in self.columns[table]:
+            raise KeyError(f"{table} has no column {column}")
+        clauses, params = self._where(table, filters)
+        sql = f"SELECT {_quote(column)}, COUNT(*) FROM {_quote(table)}"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f" GROUP BY {_quote(column)} ORDER BY COUNT(*) DESC"
+        return {value: count for value, count in self.conn.execute(sql, params)}
+
+    def search(self, table: str, text: str, limit: Optional[int] = 50, offset: int = 0,
+               **filters: Any) -> List[Dict[str, Any]]:
+        """Rows whose name or description contain every word of `text`, best matches first
+
+        Name matches rank above description matches. Empty text matches nothing.
+        """
+        self._check_table(table)
+        query = fts_query(text)
+        if not query:
+            return []
+        fts_table = _quote(f"{table}_fts")
+        clauses, params = self._where(table, filters, prefix='t.')
+        sql = (f"SELECT t.* FROM {fts_table} JOIN {_quote(table)} AS t ON t.rowid = {fts_table}.rowid "
+               f"WHERE {fts_table} MATCH ?")
+        if clauses:
+            sql += ' AND ' + ' AND '.join(clauses)
+        sql += f" ORDER BY bm25({fts_table}, 10.0, 1.0) LIMIT ? OFFSET ?"
+        return [self._row(row) for row in self.conn.execute(sql, [query] + params
+                                                            + [-1 if limit is None else limit, offset])]
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {key: row[key] for key in row.keys() if key != 'rowid'}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'Catalog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
+    parser = argparse.ArgumentParser(prog=prog, description="Search or filter a catalog built with --catalog")
+    parser.add_argument('catalog', help=f"Catalog file (e.g. {DEFAULT_CATALOG})")
+    parser.add_argument('table', help="Table to query, e.g. open5e_spells")
+    parser.add_argument('text', nargs='?', help="Words to search for in name and description")
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN=VALUE',
+                        help="Filter on a column; repeat a column to match any of several values")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    filters = {}
+    for condition in args.where:
+        column, sep, value = condition.partition('=')
+        if not sep:
+            parser.error(f"--where expects COLUMN=VALUE, got {condition!r}")
+        filters.setdefault(column, []).append(value)
+
+    try:
+        with Catalog(args.catalog) as catalog:
+            started = time.perf_counter()
+            if args.text:
+                rows = catalog.search(args.table, args.text, limit=args.limit, **filters)
+            else:
+                rows = catalog.filter(args.table, limit=args.limit, **filters)
+            elapsed = time.perf_counter() - started
+    except (FileNotFoundError, KeyError) as e:
+        parser.exit(1, f"{e.args[0]}\n")
+    for row in rows:
+        print(f"{row['slug']:<40} {row['name']}")
+    print(f"{len(rows)} rows in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
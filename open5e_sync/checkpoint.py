@@ -0,0 +1,82 @@
+"""On-disk checkpoints that let an interrupted endpoint fetch resume
+
+Each endpoint gets a directory holding every page fetched so far
+(`page-00001.json`, ...) and a `state.json` with the URL to continue from.
+A rerun replays the saved pages from disk and only requests the rest.
+Checkpoints are cleared once a run has written its output.
+"""
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Iterator
+
+from open5e_sync.delta import _write_json_atomic
+from open5e_sync.pagination import FetchPage, iter_pages
+
+DEFAULT_CHECKPOINT_DIR = '.open5e_checkpoints'
+
+
+class EndpointCheckpoint:
+    """Pages saved so far for one endpoint, plus where to pick up again"""
+
+    def __init__(self, path: str, start_url: str, max_age: float):
+        self.path = path
+        self.start_url = start_url
+        self.state_path = os.path.join(path, 'state.json')
+
+        state = None
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        if (state is None or state.get('start_url') != start_url
+                or time.time() - state.get('started_at', 0) > max_age):
+            # Missing, for a different query, or too old to trust: start over
+            shutil.rmtree(path, ignore_errors=True)
+            state = {'start_url': start_url, 'started_at': time.time(),
+                     'pages': 0, 'next_url': start_url, 'complete': False}
+        os.makedirs(path, exist_ok=True)
+        self.state = state
+
+    def _page_path(self, number: int) -> str:
+        return os.path.join(self.path, f"page-{number:05d}.json")
+
+    def save_page(self, page: Dict[str, Any]):
+        """Store a page, then move the resume point past it"""
+        number = self.state['pages'] + 1
+        _write_json_atomic(self._page_path(number),
+                           {'next': page.get('next'), 'results': page.get('results', [])})
+        self.state.update(pages=number, next_url=page.get('next'), complete=not page.get('next'))
+        _write_json_atomic(self.state_path, self.state)
+
+    def iter_pages(self, fetch_page: FetchPage, max_workers: int = 1) -> Iterator[Dict[str, Any]]:
+        """Yield the saved pages, then fetch and save the ones still missing"""
+        saved_pages = self.state['pages']
+        if saved_pages:
+            status = 'complete' if self.state['complete'] else f"resuming at {self.state['next_url']}"
+            print(f"Checkpoint: replaying {saved_pages} saved pages of {self.start_url} ({status})")
+        for number in range(1, saved_pages + 1):
+            with open(self._page_path(number), encoding='utf-8') as f:
+                yield json.load(f)
+
+        if self.state['complete']:
+            return
+        for page in iter_pages(fetch_page, self.state['next_url'], max_workers):
+            self.save_page(page)
+            yield page
+
+
+class CheckpointStore:
+    """Per-endpoint checkpoints under one directory"""
+
+    def __init__(self, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR, max_age: float = 24 * 3600):
+        self.checkpoint_dir = checkpoint_dir
+        self.max_age = max_age
+
+    def endpoint(self, endpoint: str, start_url: str) -> EndpointCheckpoint:
+        name = endpoint.strip('/').replace('/', '_') or 'root'
+        return EndpointCheckpoint(os.path.join(self.checkpoint_dir, name), start_url, self.max_age)
+
+    def clear(self):
+        """Drop every checkpoint once the run's output is safely written"""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
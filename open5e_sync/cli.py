@@ -0,0 +1,427 @@
+"""Command line entry point: python -m open5e_sync <command> ...
+
+    python -m open5e_sync sync spells equipment --workers 8 --rps 10 --output-dir out
+    python -m open5e_sync sync character --offline --format parquet
+    python -m open5e_sync catalog open5e_catalog.sqlite open5e_spells "fire"
+    python -m open5e_sync snapshot list
+
+`sync` fetches the chosen datasets in one process over one connection pool,
+rate limiter, response cache and checkpoint store, with every endpoint pulled
+at once. Datasets are named by table without the open5e_ prefix (spells,
+equipment, ...), or 'character' for races, classes, spells and backgrounds,
+or 'all'. Page size, timeouts, concurrency, the request rate, caching, the
+output format and where files go are all options, so a run can be tuned to
+its environment without editing the fetch scripts. fetch_all_data.py,
+fetch_equipment_data.py and fetch_character_data.py run the same command
+with a SyncPreset of their own.
+
+The endpoints and their normalizers are registered by the fetch scripts at
+the repository root, so `sync` runs from there.
+"""
+import argparse
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from open5e_sync import catalog, snapshot
+from open5e_sync.async_transport import AsyncTransport
+from open5e_sync.bundle import DEFAULT_BUNDLE_DIR, MANIFEST_NAME, write_bundles
+from open5e_sync.cache import DEFAULT_CACHE_DIR, ResponseCache
+from open5e_sync.catalog import DEFAULT_CATALOG, require_fts5, write_catalog
+from open5e_sync.checkpoint import DEFAULT_CHECKPOINT_DIR, CheckpointStore
+from open5e_sync.columnar import COLUMNAR_FORMATS, write_columnar
+from open5e_sync.dedup import DEDUP_KEYS, DEFAULT_SOURCE_PRIORITY, DedupPolicy, source_priority
+from open5e_sync.delta import DEFAULT_STATE_DIR, commit_state, write_delta
+from open5e_sync.engine import DEFAULT_BASE_URL, FetchEngine
+from open5e_sync.loader import PostgresLoader
+from open5e_sync.log import LOG_LEVELS, configure_logging
+from open5e_sync.metrics import Metrics
+from open5e_sync.pagination import IncompleteFetchError
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.registry import registered_tables, table_endpoints
+from open5e_sync.retry import RetryPolicy
+from open5e_sync.session import create_session
+from open5e_sync.snapshot import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+from open5e_sync.stats import write_stats_json
+from open5e_sync.vectorized import require_pyarrow
+
+TABLE_PREFIX = 'open5e_'
+
+
+def dataset_tables(character_tables: List[str]) -> Dict[str, List[str]]:
+    """Dataset names accepted by `sync` and the tables each one covers"""
+    datasets = {table[len(TABLE_PREFIX):] if table.startswith(TABLE_PREFIX) else table: [table]
+                for table in registered_tables()}
+    datasets['character'] = list(character_tables)
+    datasets['all'] = list(registered_tables())
+    return datasets
+
+
+def output_path(output_dir: Optional[str], name: str) -> str:
+    """Where an output file goes: under `output_dir` when one is given (absolute names stay as they are)"""
+    return os.path.join(output_dir, name) if output_dir else name
+
+
+class SyncPreset:
+    """What a fetch script's `sync` run covers when no datasets are named, and how it starts"""
+
+    def __init__(self, description: str = "Fetch Open5e character and equipment data in one run, "
+                                          "with every endpoint pulled at once",
+                 datasets: Sequence[str] = ('all',), banner: str = "Starting Open5e Data Fetch (all endpoints)...",
+                 parallel: bool = True, user_agent: str = 'D&D Data Fetcher', rps: float = 2.0):
+        self.description = description
+        self.datasets = list(datasets)
+        self.banner = banner
+        # Whether the endpoints are pulled at once unless --parallel/--no-parallel says otherwise
+        self.parallel = parallel
+        self.user_agent = user_agent
+        # Default of --rps
+        self.rps = rps
+
+
+def sync_main(argv: Optional[List[str]] = None, prog: Optional[str] = None, preset: Optional[SyncPreset] = None):
+    preset = preset or SyncPreset()
+    # Importing the fetchers registers their endpoints
+    try:
+        from fetch_character_data import CHARACTER_TABLES, Open5eCharacterDataFetcher
+        from fetch_equipment_data import Open5eEquipmentFetcher
+    except ImportError as e:
+        sys.exit(f"sync needs the fetch scripts; run it from the repository root ({e})")
+    character_tables = [table for table, _ in CHARACTER_TABLES]
+    datasets = dataset_tables(character_tables)
+
+    parser = argparse.ArgumentParser(prog=prog, description=preset.description)
+    parser.add_argument('datasets', nargs='*', metavar='DATASET',
+                        help="Datasets to sync: " + ", ".join(datasets) + ", or a table name "
+                             f"(default: {', '.join(preset.datasets)})")
+    parser.add_argument('--tables', nargs='+', choices=list(registered_tables()), metavar='TABLE',
+                        help="Only sync these tables (same as naming them as datasets)")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help=f"API root to fetch from, e.g. a mirror or the benchmark stub (default: {DEFAULT_BASE_URL})")
+    parser.add_argument('--page-size', type=int,
+                        help="Items requested per page from every endpoint (default: each endpoint's own, 100 or 1000)")
+    parser.add_argument('--timeout', type=float,
+                        help="Seconds to wait for each page (default: each endpoint's own, 30 or 60)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of pages fetched concurrently per endpoint (default: 1)")
+    parser.add_argument('--parallel', action=argparse.BooleanOptionalAction,
+                        help="Fetch every endpoint at the same time "
+                             f"(default: {'on' if preset.parallel else 'off'}; off with --stream)")
+    parser.add_argument('--rps', type=float, default=preset.rps,
+                        help=f"Maximum requests per second shared by all endpoints (default: {preset.rps})")
+    parser.add_argument('--max-rps', type=float,
+                        help="Ceiling the request rate may climb to while the API stays healthy (default: 4x --rps)")
+    parser.add_argument('--transport', choices=['requests', 'async'], default='requests',
+                        help="HTTP client: requests, or a pooled asyncio client (needs httpx) (default: requests)")
+    parser.add_argument('--max-in-flight', type=int, default=16,
+                        help="With --transport async, the most requests in flight at once (default: 16)")
+    parser.add_argument('--retries', type=int, default=3,
+                        help="Retries per request on 429, 5xx, timeouts and connection errors (default: 3)")
+    parser.add_argument('--normalize-workers', type=int, default=1,
+                        help="Processes used to normalize fetched items (default: 1, in-process)")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="Parse equipment pages column by column with pyarrow compute instead of item by item")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the on-disk HTTP response cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-ttl', type=float, default=24 * 3600,
+                        help="Seconds a cached page is used before it is revalidated (default: 86400)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Download every page without the response cache")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay every page from the response cache without touching the network")
+    parser.add_argument('--format', choices=['csv'] + list(COLUMNAR_FORMATS), default='csv',
+                        help="Output file format; parquet/arrow keep column types and need pyarrow (default: csv)")
+    parser.add_argument('--compression', default='zstd',
+                        help="Compression codec for --format parquet/arrow (default: zstd)")
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help="Directory the data, delta, catalog, bundle and report files are written to; "
+                             "absolute paths given to other options stay as they are (default: the current directory)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Stream rows from the API straight to disk as pages arrive; the stats report is "
+                             "gathered in the same pass")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Write only rows inserted, updated or deleted since the last incremental run")
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR,
+                        help=f"Where per-slug content hashes are kept between runs (default: {DEFAULT_STATE_DIR})")
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR,
+                        help=f"Where fetched pages are saved so a failed run can resume (default: {DEFAULT_CHECKPOINT_DIR})")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="Don't save or resume from fetch checkpoints")
+    parser.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR,
+                        help=f"Where the raw API pages of every run are kept, zstd-compressed (default: {DEFAULT_SNAPSHOT_DIR})")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Don't keep a raw snapshot of this run")
+    parser.add_argument('--from-snapshot', metavar='RUN_ID',
+                        help="Normalize a saved snapshot run ('latest' for the newest) instead of fetching from the API")
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help="Postgres URL to upsert rows into instead of writing CSV (default: $DATABASE_URL)")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Rows per upsert transaction (default: 1000)")
+    parser.add_argument('--create-tables', action='store_true',
+                        help="Create missing catalog tables and slug indexes before loading")
+    parser.add_argument('--stats', metavar='FILE',
+                        help="Write the statistics report (counts, coverage, fill rates, samples) as JSON")
+    parser.add_argument('--dedup-key', choices=list(DEDUP_KEYS),
+                        help="What makes two rows duplicates (default: the name, ignoring case and spacing)")
+    parser.add_argument('--prefer-documents', nargs='*', metavar='DOCUMENT',
+                        help="Keep the copy of a duplicate from these documents, most trusted first "
+                             f"(with none named: {', '.join(DEFAULT_SOURCE_PRIORITY)}); by default the first copy seen is kept")
+    parser.add_argument('--merge', action='store_true',
+                        help="Fill the kept row's empty fields from its duplicates of the same type")
+    parser.add_argument('--dedup-report', metavar='FILE',
+                        help="Write the duplicate groups found in each table as JSON")
+    parser.add_argument('--catalog', metavar='FILE', nargs='?', const=DEFAULT_CATALOG,
+                        help=f"Also build an indexed SQLite catalog with full-text search (default file: {DEFAULT_CATALOG})")
+    parser.add_argument('--bundles', metavar='DIR', nargs='?', const=DEFAULT_BUNDLE_DIR,
+                        help=f"Also write content-hashed, compressed JSON bundles and a manifest for the frontend (default dir: {DEFAULT_BUNDLE_DIR})")
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default='info',
+                        help="'debug' also logs every item as it is normalized (default: info)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Time every stage and write a JSON report of latencies, bytes, retries, sleep and CPU time")
+    parser.add_argument('--prometheus-textfile', metavar='FILE',
+                        help="Also write the metrics as a Prometheus textfile (e.g. for node_exporter)")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level)
+    selected = set()
+    for name in args.datasets + (args.tables or []) or preset.datasets:
+        if name in datasets:
+            selected.update(datasets[name])
+        elif name in registered_tables():
+            selected.add(name)
+        else:
+            parser.error(f"Unknown dataset {name!r} (choose from {', '.join(datasets)}, or a table name)")
+    if args.page_size is not None and args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the response cache")
+    if args.stream:
+        if args.parallel:
+            parser.error("--stream fetches one endpoint at a time and can't be combined with --parallel")
+        if args.database_url and args.incremental:
+            parser.error("loading an incremental delta needs the full row list; drop --stream")
+        if args.catalog:
+            parser.error("--catalog is built from the full row list; drop --stream")
+        if args.bundles:
+            parser.error("--bundles are built from the full row list; drop --stream")
+        if args.prefer_documents is not None or args.merge:
+            print("Note: with --prefer-documents or --merge a later copy can still replace a row, "
+                  "so each table is written once its last page is in")
+    if args.catalog:
+        try:
+            require_fts5()
+        except RuntimeError as e:
+            parser.error(str(e))
+    if args.vectorized:
+        if args.normalize_workers > 1:
+            parser.error("--vectorized normalizes in this process; drop --normalize-workers")
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            parser.error(str(e))
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    print(preset.banner)
+
+    # One connection pool and one rate limiter for every endpoint
+    table_names = [table for table in registered_tables() if table in selected]
+    endpoint_count = sum(len(table_endpoints(table)) for table in table_names)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, ttl=args.cache_ttl)
+    rate_limiter = RateLimiter(args.rps, max_requests_per_second=args.max_rps or args.rps * 4)
+    checkpoints = None if args.no_checkpoint else CheckpointStore(args.checkpoint_dir)
+    metrics = Metrics() if args.metrics or args.prometheus_textfile else None
+    snapshot_run = replay = None
+    try:
+        if args.from_snapshot:
+            replay = SnapshotStore(args.snapshot_dir).load_run(args.from_snapshot)
+        elif not args.no_snapshot:
+            snapshot_run = SnapshotStore(args.snapshot_dir).start_run()
+    except RuntimeError as e:
+        parser.error(str(e))
+    session = create_session(preset.user_agent, args.workers * endpoint_count,
+                             cache=cache, offline=args.offline, rate_limiter=rate_limiter,
+                             retry_policy=RetryPolicy(args.retries), metrics=metrics)
+    transport = None
+    if args.transport == 'async':
+        try:
+            transport = AsyncTransport(preset.user_agent, args.max_in_flight, rate_limiter=rate_limiter,
+                                       retry_policy=RetryPolicy(args.retries), cache=cache,
+                                       offline=args.offline, metrics=metrics)
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    def print_reports():
+        # Each fetcher reports on the stats the engine gathered as rows left dedup
+        if any(table in table_names for table in character_tables):
+            character_fetcher = Open5eCharacterDataFetcher(session=session, rate_limiter=rate_limiter)
+            character_fetcher.stats = engine.stats
+            character_fetcher.generate_stats_report()
+        if 'open5e_equipment' in table_names:
+            equipment_fetcher = Open5eEquipmentFetcher(session=session, rate_limiter=rate_limiter)
+            equipment_fetcher.stats = engine.stats
+            equipment_fetcher.generate_stats_report()
+
+    engine = None
+    loader = None
+    failed = False
+    try:
+        engine = FetchEngine(max_workers=args.workers, session=session, rate_limiter=rate_limiter,
+                             normalize_workers=args.normalize_workers, checkpoints=checkpoints,
+                             transport=transport, vectorized=args.vectorized, snapshot=snapshot_run,
+                             replay=replay, metrics=metrics)
+        engine.base_url = args.base_url
+        engine.page_size = args.page_size
+        engine.timeout = args.timeout
+        engine.dedup_policy = DedupPolicy(args.dedup_key, source_priority(args.prefer_documents),
+                                          merge=args.merge)
+
+        if args.stream:
+            # Rows go from the API to disk as they arrive, one endpoint at a time
+            results = {table: engine.iter_table(table) for table in table_names}
+        else:
+            results = engine.fetch_tables(table_names, parallel=preset.parallel if args.parallel is None
+                                          else args.parallel)
+
+            # Reports and files are produced one after another so the output stays readable
+            print_reports()
+
+        tables = [(table, results[table], fieldnames)
+                  for table, fieldnames in registered_tables().items() if table in results]
+        if args.database_url:
+            loader = PostgresLoader(args.database_url, batch_size=args.batch_size)
+            if args.create_tables:
+                loader.create_tables()
+
+        if args.incremental:
+            # With a loader, each table's new state is kept only once its delta is applied
+            manifests = [write_delta(rows, fieldnames, table, args.state_dir, output_dir=args.output_dir or '.',
+                                     commit=loader is None)
+                         for table, rows, fieldnames in tables]
+
+            print("\n=== FETCH COMPLETE ===")
+            print("Generated delta files (each with a .delta.json manifest):")
+            for table, _, _ in tables:
+                print(f"- {output_path(args.output_dir, f'{table}.delta.csv')}")
+            if loader is not None:
+                for (table, rows, fieldnames), manifest in zip(tables, manifests):
+                    loader.load_table(table, rows, fieldnames, manifest)
+                    commit_state(table, args.state_dir)
+                print("Applied the deltas to every table.")
+            else:
+                print("\nUpsert the 'insert'/'update' rows and delete the 'delete' slugs in each table.")
+        elif loader is not None:
+            # Upsert straight into the database instead of writing CSV
+            for table, rows, fieldnames in tables:
+                loader.load_table(table, rows, fieldnames)
+
+            print("\n=== FETCH COMPLETE ===")
+            print("Loaded " + ", ".join(table for table, _, _ in tables) + ".")
+        elif args.format != 'csv':
+            for table, rows, fieldnames in tables:
+                write_columnar(rows, fieldnames, table, output_path(args.output_dir, f'{table}.{args.format}'),
+                               args.format, args.compression)
+
+            print("\n=== FETCH COMPLETE ===")
+            print("Generated files:")
+            for table, _, _ in tables:
+                print(f"- {output_path(args.output_dir, f'{table}.{args.format}')}")
+        else:
+            for table, rows, fieldnames in tables:
+                engine.save_to_csv(rows, output_path(args.output_dir, f'{table}.csv'), fieldnames)
+
+            print("\n=== FETCH COMPLETE ===")
+            print("Generated files:")
+            for table, _, _ in tables:
+                print(f"- {output_path(args.output_dir, f'{table}.csv')}")
+            print("\nUpload each file to its Supabase table as described in the fetcher READMEs.")
+
+        if args.stream:
+            # Gathered while the rows streamed to disk
+            print_reports()
+
+        if args.catalog:
+            # Indexed, searchable copy of the same rows
+            catalog_path = output_path(args.output_dir, args.catalog)
+            write_catalog(catalog_path, tables)
+            print(f"Search catalog: '{catalog_path}' (python -m open5e_sync catalog {catalog_path} <table> ...)")
+
+        if args.bundles:
+            # One immutable, compressed JSON file per table for the frontend to fetch
+            bundle_dir = output_path(args.output_dir, args.bundles)
+            bundle_manifest = write_bundles(bundle_dir, tables)
+            print(f"Bundles: '{os.path.join(bundle_dir, MANIFEST_NAME)}' (version {bundle_manifest['version']})")
+
+        if checkpoints is not None:
+            checkpoints.clear()
+        if cache is not None:
+            print(f"\n{cache.summary()}")
+        print(rate_limiter.summary())
+        if snapshot_run is not None:
+            snapshot_run.finish()
+            print(snapshot_run.summary())
+        if transport is not None:
+            print(transport.summary())
+
+    except IncompleteFetchError as e:
+        print(f"\nFetch failed: {e}")
+        print("Nothing was written for the incomplete endpoint." if args.stream else "No files were written.")
+        if checkpoints is not None:
+            print(f"Rerun to resume from the pages saved in {args.checkpoint_dir}.")
+        failed = True
+    except Exception as e:
+        print(f"Error during fetch: {e}")
+        import traceback
+        traceback.print_exc()
+        failed = True
+    finally:
+        if transport is not None:
+            transport.close()
+        if loader is not None:
+            loader.close()
+
+    # Reported for failed runs too: where a stalled run spent its time is what needs explaining
+    if args.stats and engine is not None:
+        stats_path = output_path(args.output_dir, args.stats)
+        write_stats_json(stats_path, engine.stats)
+        print(f"Statistics written to {stats_path}")
+    if args.dedup_report and engine is not None:
+        dedup_report_path = output_path(args.output_dir, args.dedup_report)
+        engine.dedup_report.write_json(dedup_report_path)
+        print(f"Duplicate report written to {dedup_report_path}")
+    if metrics is not None:
+        print(f"\n{metrics.summary()}")
+        if args.metrics:
+            metrics_path = output_path(args.output_dir, args.metrics)
+            metrics.write_json(metrics_path)
+            print(f"Metrics report written to {metrics_path}")
+        if args.prometheus_textfile:
+            prometheus_path = output_path(args.output_dir, args.prometheus_textfile)
+            metrics.write_prometheus(prometheus_path)
+            print(f"Prometheus metrics written to {prometheus_path}")
+
+    if failed:
+        # Let cron jobs and CI see that the sync didn't finish
+        sys.exit(1)
+
+# Command name -> (entry point taking argv and prog, one-line summary)
+COMMANDS: Dict[str, Tuple[Callable[..., None], str]] = {
+    'sync': (sync_main, "fetch datasets and write CSV, Parquet/Arrow, deltas, Postgres, a catalog or bundles"),
+    'catalog': (catalog.main, "search or filter a catalog built with --catalog"),
+    'snapshot': (snapshot.main, "list and diff raw snapshot runs"),
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    commands = "\n".join(f"  {name:<10}{summary}" for name, (_, summary) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog='python -m open5e_sync',
+        description="Sync Open5e data and work with what it produced",
+        epilog=f"commands:\n{commands}\n\nRun 'python -m open5e_sync <command> --help' for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=list(COMMANDS), metavar='command')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="options of the command")
+    args = parser.parse_args(argv)
+    run, _ = COMMANDS[args.command]
+    run(args.args, prog=f"{parser.prog} {args.command}")
@@ -0,0 +1,174 @@
+"""Typed, compressed columnar export (Parquet or Arrow IPC) of normalized rows
+
+Unlike the CSV export, numbers stay numbers, booleans stay booleans and the
+JSON columns (properties, asi, speed, subraces, archetypes, classes) become
+real list/struct/map columns. Rows are written in record batches, so a
+streamed dataset is never held in memory as a whole.
+
+Requires pyarrow (pip install pyarrow).
+"""
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for --format parquet/arrow
+    pa = None
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# Column kinds that differ from plain strings, per table
+COLUMN_KINDS = {
+    'open5e_equipment': {
+        # requires_attunement stays text: the API sends phrases like "requires attunement by a wizard"
+        'cost_quantity': 'int', 'weight': 'float', 'ac': 'int', 'ac_base': 'int',
+        'ac_add_dex': 'bool', 'ac_cap_dex': 'int', 'dex_bonus': 'bool', 'max_dex_bonus': 'int',
+        'properties': 'string_list',
+    },
+    'open5e_races': {'asi': 'asi', 'speed': 'speed', 'subraces': 'named_list'},
+    'open5e_classes': {'hit_die': 'int', 'archetypes': 'named_list'},
+    'open5e_spells': {'ritual': 'bool', 'concentration': 'bool', 'classes': 'named_list'},
+    'open5e_backgrounds': {},
+}
+
+# "1d10" hit dice and "14" strings both end in the number we want
+TRAILING_INT_PATTERN = re.compile(r'(\d+)\s*$')
+
+
+def _arrow_type(kind: str):
+    if kind == 'int':
+        return pa.int64()
+    if kind == 'float':
+        return pa.float64()
+    if kind == 'bool':
+        return pa.bool_()
+    if kind == 'string_list':
+        return pa.list_(pa.string())
+    if kind == 'asi':
+        return pa.list_(pa.struct([('attributes', pa.list_(pa.string())), ('value', pa.int64())]))
+    if kind == 'speed':
+        return pa.map_(pa.string(), pa.int64())
+    if kind == 'named_list':
+        return pa.list_(pa.struct([('name', pa.string()), ('slug', pa.string())]))
+    return pa.string()
+
+
+def table_schema(table: str, fieldnames: List[str]):
+    """Arrow schema for a table's columns, in export order"""
+    kinds = COLUMN_KINDS.get(table, {})
+    return pa.schema([(field, _arrow_type(kinds.get(field, 'string'))) for field in fieldnames])
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = TRAILING_INT_PATTERN.search(str(value))
+    return int(match.group(1)) if match else None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1')
+    return bool(value)
+
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    # Spelled the way the CSV export writes booleans
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _to_json(value: Any) -> Any:
+    # Normalizers store JSON columns as JSON text for the CSV export
+    if isinstance(value, str):
+        return json.loads(value) if value else None
+    return value
+
+
+def column_value(kind: str, value: Any) -> Any:
+    """Convert a normalized row value to what its Arrow column expects"""
+    if kind == 'int':
+        return _to_int(value)
+    if kind == 'float':
+        return _to_float(value)
+    if kind == 'bool':
+        return _to_bool(value)
+    if kind == 'speed':
+        speed = _to_json(value)
+        return [(mode, _to_int(feet)) for mode, feet in speed.items()] if speed else None
+    if kind in ('string_list', 'asi', 'named_list'):
+        return _to_json(value)
+    return _to_text(value)
+
+
+def _record_batch(rows: List[Dict[str, Any]], schema, kinds: Dict[str, str]):
+    columns = []
+    for field in schema:
+        kind = kinds.get(field.name, 'string')
+        columns.append(pa.array([column_value(kind, row.get(field.name)) for row in rows], type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_columnar(rows: Iterable[Dict[str, Any]], fieldnames: List[str], table: str,
+                   filename: str, file_format: str = 'parquet', compression: str = 'zstd',
+                   batch_rows: int = 5000) -> int:
+    """Write rows as a typed Parquet or Arrow IPC file, returning the row count
+
+    Rows are converted and written `batch_rows` at a time (one Parquet row
+    group per batch). The file is written under a temporary name and only
+    replaces `filename` once complete.
+    """
+    if pa is None:
+        raise RuntimeError("Columnar export needs pyarrow: pip install pyarrow")
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {file_format}")
+
+    schema = table_schema(table, fieldnames)
+    kinds = COLUMN_KINDS.get(table, {})
+    tmp_filename = f"{filename}.tmp"
+    if file_format == 'parquet':
+        writer = pq.ParquetWriter(tmp_filename, schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(tmp_filename, schema,
+                                 options=pa.ipc.IpcWriteOptions(compression=compression))
+
+    count = 0
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                writer.write_batch(_record_batch(batch, schema, kinds))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(batch, schema, kinds))
+            count += len(batch)
+        writer.close()
+    except BaseException:
+        writer.close()
+        os.remove(tmp_filename)
+        raise
+    os.replace(tmp_filename, filename)
+
+    print(f"{count} items saved to {filename} ({file_format}, {compression})")
+    return count
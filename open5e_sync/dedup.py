@@ -0,0 +1,268 @@
+"""Deduplication of a table's rows with a source-priority policy and field merge
+
+Rows from several endpoints and source documents often describe the same
+thing: the SRD "Longsword" and a third-party document's copy, or a magic
+item listed twice. A DedupPolicy says how to recognize duplicates and which
+copy wins:
+
+- `key`: 'name' (case and whitespace insensitive), 'slug', or
+  'name+document' (one row per name within each document). None uses the
+  key registered for the table's endpoints.
+- `source_priority`: document slugs, most trusted first. The duplicate from
+  the highest-ranked document is kept; documents not listed rank below all
+  listed ones, and ties go to the row seen first. With an empty priority
+  (the default) the first row seen always wins.
+- `merge`: columns the kept row leaves empty are filled from the other
+  duplicates, best-ranked first, instead of being thrown away. Only the
+  columns in the table's registered MergeSpec are filled, and only from
+  duplicates of the same kind (a weapon never fills in a magic item). Off
+  by default.
+
+The default policy (first row wins, no merge) decides every row as soon as
+it is read, so streamed runs write rows while pages are still arriving.
+
+Rows are read in one pass with a dict from key to output position, so the
+cost stays linear however many documents a catalog merges. Only groups that
+actually have duplicates are resolved afterwards. Each key keeps the
+position of its first row, so without duplicates the output order is the
+input order.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from open5e_sync.delta import _write_json_atomic
+from open5e_sync.log import item_logger
+from open5e_sync.registry import Item, name_document_key, name_key, slug_key
+
+DEDUP_KEYS: Dict[str, Callable[[Item], Hashable]] = {
+    'name': name_key,
+    'slug': slug_key,
+    'name+document': name_document_key,
+}
+
+# The SRD is the reference text; third-party documents fill in around it.
+# Used when documents are preferred without naming any.
+DEFAULT_SOURCE_PRIORITY = ('wotc-srd',)
+
+# Identity columns always come from the kept row
+MERGE_EXCLUDED = frozenset(('slug', 'name', 'document_slug'))
+
+# Groups listed per table in the JSON report
+REPORT_GROUP_LIMIT = 500
+
+
+def is_empty(value: Any) -> bool:
+    """Whether a normalized value carries no information (False and 0 do)"""
+    return value is None or value == '' or value == '[]' or value == '{}' or value == [] or value == {}
+
+
+def source_priority(documents: Optional[Sequence[str]]) -> Sequence[str]:
+    """The source priority for a --prefer-documents value
+
+    Not given, the first copy seen wins; given without documents, the SRD is
+    preferred.
+    """
+    if documents is None:
+        return ()
+    return list(documents) or DEFAULT_SOURCE_PRIORITY
+
+
+class MergeSpec:
+    """Which empty columns of a table's kept row may be filled from its duplicates
+
+    `defaults` maps a column to the values its normalizer fills in when the
+    API gives none (rarity 'common'); those count as empty, so neither
+    side's default is taken for real data. A duplicate only fills in the
+    kept row when both agree on every `match` column.
+    """
+
+    def __init__(self, columns: Sequence[str], defaults: Optional[Dict[str, Sequence[Any]]] = None,
+                 match: Sequence[str] = ()):
+        self.columns = [column for column in columns if column not in MERGE_EXCLUDED]
+        self.defaults = {column: tuple(values) for column, values in (defaults or {}).items()}
+        self.match = tuple(match)
+
+    def is_missing(self, column: str, value: Any) -> bool:
+        return is_empty(value) or value in self.defaults.get(column, ())
+
+    def matches(self, kept: Item, other: Item) -> bool:
+        return all(kept.get(column) == other.get(column) for column in self.match)
+
+
+# Registered merge specs by table; tables without one are never merged
+MERGE_SPECS: Dict[str, MergeSpec] = {}
+
+
+def register_merge(table: str, spec: MergeSpec) -> MergeSpec:
+    MERGE_SPECS[table] = spec
+    return spec
+
+
+def _label(row: Item) -> str:
+    return f"{row.get('slug')} ({row.get('document_slug') or 'no document'})"
+
+
+class DedupPolicy:
+    """How duplicates are recognized, which one is kept and whether fields are merged"""
+
+    def __init__(self, key: Optional[str] = None, source_priority: Sequence[str] = (), merge: bool = False):
+        if key is not None and key not in DEDUP_KEYS:
+            raise ValueError(f"Unknown dedup key: {key} (choose from {', '.join(DEDUP_KEYS)})")
+        self.key = key
+        self.source_priority = list(source_priority)
+        self.merge = merge
+        self._ranks = {document: rank for rank, document in enumerate(self.source_priority)}
+
+    def key_function(self, default: Callable[[Item], Hashable]) -> Callable[[Item], Hashable]:
+        return DEDUP_KEYS[self.key] if self.key is not None else default
+
+    def rank(self, row: Item) -> int:
+        """Lower ranks win; unlisted documents share the rank after the listed ones"""
+        return self._ranks.get(row.get('document_slug'), len(self.source_priority))
+
+
+class DedupReport:
+    """Duplicate counts per table, printed as one line each and optionally saved as JSON"""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, table: str, key: str, rows: int, unique: int, groups: List[Dict[str, Any]]):
+        self.tables[table] = {
+            'key': key,
+            'rows': rows,
+            'unique': unique,
+            'duplicates': rows - unique,
+            'groups': len(groups),
+            'kept_by_priority': sum(1 for group in groups if group['by_priority']),
+            'fields_filled': sum(len(group['filled']) for group in groups),
+            'examples': groups[:REPORT_GROUP_LIMIT],
+        }
+
+    def summary_line(self, table: str) -> str:
+        stats = self.tables[table]
+        line = (f"Dedup {table} by {stats['key']}: {stats['rows']} rows -> {stats['unique']} unique, "
+                f"{stats['duplicates']} duplicates in {stats['groups']} groups")
+        if stats['kept_by_priority']:
+            line += f", {stats['kept_by_priority']} kept a later row by source priority"
+        if stats['fields_filled']:
+            line += f", {stats['fields_filled']} empty fields filled from duplicates"
+        return line
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.tables
+
+    def write_json(self, path: str):
+        _write_json_atomic(path, self.to_dict())
+
+
+class Deduplicator:
+    """One table's dedup pass under a policy"""
+
+    def __init__(self, table: str, default_key: Callable[[Item], Hashable],
+                 policy: Optional[DedupPolicy] = None, report: Optional[DedupReport] = None):
+        self.table = table
+        self.policy = policy or DedupPolicy()
+        self.key = self.policy.key_function(default_key)
+        self.key_name = self.policy.key or next((name for name, key in DEDUP_KEYS.items() if key is default_key),
+                                                getattr(default_key, '__name__', 'key'))
+        self.report = report
+        # Tables without a merge spec are deduplicated without merging
+        self.merge_spec = MERGE_SPECS.get(table) if self.policy.merge else None
+
+    def run(self, rows: Iterable[Item]) -> List[Item]:
+        """The deduplicated rows, each at the position of its key's first row"""
+        rank = self.policy.rank
+        positions: Dict[Hashable, int] = {}
+        output: List[Item] = []
+        # Only keys seen more than once: output position -> [(rank, arrival, row), ...]
+        duplicates: Dict[int, List[Tuple[int, int, Item]]] = {}
+        count = 0
+        for arrival, row in enumerate(rows):
+            count += 1
+            row_key = self.key(row)
+            position = positions.get(row_key)
+            if position is None:
+                positions[row_key] = len(output)
+                output.append(row)
+                continue
+            item_logger.debug("Duplicate %s: %s", self.table, row.get('name'))
+            group = duplicates.get(position)
+            if group is None:
+                first = output[position]
+                group = duplicates[position] = [(rank(first), -1, first)]
+            group.append((rank(row), arrival, row))
+
+        groups = []
+        for position, members in duplicates.items():
+            merged, group = self._resolve(members)
+            output[position] = merged
+            groups.append(group)
+
+        if self.report is not None:
+            self.report.record(self.table, self.key_name, count, len(output), groups)
+            print(self.report.summary_line(self.table))
+        return output
+
+    def _resolve(self, members: List[Tuple[int, int, Item]]) -> Tuple[Item, Dict[str, Any]]:
+        first = members[0][2]
+        ordered = sorted(members, key=lambda member: member[:2])
+        kept = ordered[0][2]
+        others = [row for _, _, row in ordered[1:]]
+        merged = kept
+        filled = []
+        spec = self.merge_spec
+        if spec is not None:
+            donors = [other for other in others if spec.matches(kept, other)]
+            for field in spec.columns:
+                if not spec.is_missing(field, kept.get(field)):
+                    continue
+                for other in donors:
+                    if not spec.is_missing(field, other.get(field)):
+                        if merged is kept:
+                            merged = kept.copy()
+                        merged[field] = other[field]
+                        filled.append(field)
+                        break
+        group = {
+            'name': kept.get('name'),
+            'kept': _label(kept),
+            'dropped': [_label(row) for row in others],
+            'by_priority': kept is not first,
+            'filled': filled,
+        }
+        return merged, group
+
+    def iter(self, rows: Iterable[Item]) -> Iterator[Item]:
+        """Yield the deduplicated rows
+
+        When the first row seen always wins and nothing is merged, each row is
+        yielded as soon as its key is new. Otherwise a later duplicate can
+        still change a row, so rows come out once the input is exhausted.
+        """
+        if self.policy.source_priority or self.merge_spec is not None:
+            yield from self.run(rows)
+            return
+
+        positions: Dict[Hashable, int] = {}
+        # Only the names and labels are kept, for the report
+        kept: List[Tuple[str, str]] = []
+        dropped: Dict[int, List[str]] = {}
+        count = 0
+        for row in rows:
+            count += 1
+            row_key = self.key(row)
+            position = positions.get(row_key)
+            if position is None:
+                positions[row_key] = len(kept)
+                kept.append((row.get('name'), _label(row)))
+                yield row
+                continue
+            item_logger.debug("Duplicate %s: %s", self.table, row.get('name'))
+            dropped.setdefault(position, []).append(_label(row))
+
+        if self.report is not None:
+            groups = [{'name': kept[position][0], 'kept': kept[position][1], 'dropped': labels,
+                       'by_priority': False, 'filled': []}
+                      for position, labels in dropped.items()]
+            self.report.record(self.table, self.key_name, count, len(kept), groups)
+            print(self.report.summary_line(self.table))
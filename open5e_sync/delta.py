@@ -0,0 +1,117 @@
+import csv
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List
+
+DEFAULT_STATE_DIR = '.open5e_state'
+
+
+def _csv_value(value: Any) -> str:
+    # Same coercion as save_to_csv, so hashes follow what is actually imported
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def row_hash(item: Dict[str, Any], fieldnames: List[str]) -> str:
+    """Content hash of a normalized row over the exported columns"""
+    values = [_csv_value(item.get(field)) for field in fieldnames]
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _write_json_atomic(path: str, data: Any):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _state_path(state_dir: str, table: str) -> str:
+    return os.path.join(state_dir, f"{table}.hashes.json")
+
+
+def write_delta(items: Iterable[Dict[str, Any]], fieldnames: List[str], table: str,
+                state_dir: str = DEFAULT_STATE_DIR, output_dir: str = '.',
+                key: str = 'slug', commit: bool = True) -> Dict[str, Any]:
+    """Write only the rows that changed since the previous run
+
+    The previous run's content hash per `key` is read from
+    `<state_dir>/<table>.hashes.json`. Inserted and updated rows are written in
+    full to `<table>.delta.csv` with an `op` column; deleted rows carry only
+    their key. A `<table>.delta.json` manifest records the counts, files and
+    the keys in each category.
+    The state file is replaced only once the delta has been written, so a
+    crashed run is simply redone next time. With commit=False the new hashes
+    are kept aside until commit_state() is called, e.g. once the delta has
+    been loaded into the database; a failed load then leaves the old state,
+    and the next run produces the same changes again.
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    state_path = _state_path(state_dir, table)
+    previous = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    current = {}
+    changes = []
+    counts = {'insert': 0, 'update': 0, 'delete': 0, 'unchanged': 0}
+    for item in items:
+        slug = item.get(key)
+        digest = row_hash(item, fieldnames)
+        current[slug] = digest
+        if slug not in previous:
+            op = 'insert'
+        elif previous[slug] != digest:
+            op = 'update'
+        else:
+            counts['unchanged'] += 1
+            continue
+        counts[op] += 1
+        changes.append((op, item))
+
+    deleted = sorted(slug for slug in previous if slug not in current)
+    counts['delete'] = len(deleted)
+
+    delta_path = os.path.join(output_dir, f"{table}.delta.csv")
+    with open(delta_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['op'] + fieldnames)
+        writer.writeheader()
+        for op, item in changes:
+            row = {field: _csv_value(item.get(field)) for field in fieldnames}
+            row['op'] = op
+            writer.writerow(row)
+        for slug in deleted:
+            writer.writerow({'op': 'delete', key: slug})
+
+    manifest = {
+        'table': table,
+        'key': key,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'delta_file': os.path.basename(delta_path),
+        'previous_rows': len(previous),
+        'current_rows': len(current),
+        'counts': counts,
+        'inserted': [item.get(key) for op, item in changes if op == 'insert'],
+        'updated': [item.get(key) for op, item in changes if op == 'update'],
+        'deleted': deleted,
+    }
+    manifest_path = os.path.join(output_dir, f"{table}.delta.json")
+    _write_json_atomic(manifest_path, manifest)
+    _write_json_atomic(f"{state_path}.pending", current)
+    if commit:
+        commit_state(table, state_dir)
+
+    print(f"Delta for {table}: {counts['insert']} inserted, {counts['update']} updated, "
+          f"{counts['delete']} deleted, {counts['unchanged']} unchanged -> {delta_path}")
+    return manifest
+
+
+def commit_state(table: str, state_dir: str = DEFAULT_STATE_DIR):
+    """Make the hashes of the last write_delta() the base of the next delta"""
+    state_path = _state_path(state_dir, table)
+    os.replace(f"{state_path}.pending", state_path)
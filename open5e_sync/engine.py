@@ -0,0 +1,313 @@
+"""One fetch engine for every registered Open5e endpoint
+
+FetchEngine owns what the per-dataset fetchers used to copy from each other:
+the HTTP session (or async transport) with its connection pool, response
+cache and rate limiter, paginated fetching with checkpoints, normalization
+in this process or a process pool, dedup and the CSV writer. It runs any
+subset of the endpoints in open5e_sync.registry over that one session, so a
+speed-up in any of these paths applies to every dataset. With a Metrics
+object, each of those stages is timed (see open5e_sync.metrics).
+"""
+import contextlib
+import csv
+import itertools
+import os
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from open5e_sync.async_transport import AsyncTransport
+from open5e_sync.checkpoint import CheckpointStore
+from open5e_sync.dedup import DedupPolicy, DedupReport, Deduplicator
+from open5e_sync.metrics import Metrics
+from open5e_sync.pagination import fetch_endpoints, iter_pages
+from open5e_sync.parallel import map_in_processes
+from open5e_sync.pipeline import iter_chunks
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.registry import ENDPOINTS, EndpointSpec, Item, table_endpoints
+from open5e_sync.retry import RetryPolicy
+from open5e_sync.rows import Row, csv_values, validate_rows
+from open5e_sync.session import create_session
+from open5e_sync.snapshot import SnapshotRun
+from open5e_sync.stats import TableStats
+from open5e_sync.vectorized import VECTORIZED_CHUNK_SIZE
+
+DEFAULT_BASE_URL = 'https://api.open5e.com'
+
+# Page size and timeout for endpoints fetched without a registered spec
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_TIMEOUT = 30.0
+
+
+def iter_normalized(items: Iterable[Item], normalize: Callable[[Item], Item], kind: str) -> Iterator[Item]:
+    """Normalize raw items one at a time, skipping any that fail"""
+    for item in items:
+        try:
+            yield normalize(item)
+        except Exception as e:
+            print(f"Error processing {kind} {item.get('name', 'Unknown')}: {e}")
+            continue
+
+
+def iter_normalized_pages(items: Iterable[Item], spec: EndpointSpec) -> Iterator[Item]:
+    """Normalize raw items a chunk at a time with the endpoint's page normalizer
+
+    A chunk the page normalizer fails on is normalized again one item at a
+    time, so a malformed item only loses itself, as with iter_normalized.
+    """
+    for chunk in iter_chunks(items, VECTORIZED_CHUNK_SIZE):
+        try:
+            rows = spec.normalize_page(chunk)
+        except Exception as e:
+            print(f"Error processing a page of {len(chunk)} {spec.kind} items, retrying one at a time: {e}")
+            rows = iter_normalized(chunk, spec.normalize, spec.kind)
+        yield from rows
+
+
+def _normalize_batch(batch: List[Tuple[Callable[[Item], Item], str, Item]]) -> List[Tuple[Optional[Item], float]]:
+    """Process pool entry point: normalize a chunk of (normalizer, kind, raw item) triples
+
+    Returns one (row, CPU seconds) pair per triple; the row is None where the
+    item failed to normalize.
+    """
+    results = []
+    for normalize, kind, item in batch:
+        started = time.thread_time()
+        row = next(iter_normalized([item], normalize, kind), None)
+        results.append((row, time.thread_time() - started))
+    return results
+
+
+class FetchEngine:
+    """Fetch, normalize and deduplicate registered endpoints over one shared session"""
+
+    def __init__(self, max_workers: int = 1, requests_per_second: float = 2.0,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 normalize_workers: int = 1,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 transport: Optional[AsyncTransport] = None,
+                 vectorized: bool = False,
+                 snapshot: Optional[SnapshotRun] = None,
+                 replay: Optional[SnapshotRun] = None,
+                 metrics: Optional[Metrics] = None,
+                 user_agent: str = 'D&D Data Fetcher'):
+        self.base_url = DEFAULT_BASE_URL
+        # Pages beyond the first are fetched by this many workers (1 = sequential)
+        self.max_workers = max_workers
+        # Fetched items are normalized by this many processes (1 = in this process)
+        self.normalize_workers = normalize_workers
+        # Use an endpoint's page normalizer, where it has one (needs pyarrow)
+        self.vectorized = vectorized
+        # Page size and timeout for every endpoint, instead of each one's registered values
+        self.page_size: Optional[int] = None
+        self.timeout: Optional[float] = None
+        # Rate limiting - be nice to the API. A session and limiter can be shared
+        # with other engines in the same process; a shared session must be
+        # created with the same limiter, which paces every request it sends.
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_second)
+        self.session = session or create_session(user_agent, max_workers, rate_limiter=self.rate_limiter,
+                                                 retry_policy=RetryPolicy(), metrics=metrics)
+        # Fetched pages are saved here so an interrupted run can resume
+        self.checkpoints = checkpoints
+        # Optional asyncio client that replaces the session for page fetches
+        self.transport = transport
+        # Raw pages are recorded into `snapshot`, or read back from `replay`
+        # instead of the API
+        self.snapshot = snapshot
+        self.replay = replay
+        # Stage timings; a shared session or transport should record into the same object
+        self.metrics = metrics
+        # Which duplicate rows are kept and merged, and what was found
+        self.dedup_policy = DedupPolicy()
+        self.dedup_report = DedupReport()
+        # Statistics of each table's output rows, gathered as they pass
+        self.stats: Dict[str, TableStats] = {}
+
+    def _timed(self, stage: str, items: Iterator[Any],
+               size: Optional[Callable[[Any], int]] = None) -> Iterator[Any]:
+        """Charge the time spent producing `items` to a metrics stage, when metrics are on"""
+        if self.metrics is None:
+            return items
+        return self.metrics.timed_iter(stage, items, size)
+
+    def _stage(self, stage: str):
+        """Time a block as a metrics stage, when metrics are on"""
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.stage(stage)
+
+    def _deduplicator(self, table: str) -> Deduplicator:
+        return Deduplicator(table, table_endpoints(table)[0].dedup_key, self.dedup_policy, self.dedup_report)
+
+    def _dedupe(self, table: str, rows: Iterable[Item]) -> Iterator[Item]:
+        """Validate a table's rows against its schema, deduplicate them and count each survivor into its stats"""
+        stats = self.stats[table] = TableStats(table)
+        typed = self._timed('validate', validate_rows(table, table_endpoints(table)[0].fieldnames, rows))
+        deduplicated = self._timed('dedup', self._deduplicator(table).iter(typed))
+        return self._timed('stats', stats.observe(deduplicated))
+
+    def table_stats(self, table: str, rows: Optional[Iterable[Item]] = None) -> TableStats:
+        """A table's stats from this engine's run, or from one pass over `rows` if it didn't fetch the table"""
+        if table not in self.stats:
+            self.stats[table] = TableStats(table).update(rows or [])
+        return self.stats[table]
+
+    def fetch_page(self, url: str, timeout: float = DEFAULT_TIMEOUT) -> Optional[Dict[str, Any]]:
+        """Fetch a single page, returning None once retries run out"""
+        print(f"Fetching: {url}")
+
+        # 429/5xx responses, timeouts and connection errors are retried with
+        # backoff by the session's adapter (or the transport) before we get here
+        try:
+            if self.transport is not None:
+                return self.transport.get_json(url, timeout=timeout)
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to fetch {url}: {e}")
+            return None
+
+    def iter_paginated_data(self, endpoint: str) -> Iterator[Item]:
+        """Yield raw items from a paginated endpoint as each page arrives
+
+        Page size and timeout come from the endpoint's registered spec, unless
+        the engine's page_size or timeout is set.
+        """
+        spec = ENDPOINTS.get(endpoint)
+        page_size = self.page_size or (spec.page_size if spec is not None else DEFAULT_PAGE_SIZE)
+        timeout = self.timeout or (spec.timeout if spec is not None else DEFAULT_TIMEOUT)
+        fetch_page = partial(self.fetch_page, timeout=timeout)
+        count = 0
+        url = f"{self.base_url}{endpoint}?limit={page_size}"
+
+        # Raises IncompleteFetchError at the first page that fails; with
+        # checkpoints, the pages before it are kept for the next run
+        if self.replay is not None:
+            print(f"Snapshot: replaying {endpoint} from run {self.replay.run_id}")
+            pages = self.replay.iter_pages(endpoint)
+        elif self.checkpoints is not None:
+            pages = self.checkpoints.endpoint(endpoint, url).iter_pages(fetch_page, self.max_workers)
+        else:
+            pages = iter_pages(fetch_page, url, self.max_workers)
+        for page in self._timed('fetch', pages, lambda page: len(page.get('results', []))):
+            if self.snapshot is not None:
+                self.snapshot.record_page(endpoint, page)
+            results = page.get('results', [])
+            count += len(results)
+            yield from results
+
+        print(f"Fetched {count} items from {endpoint}")
+
+    def fetch_paginated_data(self, endpoint: str) -> List[Item]:
+        """Fetch all raw items from a paginated endpoint"""
+        return list(self.iter_paginated_data(endpoint))
+
+    def normalize_items(self, spec: EndpointSpec, items: Iterable[Item]) -> Iterator[Item]:
+        """Normalize an endpoint's raw items in this process, a page at a time when vectorized"""
+        if self.vectorized and spec.normalize_page is not None:
+            rows = iter_normalized_pages(items, spec)
+        else:
+            rows = iter_normalized(items, spec.normalize, spec.kind)
+        return self._timed(f"normalize {spec.kind}", rows)
+
+    def iter_table(self, table: str) -> Iterator[Item]:
+        """Stream a table's normalized, deduplicated rows while pages are still being fetched
+
+        The table's endpoints are read one after another and items are
+        normalized as they arrive, so raw pages never pile up. Rows come out
+        as they arrive when the dedup policy keeps the first copy seen, and
+        once the table is complete otherwise (see open5e_sync.dedup).
+        """
+        specs = table_endpoints(table)
+        rows = itertools.chain.from_iterable(
+            self.normalize_items(spec, self.iter_paginated_data(spec.path)) for spec in specs)
+        return self._dedupe(table, rows)
+
+    def fetch_tables(self, tables: List[str], parallel: bool = False) -> Dict[str, List[Item]]:
+        """Fetch every endpoint of the given tables, then normalize and deduplicate
+
+        With parallel=True all endpoints are pulled at once; normalization and
+        dedup still run in the same order as a sequential fetch.
+        """
+        specs = [spec for table in tables for spec in table_endpoints(table)]
+        raw_data = fetch_endpoints(self.fetch_paginated_data, [spec.path for spec in specs], parallel)
+
+        if self.normalize_workers > 1 and not self.vectorized:
+            # One pool for every endpoint; results come back in input order
+            triples = [(spec.normalize, spec.kind, item) for spec in specs for item in raw_data[spec.path]]
+            started = time.perf_counter()
+            results = iter(map_in_processes(_normalize_batch, triples, self.normalize_workers))
+            if self.metrics is not None:
+                # Workers report CPU time per item; the pool's wall time is charged as a whole
+                self.metrics.add_stage('normalize (process pool)', time.perf_counter() - started, items=len(triples))
+            normalized = {}
+            for spec in specs:
+                spec_results = list(itertools.islice(results, len(raw_data[spec.path])))
+                spec_rows = [row for row, _ in spec_results if row is not None]
+                if self.metrics is not None:
+                    self.metrics.add_stage(f"normalize {spec.kind}", cpu=sum(cpu for _, cpu in spec_results),
+                                           items=len(spec_rows))
+                normalized.setdefault(spec.table, []).append(spec_rows)
+        else:
+            normalized = {}
+            for spec in specs:
+                normalized.setdefault(spec.table, []).append(self.normalize_items(spec, raw_data[spec.path]))
+
+        # Deduplicate in this process so results stay deterministic
+        results = {}
+        for table in tables:
+            rows = itertools.chain.from_iterable(normalized[table])
+            results[table] = list(self._dedupe(table, rows))
+        return results
+
+    def save_to_csv(self, data: Iterable[Item], filename: str, fieldnames: List[str]) -> int:
+        """Save rows to a CSV file
+
+        `data` may be a generator, in which case rows are written as they are
+        produced. Returns the number of rows written.
+        """
+        items = iter(data)
+        first_item = next(items, None)
+        if first_item is None:
+            print(f"No data to save for {filename}")
+            return 0
+
+        if isinstance(data, list):
+            print(f"Saving {len(data)} items to {filename}...")
+        else:
+            print(f"Streaming items to {filename}...")
+
+        # Written to a temporary file first, so a fetch that fails part way
+        # never leaves a truncated CSV behind
+        tmp_filename = f"{filename}.tmp"
+        count = 0
+        try:
+            # Rows still being produced upstream are charged to their own stages
+            with self._stage('write') as stage, open(tmp_filename, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+
+                # Typed rows were checked against the schema and render their own
+                # cells; plain dict rows are converted value by value
+                if isinstance(first_item, Row) and first_item.columns == tuple(fieldnames):
+                    cells = type(first_item).csv_values
+                else:
+                    cells = partial(csv_values, fieldnames=fieldnames)
+                for item in itertools.chain([first_item], items):
+                    writer.writerow(cells(item))
+                    count += 1
+                if stage is not None:
+                    stage.items = count
+        except BaseException:
+            # open() itself may have failed; don't hide the real error
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_filename)
+            raise
+        os.replace(tmp_filename, filename)
+
+        print(f"{count} items saved to {filename}")
+        return count
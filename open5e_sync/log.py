@@ -0,0 +1,25 @@
+"""Level-gated logging for the lines written once per item
+
+Per-page progress and summaries are printed as before. What used to be
+printed for every single item ("Processing spell: ...", "  Cost: ...",
+"Skipping duplicate: ...") goes through the `open5e_sync.items` logger at
+DEBUG instead, so a catalog-sized run doesn't spend its time writing to the
+terminal. --log-level debug shows those lines again.
+"""
+import logging
+import sys
+
+LOG_LEVELS = ['debug', 'info', 'warning', 'error']
+
+item_logger = logging.getLogger('open5e_sync.items')
+
+
+def configure_logging(level: str = 'info'):
+    """Send open5e_sync log records to stdout, interleaved with the printed progress"""
+    logger = logging.getLogger('open5e_sync')
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level.upper())
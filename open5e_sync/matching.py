@@ -0,0 +1,69 @@
+import re
+from typing import Any, Dict, Iterable, List
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation factored on shared prefixes
+
+    A flat 'a|b|c' alternation makes the regex engine retry every keyword at
+    every position; factoring it into a trie means each position fails after
+    looking at one character, so a scan costs about the same however many
+    keywords there are.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here; longer keywords sharing the prefix are optional
+            body = f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+# Below this many keywords one `in` scan per keyword beats the compiled regex
+# (see benchmarks/bench_property_matcher.py)
+REGEX_MIN_KEYWORDS = 70
+
+
+class KeywordMatcher:
+    """Finds keywords in text, by substring scans for short lists and one compiled regex for long ones
+
+    With fewer than `regex_min_keywords` keywords, each keyword is looked for
+    with an `in` scan, as the equipment fetcher always did: matches can fall
+    inside longer words ('light' in 'lightning') and overlapping keywords are
+    all reported. The regex engine's per-character cost makes a single regex
+    pass about half the speed of 27 such scans; it pulls ahead past about 70.
+
+    With more keywords, one regex pass finds whole words only. Regex matching
+    is greedy, so overlapping keywords resolve to the longest match ('very
+    rare' rather than 'rare'). Either way, matches come back in the order the
+    keywords were given.
+    """
+
+    def __init__(self, keywords: Iterable[str], regex_min_keywords: int = REGEX_MIN_KEYWORDS):
+        # Deduplicate while keeping the caller's order for the results
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.order = {keyword: index for index, keyword in enumerate(self.keywords)}
+        self.pattern = None
+        if len(self.keywords) >= regex_min_keywords:
+            self.pattern = re.compile(rf'\b(?:{_trie_pattern(self.keywords)})\b')
+
+    def find_all(self, text: str) -> List[str]:
+        """Return each keyword found in text once, in keyword order"""
+        if not text:
+            return []
+        text = text.lower()
+        if self.pattern is None:
+            return [keyword for keyword in self.keywords if keyword in text]
+        found = set(self.pattern.findall(text))
+        return sorted(found, key=self.order.__getitem__)
@@ -0,0 +1,318 @@
+"""Per-stage timing and counters for a sync run
+
+A Metrics object is shared by the session (or async transport) and the
+fetch engine. It records:
+
+- every HTTP attempt: latency per endpoint (a histogram), body bytes and
+  status, retries and the time slept in backoff
+- time spent waiting for a rate limiter token
+- wall and CPU time and item counts per pipeline stage: fetch, one
+  `normalize <kind>` stage per normalizer, dedup and write
+
+Stage times are exclusive: a stage that pulls items from another stage (dedup
+pulling from a normalizer pulling from fetch, as streaming runs do) is not
+charged for the time spent inside it. Stages running in several threads add
+up, so their sum can exceed the run's wall time.
+
+The report is written as JSON and, optionally, as a Prometheus textfile for
+node_exporter's textfile collector.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from open5e_sync.delta import _write_json_atomic
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Upper bounds (seconds) of the page latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# API version prefix that `next` links carry but the first page URL may not
+VERSION_PREFIX = re.compile(r'^/v\d+(?=/)')
+
+
+def endpoint_label(url: str) -> str:
+    """'/v1/magicitems/?page=2' -> '/magicitems', so every page of an endpoint shares a label"""
+    return VERSION_PREFIX.sub('', urlparse(url).path).rstrip('/') or '/'
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, None where it can't be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _quantile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Latency observations, exported as cumulative buckets and quantiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Pages per run are few enough to keep every observation for exact quantiles
+        self.values: List[float] = []
+
+    def observe(self, value: float):
+        self.values.append(value)
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        counts = [(str(bound), sum(1 for v in self.values if v <= bound)) for bound in self.buckets]
+        return counts + [('+Inf', len(self.values))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = sorted(self.values)
+        return {
+            'count': len(values),
+            'sum': sum(values),
+            'p50': _quantile(values, 0.5),
+            'p90': _quantile(values, 0.9),
+            'p99': _quantile(values, 0.99),
+            'max': values[-1] if values else None,
+            'buckets': dict(self.cumulative_counts()),
+        }
+
+
+class _Frame:
+    """A stage being timed on the current thread"""
+
+    __slots__ = ('name', 'wall_start', 'cpu_start', 'child_wall', 'child_cpu', 'items')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.items = 0
+
+
+class Metrics:
+    """Thread-safe collector of request, sleep and stage metrics for one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started_at = time.time()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.latency: Dict[str, Histogram] = {}
+        self.requests: Dict[str, Dict[str, int]] = {}
+        self.sleep = {'rate_limit': 0.0, 'retry_backoff': 0.0}
+        self.retries: Dict[str, int] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    # HTTP
+
+    def observe_request(self, url: str, seconds: float, status: Optional[int], size: int = 0):
+        """One HTTP attempt; `status` is None when it failed without a response"""
+        endpoint = endpoint_label(url)
+        with self.lock:
+            self.latency.setdefault(endpoint, Histogram()).observe(seconds)
+            counts = self.requests.setdefault(endpoint, {'attempts': 0, 'errors': 0, 'bytes': 0})
+            counts['attempts'] += 1
+            counts['bytes'] += size
+            if status is None or status >= 400:
+                counts['errors'] += 1
+
+    def observe_sleep(self, reason: str, seconds: float):
+        """Time a worker spent sleeping: 'rate_limit' or 'retry_backoff'"""
+        if seconds > 0:
+            with self.lock:
+                self.sleep[reason] = self.sleep.get(reason, 0.0) + seconds
+
+    def observe_retry(self, reason: str, delay: float):
+        with self.lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+            self.sleep['retry_backoff'] += delay
+
+    # Stages
+
+    def _stack(self) -> List[_Frame]:
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def _enter(self, name: str) -> _Frame:
+        frame = _Frame(name)
+        self._stack().append(frame)
+        return frame
+
+    def _exit(self, frame: _Frame):
+        wall = time.perf_counter() - frame.wall_start
+        cpu = time.thread_time() - frame.cpu_start
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        self.add_stage(frame.name, wall - frame.child_wall, cpu - frame.child_cpu, frame.items)
+
+    def add_stage(self, name: str, wall: float = 0.0, cpu: float = 0.0, items: int = 0):
+        """Charge time and items to a stage directly (e.g. CPU time measured in another process)"""
+        with self.lock:
+            stage = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'items': 0})
+            stage['wall_seconds'] += wall
+            stage['cpu_seconds'] += cpu
+            stage['items'] += items
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[_Frame]:
+        """Time a block as one stage; set `.items` on the yielded frame to count its output"""
+        frame = self._enter(name)
+        try:
+            yield frame
+        finally:
+            self._exit(frame)
+
+    def timed_iter(self, name: str, items: Iterable[Any],
+                   size: Optional[Callable[[Any], int]] = None) -> Iterator[Any]:
+        """Pass items through, charging the time spent producing each one to a stage
+
+        `size` gives how many items a yielded value stands for (e.g. the
+        results on a page); by default each counts as one.
+        """
+        iterator = iter(items)
+        while True:
+            frame = self._enter(name)
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            else:
+                frame.items = size(value) if size is not None else 1
+            finally:
+                self._exit(frame)
+            yield value
+
+    # Reports
+
+    def report(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self.wall_start
+        with self.lock:
+            stages = {}
+            for name, stage in self.stages.items():
+                stages[name] = dict(stage)
+                stages[name]['items_per_second'] = (stage['items'] / stage['wall_seconds']
+                                                    if stage['wall_seconds'] > 0 else None)
+                stages[name]['items_per_cpu_second'] = (stage['items'] / stage['cpu_seconds']
+                                                        if stage['cpu_seconds'] > 0 else None)
+            slept = sum(self.sleep.values())
+            all_requests = Histogram()
+            for histogram in self.latency.values():
+                all_requests.values.extend(histogram.values)
+            return {
+                'started_at': self.started_at,
+                'wall_seconds': wall,
+                'cpu_seconds': time.process_time() - self.cpu_start,
+                'sleep_seconds': dict(self.sleep, total=slept),
+                'work_seconds': sum(stage['wall_seconds'] for stage in self.stages.values()),
+                'peak_rss_bytes': peak_rss_bytes(),
+                'request_latency': all_requests.to_dict(),
+                'requests': {endpoint: dict(counts, latency=self.latency[endpoint].to_dict())
+                             for endpoint, counts in self.requests.items()},
+                'retries': dict(self.retries),
+                'stages': stages,
+            }
+
+    def summary(self) -> str:
+        report = self.report()
+        lines = [f"Metrics: {report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU, "
+                 f"{report['sleep_seconds']['total']:.2f}s asleep "
+                 f"(rate limit {report['sleep_seconds']['rate_limit']:.2f}s, "
+                 f"retry backoff {report['sleep_seconds']['retry_backoff']:.2f}s), "
+                 f"{sum(report['retries'].values())} retries"]
+        for endpoint, counts in report['requests'].items():
+            latency = counts['latency']
+            lines.append(f"  {endpoint}: {counts['attempts']} requests, {counts['bytes']} bytes, "
+                         f"p50 {latency['p50'] * 1000:.0f} ms, p99 {latency['p99'] * 1000:.0f} ms")
+        for name, stage in sorted(report['stages'].items(), key=lambda entry: -entry[1]['wall_seconds']):
+            if stage['items_per_second']:
+                rate = f", {stage['items_per_second']:.0f} items/s"
+            elif stage['items_per_cpu_second']:
+                # Normalized in worker processes: only their CPU time is known
+                rate = f", {stage['items_per_cpu_second']:.0f} items/CPU-s"
+            else:
+                rate = ""
+            lines.append(f"  {name}: {stage['wall_seconds']:.3f}s wall, {stage['cpu_seconds']:.3f}s CPU, "
+                         f"{stage['items']} items{rate}")
+        return "\n".join(lines)
+
+    def write_json(self, path: str):
+        _write_json_atomic(path, self.report())
+
+    def write_prometheus(self, path: str):
+        """Write the report in the Prometheus text exposition format
+
+        The file is replaced atomically, as node_exporter's textfile collector
+        expects.
+        """
+        report = self.report()
+        lines = [
+            '# HELP open5e_sync_run_seconds Wall time of the sync run.',
+            '# TYPE open5e_sync_run_seconds gauge',
+            f"open5e_sync_run_seconds {report['wall_seconds']}",
+        ]
+        if report['peak_rss_bytes'] is not None:
+            lines += ['# HELP open5e_sync_peak_rss_bytes Peak resident set size of the sync process.',
+                      '# TYPE open5e_sync_peak_rss_bytes gauge',
+                      f"open5e_sync_peak_rss_bytes {report['peak_rss_bytes']}"]
+        lines += ['# HELP open5e_sync_sleep_seconds Time workers spent sleeping, by reason.',
+                  '# TYPE open5e_sync_sleep_seconds gauge']
+        for reason in ('rate_limit', 'retry_backoff'):
+            lines.append(f'open5e_sync_sleep_seconds{{reason="{reason}"}} {report["sleep_seconds"][reason]}')
+        lines += ['# HELP open5e_sync_retries Requests resent, by reason.',
+                  '# TYPE open5e_sync_retries gauge']
+        for reason, count in report['retries'].items():
+            lines.append(f'open5e_sync_retries{{reason="{_label(reason)}"}} {count}')
+
+        lines += ['# HELP open5e_sync_request_seconds Latency of each HTTP attempt, by endpoint.',
+                  '# TYPE open5e_sync_request_seconds histogram']
+        with self.lock:
+            histograms = {endpoint: (hist.cumulative_counts(), sum(hist.values), len(hist.values))
+                          for endpoint, hist in self.latency.items()}
+        for endpoint, (buckets, total, count) in histograms.items():
+            label = _label(endpoint)
+            for bound, bucket_count in buckets:
+                lines.append(f'open5e_sync_request_seconds_bucket{{endpoint="{label}",le="{bound}"}} {bucket_count}')
+            lines.append(f'open5e_sync_request_seconds_sum{{endpoint="{label}"}} {total}')
+            lines.append(f'open5e_sync_request_seconds_count{{endpoint="{label}"}} {count}')
+        lines += ['# HELP open5e_sync_response_bytes Response body bytes received, by endpoint.',
+                  '# TYPE open5e_sync_response_bytes gauge']
+        for endpoint, counts in report['requests'].items():
+            lines.append(f'open5e_sync_response_bytes{{endpoint="{_label(endpoint)}"}} {counts["bytes"]}')
+
+        for metric, key, help_text in (
+                ('open5e_sync_stage_wall_seconds', 'wall_seconds', 'Exclusive wall time per pipeline stage.'),
+                ('open5e_sync_stage_cpu_seconds', 'cpu_seconds', 'Exclusive CPU time per pipeline stage.'),
+                ('open5e_sync_stage_items', 'items', 'Items produced per pipeline stage.')):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} gauge']
+            for name, stage in report['stages'].items():
+                lines.append(f'{metric}{{stage="{_label(name)}"}} {stage[key]}')
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
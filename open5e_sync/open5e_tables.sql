@@ -0,0 +1,111 @@
+-- Open5e catalog tables as read by src/services/hybridDataService.ts
+-- (columns mirror src/integrations/supabase/types.ts).
+--
+-- Safe to run against an existing database: tables are only created when
+-- missing. The unique indexes on slug are what the loader's
+-- INSERT ... ON CONFLICT (slug) needs, so run this once against Supabase too.
+
+CREATE TABLE IF NOT EXISTS public.open5e_equipment (
+  id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  type TEXT NOT NULL,
+  rarity TEXT NOT NULL DEFAULT 'common',
+  requires_attunement TEXT,
+  cost_quantity INTEGER,
+  cost_unit TEXT,
+  weight TEXT,
+  description TEXT NOT NULL,
+  document_slug TEXT NOT NULL,
+  ac INTEGER,
+  ac_base INTEGER,
+  ac_add_dex BOOLEAN,
+  ac_cap_dex INTEGER,
+  dex_bonus BOOLEAN,
+  max_dex_bonus INTEGER,
+  damage_dice TEXT,
+  damage_type TEXT,
+  category TEXT,
+  properties JSONB,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.open5e_races (
+  id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  description TEXT NOT NULL,
+  asi JSONB NOT NULL DEFAULT '[]',
+  age TEXT NOT NULL,
+  alignment TEXT NOT NULL,
+  size TEXT NOT NULL,
+  speed JSONB NOT NULL DEFAULT '{}',
+  languages TEXT NOT NULL,
+  proficiencies TEXT,
+  traits TEXT,
+  document_slug TEXT NOT NULL,
+  subraces JSONB,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.open5e_classes (
+  id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  description TEXT NOT NULL,
+  hit_die INTEGER NOT NULL,
+  prof_armor TEXT,
+  prof_weapons TEXT,
+  prof_tools TEXT,
+  prof_saving_throws TEXT,
+  prof_skills TEXT,
+  equipment TEXT,
+  spellcasting_ability TEXT,
+  subtypes_name TEXT,
+  document_slug TEXT NOT NULL,
+  archetypes JSONB,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.open5e_spells (
+  id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  description TEXT NOT NULL,
+  level TEXT NOT NULL,
+  school TEXT NOT NULL,
+  casting_time TEXT NOT NULL,
+  range_value TEXT NOT NULL,
+  components TEXT NOT NULL,
+  material TEXT,
+  duration TEXT NOT NULL,
+  ritual BOOLEAN NOT NULL DEFAULT false,
+  concentration BOOLEAN NOT NULL DEFAULT false,
+  classes JSONB,
+  higher_level TEXT,
+  attack_type TEXT,
+  damage_type TEXT,
+  save_type TEXT,
+  document_slug TEXT NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.open5e_backgrounds (
+  id UUID NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY,
+  slug TEXT NOT NULL,
+  name TEXT NOT NULL,
+  description TEXT NOT NULL,
+  skill_proficiencies TEXT,
+  languages TEXT,
+  equipment TEXT,
+  feature TEXT,
+  feature_desc TEXT,
+  document_slug TEXT NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS open5e_equipment_slug_key ON public.open5e_equipment (slug);
+CREATE UNIQUE INDEX IF NOT EXISTS open5e_races_slug_key ON public.open5e_races (slug);
+CREATE UNIQUE INDEX IF NOT EXISTS open5e_classes_slug_key ON public.open5e_classes (slug);
+CREATE UNIQUE INDEX IF NOT EXISTS open5e_spells_slug_key ON public.open5e_spells (slug);
+CREATE UNIQUE INDEX IF NOT EXISTS open5e_backgrounds_slug_key ON public.open5e_backgrounds (slug);
@@ -0,0 +1,20 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Sequence
+
+
+def map_in_processes(batch_func: Callable[[List[Any]], List[Any]], items: Sequence[Any],
+                     max_workers: int, chunk_size: int = 200) -> List[Any]:
+    """Run batch_func over chunks of items in a process pool, keeping input order
+
+    batch_func must be a module-level function (so it can be pickled) that
+    takes a list of items and returns one result per item.
+    """
+    chunks = [list(items[start:start + chunk_size]) for start in range(0, len(items), chunk_size)]
+    if max_workers <= 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in batch_func(chunk)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        for chunk_results in executor.map(batch_func, chunks):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,219 @@
+"""Shared parsers for the short, heavily repeated strings in Open5e data
+
+Strings such as "1 lb.", "30 feet" or "Dex +2" repeat across thousands of
+items, so the string parsers are memoized with bounded LRU caches and the
+patterns and lookup tables are built once at import time. Parsers return
+fresh mutable objects, so callers may modify what they get back without
+corrupting the cache.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+PARSE_CACHE_SIZE = 4096
+
+# Strings that mean "no value" rather than an unparseable one
+NO_COST_VALUES = frozenset(['—', '-', 'varies', 'special'])
+NO_WEIGHT_VALUES = frozenset(['—', '-', 'varies'])
+
+# "1,500 gp", "2.5 gp", "50 sp"
+COST_PATTERN = re.compile(r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*([a-z]{2})')
+# "1/2 lb." - tried first, otherwise "1/2 lb." would read as 2 lb.
+WEIGHT_FRACTION_PATTERN = re.compile(r'(\d+)/(\d+)')
+# "3 lb.", "3.5 lbs", or just a number
+WEIGHT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+# "1d8 slashing", "2d6+1 fire"
+DAMAGE_PATTERN = re.compile(r'(\d+d\d+(?:\+\d+)?)\s+(\w+)')
+# "30 feet", "25 ft"
+SPEED_PATTERN = re.compile(r'(\d+)')
+# "Dex +2", "Constitution +1"
+ASI_PATTERN = re.compile(r'(\w+)\s*\+(\d+)')
+# "AC 14" in armor descriptions
+AC_PATTERN = re.compile(r'AC (\d+)')
+# "1d10" or "d10" hit dice end in the die size
+HIT_DIE_PATTERN = re.compile(r'(\d+)\s*$')
+
+# "make a ranged spell attack"
+SPELL_ATTACK_PATTERN = re.compile(r'\b(melee|ranged) spell attack', re.IGNORECASE)
+# "takes 8d6 fire damage"
+SPELL_DAMAGE_PATTERN = re.compile(
+    r'\b(acid|bludgeoning|cold|fire|force|lightning|necrotic|piercing|poison|psychic|'
+    r'radiant|slashing|thunder) damage', re.IGNORECASE)
+# "must make a Dexterity saving throw"
+SPELL_SAVE_PATTERN = re.compile(
+    r'\b(strength|dexterity|constitution|intelligence|wisdom|charisma) saving throw', re.IGNORECASE)
+
+SUBRACE_PATTERNS = [
+    re.compile(r'(\w+)\s+(?:dwarf|elf|halfling|gnome|dragonborn)', re.IGNORECASE),
+    re.compile(r'(?:variant|subrace):\s*(\w+)', re.IGNORECASE),
+    re.compile(r'(\w+)\s+heritage', re.IGNORECASE),
+]
+
+ARCHETYPE_PATTERNS = [
+    re.compile(r'(?:archetype|path|tradition|circle|oath|domain|patron|school):\s*([^.\n]+)', re.IGNORECASE),
+    re.compile(r'(\w+\s+\w+)(?:\s+archetype|\s+path|\s+tradition)', re.IGNORECASE),
+]
+
+# Ability abbreviations and full names mapped to the full lowercase name
+ATTRIBUTE_NAMES = {
+    'str': 'strength', 'dex': 'dexterity', 'con': 'constitution',
+    'int': 'intelligence', 'wis': 'wisdom', 'cha': 'charisma',
+    'strength': 'strength', 'dexterity': 'dexterity',
+    'constitution': 'constitution', 'intelligence': 'intelligence',
+    'wisdom': 'wisdom', 'charisma': 'charisma'
+}
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cost(cost_str: str) -> Tuple[Optional[int], Optional[str]]:
+    """Parse "1,500 gp" style costs into (quantity, unit)"""
+    if not cost_str:
+        return None, None
+    cost_lower = cost_str.lower()
+    if cost_lower in NO_COST_VALUES:
+        return None, None
+
+    match = COST_PATTERN.search(cost_lower)
+    if match:
+        return int(float(match.group(1).replace(',', ''))), match.group(2)
+    return None, None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_weight(weight_str: str) -> Optional[float]:
+    """Parse "3 lb.", "1/2 lb." or bare numbers into pounds"""
+    if not weight_str:
+        return None
+    weight_lower = weight_str.lower()
+    if weight_lower in NO_WEIGHT_VALUES:
+        return None
+
+    match = WEIGHT_FRACTION_PATTERN.search(weight_lower)
+    if match and float(match.group(2)):
+        return float(match.group(1)) / float(match.group(2))
+
+    match = WEIGHT_PATTERN.search(weight_lower)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_damage(damage_str: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse "1d8 slashing" into (dice, damage type)"""
+    match = DAMAGE_PATTERN.search(damage_str)
+    if match:
+        return match.group(1), match.group(2)
+    return None, None
+
+
+def parse_hit_die(value: Any, default: int = 8) -> int:
+    """Read a hit die given as 10, "10", "d10" or "1d10" as its size, or `default`"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        match = HIT_DIE_PATTERN.search(value)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_speed_str(speed_str: str) -> Optional[int]:
+    match = SPEED_PATTERN.search(speed_str)
+    return int(match.group(1)) if match else None
+
+
+def parse_speed(speed_data: Any) -> Dict[str, int]:
+    """Parse speed data from various formats"""
+    if not speed_data:
+        return {'walk': 30}  # Default walking speed
+
+    if isinstance(speed_data, dict):
+        return speed_data
+
+    if isinstance(speed_data, str):
+        # Formats like "30 feet", "25 ft", etc.
+        walk = _parse_speed_str(speed_data)
+        if walk is not None:
+            return {'walk': walk}
+
+    if isinstance(speed_data, int):
+        return {'walk': speed_data}
+
+    return {'walk': 30}  # Default fallback
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_asi_str(asi_str: str) -> Tuple[Tuple[str, int], ...]:
+    return tuple(
+        (ATTRIBUTE_NAMES.get(attr.lower(), attr.lower()), int(value))
+        for attr, value in ASI_PATTERN.findall(asi_str)
+    )
+
+
+def parse_asi(asi_data: Any) -> List[Dict[str, Any]]:
+    """Parse ability score improvement data"""
+    if not asi_data:
+        return []
+
+    if isinstance(asi_data, str):
+        # Simple formats like "Dex +2, Con +1"
+        return [{'attributes': [attr], 'value': value} for attr, value in _parse_asi_str(asi_data)]
+
+    if isinstance(asi_data, list):
+        return asi_data
+
+    return []
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_spell_classes_str(classes_str: str) -> Tuple[str, ...]:
+    return tuple(name.strip() for name in classes_str.split(',') if name.strip())
+
+
+def parse_spell_classes(classes_str: Optional[str]) -> List[Dict[str, str]]:
+    """Parse "Bard, Sorcerer, Wizard" into [{"name": "Bard"}, ...]"""
+    if not classes_str:
+        return []
+    return [{'name': name} for name in _parse_spell_classes_str(classes_str)]
+
+
+def parse_spell_mechanics(description: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """First attack type, damage type and saving throw named in a spell description"""
+    if not description:
+        return None, None, None
+    attack = SPELL_ATTACK_PATTERN.search(description)
+    damage = SPELL_DAMAGE_PATTERN.search(description)
+    save = SPELL_SAVE_PATTERN.search(description)
+    return (
+        attack.group(1).lower() if attack else None,
+        damage.group(1).lower() if damage else None,
+        save.group(1).lower() if save else None,
+    )
+
+
+def parse_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hits, misses and hit rate of every memoized parser"""
+    stats = {}
+    for name, parser in (('cost', parse_cost), ('weight', parse_weight), ('damage', parse_damage),
+                         ('speed', _parse_speed_str), ('asi', _parse_asi_str),
+                         ('spell classes', _parse_spell_classes_str)):
+        info = parser.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def format_parse_cache_stats() -> List[str]:
+    """One report line per parser that was used"""
+    return [
+        f"  {name}: {stats['hit_rate'] * 100:.1f}% hits ({stats['hits']} hits, {stats['size']} distinct strings)"
+        for name, stats in parse_cache_stats().items()
+        if stats['hits'] or stats['misses']
+    ]
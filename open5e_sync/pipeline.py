@@ -0,0 +1,12 @@
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to `size` consecutive items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
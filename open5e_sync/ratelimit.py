@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread-safe token bucket that caps requests per second across workers
+
+    The rate adapts to the server (AIMD): every successful response adds a
+    little to it, up to `max_requests_per_second`, and every throttled or
+    failed response cuts it by `decrease`, down to `min_requests_per_second`.
+    A Retry-After from the server pauses every worker sharing the limiter.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1,
+                 max_requests_per_second: Optional[float] = None,
+                 min_requests_per_second: Optional[float] = None,
+                 increase: float = 1.0, decrease: float = 0.5):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.rate = requests_per_second
+        self.max_rate = max(requests_per_second, max_requests_per_second or requests_per_second)
+        self.min_rate = min(requests_per_second, min_requests_per_second or requests_per_second / 10)
+        # Roughly `increase` requests/second gained per second of healthy traffic
+        self.increase = increase
+        self.decrease = decrease
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.last_decrease = 0.0
+        self.paused_until = 0.0
+        self.stats = {'successes': 0, 'throttled': 0, 'peak_rate': requests_per_second}
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def acquire(self) -> float:
+        """Block until a request may be sent, returning the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait_time = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def on_success(self):
+        """Additive increase after a healthy response"""
+        with self.lock:
+            self.stats['successes'] += 1
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self.stats['peak_rate'] = max(self.stats['peak_rate'], self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease after a 429, 5xx or timeout
+
+        Requests already in flight when the server pushed back tend to fail
+        together, so the rate is cut at most once per second.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.stats['throttled'] += 1
+            if now - self.last_decrease >= 1.0:
+                self._refill(now)
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.tokens = min(self.tokens, 0.0)
+                self.last_decrease = now
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+    def summary(self) -> str:
+        with self.lock:
+            return (f"Rate limit: {self.rate:.2f} req/s at the end (peak {self.stats['peak_rate']:.2f}), "
+                    f"{self.stats['throttled']} throttled or failed responses")
@@ -0,0 +1,88 @@
+"""Registry of the Open5e endpoints the fetch engine knows how to sync
+
+Each endpoint is described by an EndpointSpec: where it lives, how big its
+pages are, how a raw item becomes a row, which table the rows go to and how
+duplicates are recognized. Several endpoints may feed one table (weapons,
+armor and magic items all land in open5e_equipment); their rows are
+deduplicated together, in registration order.
+
+The fetch scripts register their endpoints when imported. Adding a dataset
+(monsters, feats, conditions, ...) means registering one more spec next to a
+normalizer for its items.
+"""
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+Item = Dict[str, Any]
+
+
+def name_key(row: Item) -> Hashable:
+    """Default dedup key: the row's name, ignoring case and runs of whitespace"""
+    return ' '.join(row['name'].casefold().split())
+
+
+def slug_key(row: Item) -> Hashable:
+    """Dedup key for rows that are only duplicates when the API gave them the same slug"""
+    return row['slug']
+
+
+def name_document_key(row: Item) -> Hashable:
+    """Dedup key that keeps one row per name within each source document"""
+    return name_key(row), row.get('document_slug') or ''
+
+
+class EndpointSpec:
+    """How to fetch, normalize and store one Open5e endpoint
+
+    `normalize` turns one raw item into a row and must be a module-level
+    function so it can be sent to normalizer processes. `normalize_page`,
+    when given, does the same for a whole page at once and is used by
+    vectorized runs.
+    """
+
+    def __init__(self, path: str, table: str, fieldnames: List[str],
+                 normalize: Callable[[Item], Item], kind: str,
+                 page_size: int = 100, timeout: float = 30.0,
+                 dedup_key: Callable[[Item], Hashable] = name_key,
+                 normalize_page: Optional[Callable[[List[Item]], List[Item]]] = None):
+        self.path = path
+        self.table = table
+        self.fieldnames = fieldnames
+        self.normalize = normalize
+        # Singular item label used in log lines ("race", "weapon", ...)
+        self.kind = kind
+        self.page_size = page_size
+        self.timeout = timeout
+        self.dedup_key = dedup_key
+        self.normalize_page = normalize_page
+
+    def __repr__(self) -> str:
+        return f"EndpointSpec({self.path!r} -> {self.table!r})"
+
+
+# Registered endpoints by path, in registration order
+ENDPOINTS: Dict[str, EndpointSpec] = {}
+
+
+def register_endpoint(spec: EndpointSpec) -> EndpointSpec:
+    """Add an endpoint to the registry; a table's fieldnames must agree across its endpoints"""
+    for other in ENDPOINTS.values():
+        if other.table == spec.table and other.path != spec.path and other.fieldnames != spec.fieldnames:
+            raise ValueError(f"{spec.path} and {other.path} both feed {spec.table} with different fieldnames")
+    ENDPOINTS[spec.path] = spec
+    return spec
+
+
+def registered_tables() -> Dict[str, List[str]]:
+    """Fieldnames of every table with a registered endpoint, in registration order"""
+    tables = {}
+    for spec in ENDPOINTS.values():
+        tables.setdefault(spec.table, spec.fieldnames)
+    return tables
+
+
+def table_endpoints(table: str) -> List[EndpointSpec]:
+    """The endpoints feeding a table, in registration order"""
+    specs = [spec for spec in ENDPOINTS.values() if spec.table == table]
+    if not specs:
+        raise KeyError(f"No endpoints registered for {table}")
+    return specs
@@ -0,0 +1,49 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Never sleep longer than this for a single Retry-After
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class RetryPolicy:
+    """How often and how long to back off before resending a failed request"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than Retry-After"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(backoff, retry_after or 0.0)
+
+    def wait(self, url: str, attempt: int, reason: str, retry_after: Optional[float] = None) -> float:
+        """Report a failed attempt and sleep before the next one, returning the time slept"""
+        delay = self.delay(attempt, retry_after)
+        print(f"{reason} for {url}; retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+        return delay
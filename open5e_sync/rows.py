@@ -0,0 +1,306 @@
+"""Typed row classes for the catalog tables, validated against open5e_tables.sql
+
+Normalizers build plain dicts. Before dedup, the engine turns each one into
+the table's row class (EquipmentRow, RaceRow, ...), checking every value
+against the column it is headed for in the Supabase schema:
+
+- INTEGER columns hold ints (integer strings such as "14" are converted)
+- BOOLEAN columns hold bools ("true"/"false" strings are converted)
+- TEXT columns hold strings; numbers and flags become the text the CSV
+  import has always received ("0.5", "true")
+- JSONB columns hold JSON text of a list or object
+- NOT NULL columns must have a value
+
+A row that doesn't fit raises RowValidationError naming the table, slug,
+column and value. validate_rows() reports and skips such rows, like items
+that fail to normalize, so one bad record never reaches the Supabase import
+and never stops the rest of the run. A table exported with other columns
+than its schema is a code error and does stop the run.
+
+Row classes use __slots__, so a row holds its values without a per-row dict
+of repeated column names, and they know how to render themselves as CSV
+cells, so the writer needs no per-value type checks. They read like dicts
+(row['name'], row.get('ac'), row.items()), which is all the rest of the
+pipeline relies on. Tables without a schema entry keep their dict rows.
+"""
+import os
+import re
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from open5e_sync.registry import Item
+
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), 'open5e_tables.sql')
+
+# Filled in by the database, never by the pipeline
+SERVER_COLUMNS = ('id', 'created_at')
+
+CREATE_TABLE_PATTERN = re.compile(r'CREATE TABLE IF NOT EXISTS public\.(\w+) \((.*?)\n\);', re.DOTALL)
+COLUMN_PATTERN = re.compile(r'^\s*(\w+)\s+([A-Z]+)(.*?),?\s*$')
+INTEGER_PATTERN = re.compile(r'^\s*-?\d+\s*$')
+
+
+class RowValidationError(ValueError):
+    """A normalized row doesn't fit its table's schema"""
+
+
+class Column:
+    __slots__ = ('name', 'sql_type', 'nullable')
+
+    def __init__(self, name: str, sql_type: str, nullable: bool):
+        self.name = name
+        self.sql_type = sql_type
+        self.nullable = nullable
+
+    def __repr__(self) -> str:
+        return f"{self.name} {self.sql_type}{'' if self.nullable else ' NOT NULL'}"
+
+
+def load_schema(path: str = SCHEMA_FILE) -> Dict[str, List[Column]]:
+    """Columns the pipeline fills for each table in the schema file, in table order"""
+    with open(path, encoding='utf-8') as f:
+        schema_sql = f.read()
+    tables = {}
+    for table, body in CREATE_TABLE_PATTERN.findall(schema_sql):
+        columns = []
+        for line in body.splitlines():
+            match = COLUMN_PATTERN.match(line)
+            if match is None or match.group(1) in SERVER_COLUMNS:
+                continue
+            columns.append(Column(match.group(1), match.group(2), 'NOT NULL' not in match.group(3)))
+        tables[table] = columns
+    return tables
+
+
+TABLE_SCHEMAS = load_schema()
+
+
+# Each check returns the value as the column stores it, or raises ValueError
+
+def _check_integer(value: Any) -> Any:
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value
+    if isinstance(value, str) and INTEGER_PATTERN.match(value):
+        return int(value)
+    raise ValueError
+
+
+def _check_boolean(value: Any) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+        return value.strip().lower() == 'true'
+    raise ValueError
+
+
+def _check_text(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(value)
+    raise ValueError
+
+
+def _check_json(value: Any) -> Any:
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.lstrip()[:1] in ('[', '{'):
+        return value
+    raise ValueError
+
+
+CHECKS: Dict[str, Callable[[Any], Any]] = {
+    'INTEGER': _check_integer,
+    'BOOLEAN': _check_boolean,
+    'JSONB': _check_json,
+}
+
+
+def _text_cell(value: Any) -> str:
+    return '' if value is None else value
+
+
+def _number_cell(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def _boolean_cell(value: Any) -> str:
+    if value is None:
+        return ''
+    return 'true' if value else 'false'
+
+
+CSV_CELLS: Dict[str, Callable[[Any], str]] = {
+    'INTEGER': _number_cell,
+    'BOOLEAN': _boolean_cell,
+}
+
+
+def csv_values(item: Item, fieldnames: List[str]) -> List[str]:
+    """CSV cells of a plain dict row: None as '', flags as 'true'/'false', the rest as str()"""
+    cells = []
+    for field in fieldnames:
+        value = item.get(field)
+        if value is None:
+            cells.append('')
+        elif isinstance(value, bool):
+            cells.append(str(value).lower())
+        else:
+            cells.append(str(value))
+    return cells
+
+
+class Row:
+    """Base of the typed row classes; a subclass names its table and lists its columns as __slots__"""
+
+    __slots__ = ()
+    table = ''
+    columns: Tuple[str, ...] = ()
+    schema: Tuple[Column, ...] = ()
+
+    def __init_subclass__(cls, table: str = '', **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.table = table
+        cls.schema = tuple(TABLE_SCHEMAS[table])
+        cls.columns = tuple(column.name for column in cls.schema)
+        if tuple(cls.__slots__) != cls.columns:
+            raise TypeError(f"{cls.__name__}.__slots__ must list the columns of {table}")
+        cls._column_set = frozenset(cls.columns)
+        cls._checks = tuple((column, CHECKS.get(column.sql_type, _check_text)) for column in cls.schema)
+        cls._cells = tuple(CSV_CELLS.get(column.sql_type, _text_cell) for column in cls.schema)
+        cls._values = attrgetter(*cls.columns)
+
+    @classmethod
+    def from_item(cls, item: Item) -> 'Row':
+        """Validate a normalized dict against the schema and build the row from it"""
+        if len(item) != len(cls.columns) or not cls._column_set.issuperset(item):
+            missing = sorted(cls._column_set.difference(item))
+            unknown = sorted(set(item) - cls._column_set)
+            raise RowValidationError(f"{cls.table} row {item.get('slug')!r} doesn't match the schema "
+                                     f"(missing: {', '.join(missing) or 'none'}; "
+                                     f"not in the table: {', '.join(unknown) or 'none'})")
+        row = object.__new__(cls)
+        for column, check in cls._checks:
+            value = item[column.name]
+            try:
+                value = check(value)
+                if value is None and not column.nullable:
+                    raise ValueError
+            except ValueError:
+                raise RowValidationError(f"{cls.table} row {item.get('slug')!r}: column {column!r} "
+                                         f"can't hold {value!r}") from None
+            object.__setattr__(row, column.name, value)
+        return row
+
+    def csv_values(self) -> List[str]:
+        """The row's CSV cells, in column order"""
+        return [cell(value) for cell, value in zip(self._cells, self._values(self))]
+
+    # Read like a dict of column -> value
+
+    def __getitem__(self, column: str) -> Any:
+        if column not in self._column_set:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def __setitem__(self, column: str, value: Any):
+        if column not in self._column_set:
+            raise KeyError(column)
+        setattr(self, column, value)
+
+    def get(self, column: str, default: Any = None) -> Any:
+        return getattr(self, column) if column in self._column_set else default
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._column_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.columns
+
+    def values(self) -> Tuple[Any, ...]:
+        return self._values(self)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.columns, self._values(self))
+
+    def copy(self) -> 'Row':
+        row = object.__new__(type(self))
+        for column, value in self.items():
+            object.__setattr__(row, column, value)
+        return row
+
+    def to_dict(self) -> Item:
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Row):
+            return type(other) is type(self) and other.values() == self.values()
+        if isinstance(other, dict):
+            return other == self.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self.values()
+
+    def __setstate__(self, state: Tuple[Any, ...]):
+        for column, value in zip(self.columns, state):
+            object.__setattr__(self, column, value)
+
+
+class EquipmentRow(Row, table='open5e_equipment'):
+    __slots__ = tuple(column.name for column in TABLE_SCHEMAS['open5e_equipment'])
+
+
+class RaceRow(Row, table='open5e_races'):
+    __slots__ = tuple(column.name for column in TABLE_SCHEMAS['open5e_races'])
+
+
+class ClassRow(Row, table='open5e_classes'):
+    __slots__ = tuple(column.name for column in TABLE_SCHEMAS['open5e_classes'])
+
+
+class SpellRow(Row, table='open5e_spells'):
+    __slots__ = tuple(column.name for column in TABLE_SCHEMAS['open5e_spells'])
+
+
+class BackgroundRow(Row, table='open5e_backgrounds'):
+    __slots__ = tuple(column.name for column in TABLE_SCHEMAS['open5e_backgrounds'])
+
+
+ROW_CLASSES = {cls.table: cls for cls in (EquipmentRow, RaceRow, ClassRow, SpellRow, BackgroundRow)}
+
+
+def validate_rows(table: str, fieldnames: List[str], rows: Iterable[Item]) -> Iterator[Item]:
+    """Yield each row as its table's row class, skipping (and printing) rows that don't fit
+
+    Raises RowValidationError when the exported columns don't match the
+    schema. Tables without a row class are passed through unchanged.
+    """
+    cls = ROW_CLASSES.get(table)
+    if cls is None:
+        yield from rows
+        return
+    if tuple(fieldnames) != cls.columns:
+        raise RowValidationError(f"{table} is exported as {', '.join(fieldnames)} but "
+                                 f"{os.path.basename(SCHEMA_FILE)} has {', '.join(cls.columns)}")
+    from_item = cls.from_item
+    for row in rows:
+        try:
+            typed = from_item(row)
+        except RowValidationError as e:
+            print(f"Skipping invalid row: {e}")
+            continue
+        yield typed
@@ -0,0 +1,99 @@
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from open5e_sync.cache import CachedSession, ResponseCache
+from open5e_sync.metrics import Metrics
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.retry import RETRY_STATUSES, RetryPolicy, parse_retry_after
+
+# Only requests that are safe to send twice are retried
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a rate limiter token before every request it sends
+
+    Limiting at the adapter means responses answered from the cache never
+    wait for a token. Every response is reported back to the limiter so it
+    can adapt its rate, and 429/5xx responses, timeouts and connection errors
+    are retried per `retry_policy`, honouring Retry-After. With `metrics`,
+    every attempt's latency and size, token waits and retries are recorded.
+    """
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[Metrics] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        retries = 0
+        if self.retry_policy is not None and request.method in RETRY_METHODS:
+            retries = self.retry_policy.max_retries
+
+        for attempt in range(retries + 1):
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+                if self.metrics is not None:
+                    self.metrics.observe_sleep('rate_limit', waited)
+            started = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+                if self.metrics is not None:
+                    # Read the body here so the latency covers the whole download
+                    self.metrics.observe_request(request.url, time.perf_counter() - started,
+                                                 response.status_code, len(response.content))
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if self.metrics is not None:
+                    self.metrics.observe_request(request.url, time.perf_counter() - started, None)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_throttle()
+                if attempt == retries:
+                    raise
+                self._retry(request.url, attempt, type(e).__name__)
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(retry_after)
+            if attempt == retries:
+                return response
+            response.close()
+            self._retry(request.url, attempt, f"HTTP {response.status_code}", retry_after)
+
+    def _retry(self, url: str, attempt: int, reason: str, retry_after: Optional[float] = None):
+        delay = self.retry_policy.wait(url, attempt, reason, retry_after)
+        if self.metrics is not None:
+            self.metrics.observe_retry(reason, delay)
+
+
+def create_session(user_agent: str, pool_maxsize: int = 10,
+                   cache: Optional[ResponseCache] = None, offline: bool = False,
+                   rate_limiter: Optional[RateLimiter] = None,
+                   retry_policy: Optional[RetryPolicy] = None,
+                   metrics: Optional[Metrics] = None) -> requests.Session:
+    """Build a requests session whose connection pool fits the given number of workers
+
+    When a ResponseCache is given, GETs are answered from it where possible.
+    Requests that do go out to the network are paced by `rate_limiter` and
+    retried per `retry_policy`, and recorded in `metrics` when given.
+    """
+    session = CachedSession(cache, offline) if cache is not None else requests.Session()
+    session.headers.update({
+        'User-Agent': user_agent
+    })
+    # Size the connection pool so concurrent page fetches reuse connections
+    adapter = RateLimitedAdapter(rate_limiter, retry_policy, metrics, pool_maxsize=max(10, pool_maxsize))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
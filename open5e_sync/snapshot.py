@@ -0,0 +1,232 @@
+"""Content-addressed, zstd-compressed store of the raw API pages of every run
+
+Each fetched page is canonicalized (sorted keys, compact separators), hashed
+with SHA-256 and stored once as `objects/<aa>/<sha256>.json.zst`. A page
+that did not change since an earlier run is not written again. Every run
+writes a manifest, `runs/<run_id>.json`, listing the page hashes of each
+endpoint in order, so any run can be replayed from disk with
+--from-snapshot and two runs can be diffed without touching the network:
+
+    python -m open5e_sync.snapshot list
+    python -m open5e_sync.snapshot diff <old_run_id> latest
+
+Requires zstandard (pip install zstandard).
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from open5e_sync.delta import _write_json_atomic
+
+try:
+    import zstandard
+except ImportError:  # Only needed when snapshots are enabled
+    zstandard = None
+
+DEFAULT_SNAPSHOT_DIR = '.open5e_snapshots'
+
+# Good ratio on repetitive JSON while staying fast enough to keep up with the API
+COMPRESSION_LEVEL = 10
+
+
+class SnapshotError(RuntimeError):
+    """A snapshot run or page is missing or unreadable"""
+
+
+def _canonical_bytes(page: Dict[str, Any]) -> bytes:
+    # Same page content, same bytes, same hash - whatever the key order on the wire
+    return json.dumps(page, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class SnapshotRun:
+    """One run's manifest: the ordered page hashes of each endpoint
+
+    Runs returned by SnapshotStore.start_run() record pages as they are
+    fetched; runs returned by load_run() replay them.
+    """
+
+    def __init__(self, store: 'SnapshotStore', manifest: Dict[str, Any]):
+        self.store = store
+        self.manifest = manifest
+        self.run_id = manifest['run_id']
+        self.stats = {'pages': 0, 'new_pages': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        self.lock = threading.Lock()
+
+    def record_page(self, endpoint: str, page: Dict[str, Any]):
+        """Store a fetched page and append it to the endpoint's page list"""
+        digest, raw_size, stored_size = self.store.put(_canonical_bytes(page))
+        with self.lock:
+            entry = self.manifest['endpoints'].setdefault(endpoint, {'pages': [], 'items': 0})
+            entry['pages'].append(digest)
+            entry['items'] += len(page.get('results', []))
+            self.stats['pages'] += 1
+            self.stats['raw_bytes'] += raw_size
+            if stored_size is not None:
+                self.stats['new_pages'] += 1
+                self.stats['stored_bytes'] += stored_size
+
+    def endpoints(self) -> List[str]:
+        return list(self.manifest['endpoints'])
+
+    def iter_pages(self, endpoint: str) -> Iterator[Dict[str, Any]]:
+        """Yield an endpoint's pages from disk, in the order they were fetched"""
+        entry = self.manifest['endpoints'].get(endpoint)
+        if entry is None:
+            raise SnapshotError(f"Snapshot run {self.run_id} has no pages for {endpoint}")
+        for digest in entry['pages']:
+            yield json.loads(self.store.get(digest))
+
+    def iter_items(self, endpoint: str) -> Iterator[Dict[str, Any]]:
+        for page in self.iter_pages(endpoint):
+            yield from page.get('results', [])
+
+    def finish(self):
+        """Write the manifest; the run is only listed once this has happened"""
+        with self.lock:
+            self.manifest['finished_at'] = datetime.now(timezone.utc).isoformat()
+            self.manifest['stats'] = dict(self.stats)
+            _write_json_atomic(self.store.run_path(self.run_id), self.manifest)
+
+    def summary(self) -> str:
+        with self.lock:
+            return (f"Snapshot {self.run_id}: {self.stats['pages']} pages, {self.stats['new_pages']} new "
+                    f"({self.stats['raw_bytes']} bytes raw, {self.stats['stored_bytes']} bytes written)")
+
+
+class SnapshotStore:
+    """Directory of compressed page objects plus one manifest per run"""
+
+    def __init__(self, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, level: int = COMPRESSION_LEVEL):
+        if zstandard is None:
+            raise RuntimeError("Raw snapshots need zstandard: pip install zstandard (or pass --no-snapshot)")
+        self.snapshot_dir = snapshot_dir
+        self.level = level
+        self.objects_dir = os.path.join(snapshot_dir, 'objects')
+        self.runs_dir = os.path.join(snapshot_dir, 'runs')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.runs_dir, exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.json.zst")
+
+    def run_path(self, run_id: str) -> str:
+        return os.path.join(self.runs_dir, f"{run_id}.json")
+
+    def put(self, data: bytes) -> Tuple[str, int, Optional[int]]:
+        """Store bytes under their SHA-256
+
+        Returns the digest, the raw size and the compressed size written, which
+        is None when the object was already in the store.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return digest, len(data), None
+        compressed = zstandard.ZstdCompressor(level=self.level).compress(data)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temporary name: two endpoints may store the same page at once
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest, len(data), len(compressed)
+
+    def get(self, digest: str) -> bytes:
+        try:
+            with open(self.object_path(digest), 'rb') as f:
+                data = zstandard.ZstdDecompressor().decompress(f.read())
+        except FileNotFoundError:
+            raise SnapshotError(f"Snapshot page {digest} is missing from {self.objects_dir}") from None
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise SnapshotError(f"Snapshot page {digest} is corrupt")
+        return data
+
+    def start_run(self) -> SnapshotRun:
+        """Begin recording a new run; call finish() on it once the run succeeded"""
+        run_id = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()) + '-' + uuid.uuid4().hex[:6]
+        return SnapshotRun(self, {'run_id': run_id, 'started_at': datetime.now(timezone.utc).isoformat(),
+                                  'endpoints': {}})
+
+    def run_ids(self) -> List[str]:
+        """Finished runs, oldest first"""
+        return sorted(name[:-len('.json')] for name in os.listdir(self.runs_dir) if name.endswith('.json'))
+
+    def load_run(self, run_id: str) -> SnapshotRun:
+        """Open a finished run for replay; 'latest' is the newest one"""
+        if run_id == 'latest':
+            run_ids = self.run_ids()
+            if not run_ids:
+                raise SnapshotError(f"No snapshot runs in {self.runs_dir}")
+            run_id = run_ids[-1]
+        try:
+            with open(self.run_path(run_id), encoding='utf-8') as f:
+                return SnapshotRun(self, json.load(f))
+        except FileNotFoundError:
+            raise SnapshotError(f"No snapshot run {run_id} in {self.runs_dir}") from None
+
+
+def diff_runs(old: SnapshotRun, new: SnapshotRun, key: str = 'slug') -> Dict[str, Dict[str, List[str]]]:
+    """Added, removed and changed item keys per endpoint between two runs
+
+    Endpoints whose page hashes are identical are skipped without reading a
+    single page.
+    """
+    diff = {}
+    for endpoint in sorted(set(old.endpoints()) | set(new.endpoints())):
+        old_pages = old.manifest['endpoints'].get(endpoint, {}).get('pages', [])
+        new_pages = new.manifest['endpoints'].get(endpoint, {}).get('pages', [])
+        if old_pages == new_pages:
+            continue
+        old_items = ({item.get(key): _canonical_bytes(item) for item in old.iter_items(endpoint)}
+                     if old_pages else {})
+        new_items = ({item.get(key): _canonical_bytes(item) for item in new.iter_items(endpoint)}
+                     if new_pages else {})
+        diff[endpoint] = {
+            'added': sorted(k for k in new_items.keys() - old_items.keys()),
+            'removed': sorted(k for k in old_items.keys() - new_items.keys()),
+            'changed': sorted(k for k in new_items.keys() & old_items.keys() if new_items[k] != old_items[k]),
+        }
+    return diff
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
+    parser = argparse.ArgumentParser(prog=prog, description="List and diff raw Open5e snapshot runs")
+    parser.add_argument('--snapshot-dir', default=DEFAULT_SNAPSHOT_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help="Show every finished run")
+    diff_parser = commands.add_parser('diff', help="Items added, removed or changed between two runs")
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new', nargs='?', default='latest')
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.snapshot_dir)
+    try:
+        if args.command == 'list':
+            for run_id in store.run_ids():
+                run = store.load_run(run_id)
+                counts = ", ".join(f"{endpoint} {entry['items']}"
+                                   for endpoint, entry in run.manifest['endpoints'].items())
+                print(f"{run_id}  {counts}")
+        else:
+            old, new = store.load_run(args.old), store.load_run(args.new)
+            diff = diff_runs(old, new)
+            if not diff:
+                print(f"No changes between {old.run_id} and {new.run_id}")
+            for endpoint, changes in diff.items():
+                print(f"{endpoint}: {len(changes['added'])} added, {len(changes['removed'])} removed, "
+                      f"{len(changes['changed'])} changed")
+                for op, marker in (('added', '+'), ('removed', '-'), ('changed', '~')):
+                    for slug in changes[op]:
+                        print(f"  {marker} {slug}")
+    except SnapshotError as e:
+        parser.exit(1, f"{e}\n")
+
+
+if __name__ == '__main__':
+    main()
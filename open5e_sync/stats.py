@@ -0,0 +1,162 @@
+"""Single-pass statistics over a table's rows, for the stats reports and dashboards
+
+The engine feeds every output row of a table through a TableStats as the
+rows leave dedup, so the report costs one pass, however many breakdowns it
+shows, and works in --stream runs where the full row list never exists.
+A table's StatsSpec (registered next to its endpoints) says what to count:
+
+- `breakdowns`: columns whose values are counted (type, rarity, level, ...);
+  every table is also broken down by source document
+- `coverage`: (label, column, condition) triples; the share of rows meeting
+  the condition whose column is filled ("weapons with damage data")
+- `samples`: (label, condition) pairs; up to `sample_size` matching rows are
+  kept by reservoir sampling, so examples come from the whole table rather
+  than its first page
+
+Fill rates of every column are always collected. to_dict() gives the same
+numbers as JSON for dashboards.
+"""
+import random
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from open5e_sync.dedup import is_empty
+from open5e_sync.delta import _write_json_atomic
+from open5e_sync.registry import Item
+
+Condition = Optional[Callable[[Item], bool]]
+
+SOURCE_COLUMN = 'document_slug'
+
+
+def format_share(part: int, total: int) -> str:
+    """'part/total (percent)', without dividing by an empty total"""
+    return f"{part}/{total} ({part / total * 100:.1f}%)" if total else f"{part}/{total}"
+
+
+def _percent(part: int, total: int) -> Optional[float]:
+    return round(part / total * 100, 2) if total else None
+
+
+def _value_label(value: Any) -> str:
+    return 'unknown' if value is None or value == '' else str(value)
+
+
+class Reservoir:
+    """A uniform random sample of up to `size` items from a stream (Algorithm R)"""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        # (arrival, item) pairs, so the sample can be shown in table order
+        self.items: List[Tuple[int, Any]] = []
+
+    def add(self, item: Any):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append((self.seen, item))
+            return
+        slot = self.rng.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = (self.seen, item)
+
+    def sample(self) -> List[Any]:
+        return [item for _, item in sorted(self.items, key=lambda pair: pair[0])]
+
+
+class StatsSpec:
+    """What a table's stats report counts"""
+
+    def __init__(self, breakdowns: Sequence[str] = (), coverage: Sequence[Tuple[str, str, Condition]] = (),
+                 samples: Sequence[Tuple[str, Condition]] = (), sample_size: int = 3):
+        self.breakdowns = [column for column in breakdowns if column != SOURCE_COLUMN] + [SOURCE_COLUMN]
+        self.coverage = list(coverage)
+        self.samples = list(samples)
+        self.sample_size = sample_size
+
+
+# Registered specs by table; tables without one get breakdowns by source only
+STATS_SPECS: Dict[str, StatsSpec] = {}
+
+
+def register_stats(table: str, spec: StatsSpec) -> StatsSpec:
+    STATS_SPECS[table] = spec
+    return spec
+
+
+class TableStats:
+    """Counts, coverage, fill rates and samples of one table, updated one row at a time"""
+
+    def __init__(self, table: str, spec: Optional[StatsSpec] = None, seed: int = 0):
+        self.table = table
+        self.spec = spec or STATS_SPECS.get(table) or StatsSpec()
+        self.count = 0
+        self.breakdowns: Dict[str, Dict[str, int]] = {column: {} for column in self.spec.breakdowns}
+        self.filled: Dict[str, int] = {}
+        # [rows meeting the condition, of which filled] per coverage entry
+        self.coverage = [[0, 0] for _ in self.spec.coverage]
+        # Seeded, so a rerun over the same rows shows the same examples
+        rng = random.Random(f"{table}:{seed}")
+        self.reservoirs = [Reservoir(self.spec.sample_size, rng) for _ in self.spec.samples]
+
+    def add(self, row: Item):
+        self.count += 1
+        for column, counts in self.breakdowns.items():
+            value = _value_label(row.get(column))
+            counts[value] = counts.get(value, 0) + 1
+        filled = self.filled
+        for column, value in row.items():
+            filled[column] = filled.get(column, 0) + (not is_empty(value))
+        for counts, (_, column, condition) in zip(self.coverage, self.spec.coverage):
+            if condition is None or condition(row):
+                counts[0] += 1
+                if not is_empty(row.get(column)):
+                    counts[1] += 1
+        for reservoir, (_, condition) in zip(self.reservoirs, self.spec.samples):
+            if condition is None or condition(row):
+                reservoir.add(row)
+
+    def observe(self, rows: Iterable[Item]) -> Iterator[Item]:
+        """Pass rows through, counting each one on its way"""
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def update(self, rows: Iterable[Item]) -> 'TableStats':
+        for row in rows:
+            self.add(row)
+        return self
+
+    def breakdown(self, column: str) -> List[Tuple[str, int]]:
+        """(value, count) pairs of a breakdown column, in value order"""
+        return sorted(self.breakdowns[column].items())
+
+    def coverage_of(self, label: str) -> Tuple[int, int]:
+        """(filled, rows meeting the condition) of a coverage entry"""
+        for counts, (entry_label, _, _) in zip(self.coverage, self.spec.coverage):
+            if entry_label == label:
+                return counts[1], counts[0]
+        raise KeyError(f"{self.table} has no coverage entry {label!r}")
+
+    def sample(self, label: str) -> List[Item]:
+        for reservoir, (sample_label, _) in zip(self.reservoirs, self.spec.samples):
+            if sample_label == label:
+                return reservoir.sample()
+        raise KeyError(f"{self.table} has no sample {label!r}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.count,
+            'breakdowns': {column: dict(self.breakdown(column)) for column in self.breakdowns},
+            'fill_rates': {column: {'filled': filled, 'percent': _percent(filled, self.count)}
+                           for column, filled in self.filled.items()},
+            'coverage': {label: {'rows': rows, 'filled': filled, 'percent': _percent(filled, rows)}
+                         for (rows, filled), (label, _, _) in zip(self.coverage, self.spec.coverage)},
+            'samples': {label: [dict(row) for row in reservoir.sample()]
+                        for reservoir, (label, _) in zip(self.reservoirs, self.spec.samples)},
+        }
+
+
+def write_stats_json(path: str, stats: Dict[str, TableStats]):
+    """Write every table's stats as one JSON document"""
+    _write_json_atomic(path, {table: table_stats.to_dict() for table, table_stats in stats.items()})
@@ -0,0 +1,201 @@
+"""Column-at-a-time parsing of equipment fields over a whole page of raw items
+
+parse_equipment_columns() gives the same cost, weight, damage, rarity and
+attunement values as the per-item path in normalize_equipment_item. It
+builds one Arrow string array per field and runs the regex and string work
+as pyarrow.compute kernels over the whole page.
+
+The kernels use RE2, whose \\s, \\w and lower-casing differ from Python's
+outside ASCII. Non-ASCII strings and non-string values are therefore
+handed to the per-item parsers, so the results stay identical.
+
+Requires pyarrow (pip install pyarrow).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from open5e_sync.parsing import NO_COST_VALUES, NO_WEIGHT_VALUES, parse_cost, parse_damage, parse_weight
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Only needed for --vectorized
+    pa = None
+
+# Items normalized together when pages are streamed
+VECTORIZED_CHUNK_SIZE = 1000
+
+# RE2 versions of the parsing module's patterns. Python's ASCII \s also
+# matches \v and \x1c-\x1f, so the class is spelled out.
+_SPACE = r'[\t\n\x0b\x0c\r \x1c-\x1f]'
+COST_REGEX = r'(?P<quantity>[0-9]+(?:,[0-9]{3})*(?:\.[0-9]+)?)' + _SPACE + r'*(?P<unit>[a-z]{2})'
+WEIGHT_FRACTION_REGEX = r'(?P<numerator>[0-9]+)/(?P<denominator>[0-9]+)'
+WEIGHT_REGEX = r'(?P<pounds>[0-9]+(?:\.[0-9]+)?)'
+DAMAGE_REGEX = r'(?P<dice>[0-9]+d[0-9]+(?:\+[0-9]+)?)' + _SPACE + r'+(?P<type>[A-Za-z0-9_]+)'
+
+
+def require_pyarrow():
+    """Fail early, before anything is fetched, when pyarrow is missing"""
+    if pa is None:
+        raise RuntimeError("Vectorized normalization needs pyarrow: pip install pyarrow")
+
+
+def _is_plain(value: Any) -> bool:
+    """Whether the kernels can handle a value: a non-empty ASCII string"""
+    return isinstance(value, str) and value != '' and value.isascii()
+
+
+def _scatter(target: List[Any], positions: List[int], values: List[Any]):
+    for position, value in zip(positions, values):
+        target[position] = value
+
+
+def _vector_cost(strings: List[str]) -> Tuple[List[Optional[int]], List[Optional[str]]]:
+    lower = pc.utf8_lower(pa.array(strings, pa.string()))
+    blank = pc.is_in(lower, value_set=pa.array(sorted(NO_COST_VALUES), pa.string()))
+    match = pc.extract_regex(lower, COST_REGEX)
+    quantity = pc.cast(pc.trunc(pc.cast(pc.replace_substring(pc.struct_field(match, 'quantity'), ',', ''),
+                                        pa.float64())), pa.int64())
+    unit = pc.struct_field(match, 'unit')
+    null_int = pa.scalar(None, pa.int64())
+    null_str = pa.scalar(None, pa.string())
+    quantity = pc.if_else(pc.or_kleene(blank, pc.is_null(match)), null_int, quantity)
+    unit = pc.if_else(pc.or_kleene(blank, pc.is_null(match)), null_str, unit)
+    return quantity.to_pylist(), unit.to_pylist()
+
+
+def _vector_weight(strings: List[str]) -> List[Optional[float]]:
+    lower = pc.utf8_lower(pa.array(strings, pa.string()))
+    blank = pc.is_in(lower, value_set=pa.array(sorted(NO_WEIGHT_VALUES), pa.string()))
+
+    fraction = pc.extract_regex(lower, WEIGHT_FRACTION_REGEX)
+    numerator = pc.cast(pc.struct_field(fraction, 'numerator'), pa.float64())
+    denominator = pc.cast(pc.struct_field(fraction, 'denominator'), pa.float64())
+    # A "x/0" fraction falls through to the plain number, as in parse_weight
+    use_fraction = pc.fill_null(pc.not_equal(denominator, 0.0), False)
+
+    plain = pc.cast(pc.struct_field(pc.extract_regex(lower, WEIGHT_REGEX), 'pounds'), pa.float64())
+    weight = pc.if_else(use_fraction, pc.divide(numerator, denominator), plain)
+    return pc.if_else(blank, pa.scalar(None, pa.float64()), weight).to_pylist()
+
+
+def _vector_damage(strings: List[str]) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    match = pc.extract_regex(pa.array(strings, pa.string()), DAMAGE_REGEX)
+    matched = pc.is_valid(match)
+    null_str = pa.scalar(None, pa.string())
+    dice = pc.if_else(matched, pc.struct_field(match, 'dice'), null_str)
+    damage_type = pc.if_else(matched, pc.struct_field(match, 'type'), null_str)
+    return dice.to_pylist(), damage_type.to_pylist()
+
+
+def _vector_rarity(strings: List[str]) -> List[str]:
+    # Empty strings never reach the kernels, so only "none" needs replacing
+    array = pa.array(strings, pa.string())
+    return pc.if_else(pc.equal(pc.utf8_lower(array), 'none'), 'common', array).to_pylist()
+
+
+def _vector_mentions_attunement(strings: List[str]) -> List[bool]:
+    # ASCII only, so ignore_case matches Python's lower()
+    return pc.match_substring(pa.array(strings, pa.string()), 'requires attunement', ignore_case=True).to_pylist()
+
+
+def _scalar_rarity(rarity: Any) -> Any:
+    if not rarity or (isinstance(rarity, str) and rarity.lower() == 'none'):
+        return 'common'
+    return rarity
+
+
+def parse_equipment_columns(items: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Parse cost, weight, damage, rarity and attunement for a page of raw items
+
+    Returns one list per field (cost_quantity, cost_unit, weight, damage_dice,
+    damage_type, rarity, requires_attunement), aligned with `items`.
+    """
+    require_pyarrow()
+    count = len(items)
+    cost_quantity, cost_unit = [None] * count, [None] * count
+    weight = [None] * count
+    damage_dice, damage_type = [None] * count, [None] * count
+    rarity, requires_attunement = [None] * count, [None] * count
+
+    # One pass sorts every value into a kernel input (position + string) or
+    # handles it right away the way normalize_equipment_item does
+    kernel_inputs = {field: ([], []) for field in ('cost', 'weight', 'damage', 'rarity', 'desc')}
+    for position, item in enumerate(items):
+        cost = item.get('cost')
+        if _is_plain(cost):
+            kernel_inputs['cost'][0].append(position)
+            kernel_inputs['cost'][1].append(cost)
+        elif cost:
+            if isinstance(cost, dict):
+                cost_quantity[position], cost_unit[position] = cost.get('quantity'), cost.get('unit')
+            elif isinstance(cost, str):
+                cost_quantity[position], cost_unit[position] = parse_cost(cost)
+
+        value = item.get('weight')
+        if _is_plain(value):
+            kernel_inputs['weight'][0].append(position)
+            kernel_inputs['weight'][1].append(value)
+        elif value:
+            if isinstance(value, (int, float)):
+                weight[position] = float(value)
+            elif isinstance(value, str):
+                weight[position] = parse_weight(value)
+
+        damage = item.get('damage')
+        if _is_plain(damage):
+            kernel_inputs['damage'][0].append(position)
+            kernel_inputs['damage'][1].append(damage)
+        elif damage:
+            if isinstance(damage, dict):
+                damage_dice[position], damage_type[position] = damage.get('damage_dice'), damage.get('damage_type')
+            elif isinstance(damage, str):
+                damage_dice[position], damage_type[position] = parse_damage(damage)
+
+        # Missing, empty or "none" rarity means common
+        value = item.get('rarity', 'common')
+        if _is_plain(value):
+            kernel_inputs['rarity'][0].append(position)
+            kernel_inputs['rarity'][1].append(value)
+        else:
+            rarity[position] = _scalar_rarity(value)
+
+        # An explicit truthy attunement wins, otherwise look in the description
+        flag = item.get('requires_attunement', False)
+        requires_attunement[position] = flag
+        desc = item.get('desc', '')
+        if not flag and desc:
+            if _is_plain(desc):
+                kernel_inputs['desc'][0].append(position)
+                kernel_inputs['desc'][1].append(desc)
+            else:
+                requires_attunement[position] = 'requires attunement' in desc.lower()
+
+    positions, strings = kernel_inputs['cost']
+    if strings:
+        quantities, units = _vector_cost(strings)
+        _scatter(cost_quantity, positions, quantities)
+        _scatter(cost_unit, positions, units)
+    positions, strings = kernel_inputs['weight']
+    if strings:
+        _scatter(weight, positions, _vector_weight(strings))
+    positions, strings = kernel_inputs['damage']
+    if strings:
+        dice, types = _vector_damage(strings)
+        _scatter(damage_dice, positions, dice)
+        _scatter(damage_type, positions, types)
+    positions, strings = kernel_inputs['rarity']
+    if strings:
+        _scatter(rarity, positions, _vector_rarity(strings))
+    positions, strings = kernel_inputs['desc']
+    if strings:
+        _scatter(requires_attunement, positions, _vector_mentions_attunement(strings))
+
+    return {
+        'cost_quantity': cost_quantity,
+        'cost_unit': cost_unit,
+        'weight': weight,
+        'damage_dice': damage_dice,
+        'damage_type': damage_type,
+        'rarity': rarity,
+        'requires_attunement': requires_attunement,
+    }
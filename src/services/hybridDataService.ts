@@ -154,39 +154,42 @@ class HybridDataService {
     }
 
     try {
-      // Always try API first for spells since database seems to be empty
-      const apiSpells = await open5eApi.fetchSpells();
-      
-      if (apiSpells && apiSpells.length > 0) {
-        this.cache.spells = apiSpells;
-        this.cache.lastFetch = Date.now();
-        return apiSpells;
-      }
-
-      // Only fallback to database if API fails
       const { data: dbSpells, error } = await supabase
         .from('open5e_spells')
         .select('*');
 
       if (error) {
         console.warn('Error fetching spells from database:', error);
-        // Return empty array if both sources fail
-        this.cache.spells = [];
+        const apiSpells = await open5eApi.fetchSpells();
+        this.cache.spells = apiSpells;
         this.cache.lastFetch = Date.now();
-        return [];
+        return apiSpells;
       }
 
       const transformedSpells = (dbSpells || []).map(this.transformSupabaseSpell);
-      this.cache.spells = transformedSpells;
-      this.cache.lastFetch = Date.now();
-      return transformedSpells;
-      
+
+      if (transformedSpells.length > 0) {
+        this.cache.spells = transformedSpells;
+        this.cache.lastFetch = Date.now();
+        return transformedSpells;
+      } else {
+        const apiSpells = await open5eApi.fetchSpells();
+        this.cache.spells = apiSpells;
+        this.cache.lastFetch = Date.now();
+        return apiSpells;
+      }
     } catch (error) {
       console.error('Error in fetchSpells:', error);
-      // Return empty array on error
-      this.cache.spells = [];
-      this.cache.lastFetch = Date.now();
-      return [];
+      try {
+        const apiSpells = await open5eApi.fetchSpells();
+        this.cache.spells = apiSpells;
+        this.cache.lastFetch = Date.now();
+        return apiSpells;
+      } catch (apiError) {
+        // Return empty array if both sources fail; not cached, so the next call retries
+        console.error('Error fetching spells from API:', apiError);
+        return [];
+      }
     }
   }
 
@@ -0,0 +1,38 @@
+"""sync_main end to end against the benchmark stub: a failed sync must exit non-zero"""
+import os
+
+import pytest
+
+from benchmarks.stub_server import StubServer, synthetic_item
+from open5e_sync.cli import sync_main
+
+TABLE = 'open5e_spells'
+
+
+def sync(stub, output_dir):
+    return sync_main([TABLE, '--base-url', stub.base_url, '--rps', '50', '--retries', '0',
+                      '--no-cache', '--no-checkpoint', '--no-snapshot',
+                      '--output-dir', str(output_dir), '--stats', 'stats.json'])
+
+
+def stub_server(error_rate=0.0):
+    corpus = {'/spells': [synthetic_item('/spells', index) for index in range(5)]}
+    return StubServer(corpus, error_rate=error_rate)
+
+
+def test_successful_sync_returns(tmp_path):
+    with stub_server() as stub:
+        assert sync(stub, tmp_path) is None
+    assert os.path.exists(tmp_path / f'{TABLE}.csv')
+
+
+def test_failed_sync_exits_non_zero(tmp_path):
+    # Every request fails with a 500 and is not retried
+    with stub_server(error_rate=1.0) as stub:
+        with pytest.raises(SystemExit) as excinfo:
+            sync(stub, tmp_path)
+        assert stub.stats['errors'] >= 1
+    assert excinfo.value.code == 1
+    assert not os.path.exists(tmp_path / f'{TABLE}.csv')
+    # The stats report is still written for the failed run
+    assert os.path.exists(tmp_path / 'stats.json')
@@ -0,0 +1,71 @@
+"""The Parquet, catalog and bundle exports of normalized equipment rows"""
+import json
+import sqlite3
+
+import pytest
+
+from fetch_equipment_data import Open5eEquipmentFetcher
+from open5e_sync.bundle import encode_rows
+from open5e_sync.catalog import Catalog, write_catalog
+
+TABLE = 'open5e_equipment'
+FIELDNAMES = ['slug', 'name', 'requires_attunement']
+
+ITEMS = [
+    {'slug': 'staff-of-power', 'name': 'Staff of Power', 'requires_attunement': 'requires attunement by a wizard'},
+    {'slug': 'cloak', 'name': 'Cloak', 'requires_attunement': '', 'desc': 'Requires attunement.'},
+    {'slug': 'rope', 'name': 'Rope', 'requires_attunement': '', 'desc': 'Fifty feet of hempen rope.'},
+    {'slug': 'ring', 'name': 'Ring', 'requires_attunement': None},
+]
+
+# The CSV export's spelling of each row's flag
+EXPECTED = {
+    'staff-of-power': 'requires attunement by a wizard',
+    'cloak': 'true',
+    'rope': 'false',
+    'ring': None,
+}
+
+
+@pytest.fixture
+def rows():
+    fetcher = Open5eEquipmentFetcher()
+    return [fetcher.normalize_equipment_item(item, 'magic-item') for item in ITEMS]
+
+
+def test_columnar_keeps_attunement_text(rows, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    from open5e_sync.columnar import write_columnar
+
+    filename = str(tmp_path / 'equipment.parquet')
+    write_columnar(rows, FIELDNAMES, TABLE, filename)
+    table = pq.read_table(filename)
+    assert str(table.schema.field('requires_attunement').type) == 'string'
+    assert dict(zip(table.column('slug').to_pylist(), table.column('requires_attunement').to_pylist())) == EXPECTED
+
+
+def test_catalog_keeps_attunement_text(rows, tmp_path):
+    path = str(tmp_path / 'catalog.sqlite')
+    write_catalog(path, [(TABLE, rows, FIELDNAMES)])
+    with sqlite3.connect(path) as conn:
+        stored = dict(conn.execute(f'SELECT slug, requires_attunement FROM {TABLE}'))
+    assert stored == EXPECTED
+
+
+def test_bundle_keeps_attunement_text(rows):
+    data, count = encode_rows(TABLE, rows, FIELDNAMES)
+    assert count == len(ITEMS)
+    encoded = {row['slug']: row['requires_attunement'] for row in json.loads(data)}
+    # Flags read from the description stay JSON booleans
+    assert encoded == {**EXPECTED, 'cloak': True, 'rope': False}
+
+
+def test_catalog_counts_stored_rows(rows, tmp_path, capsys):
+    path = str(tmp_path / 'catalog.sqlite')
+    # The later copy of a slug replaces the earlier one
+    copy = {**rows[0], 'name': 'Staff of Power (copy)'}
+    assert write_catalog(path, [(TABLE, rows + [copy], FIELDNAMES)]) == {TABLE: len(rows)}
+    assert '1 rows of open5e_equipment replaced' in capsys.readouterr().out
+    with Catalog(path) as catalog:
+        assert catalog.count(TABLE) == len(rows)
+        assert catalog.get(TABLE, 'staff-of-power')['name'] == 'Staff of Power (copy)'
@@ -0,0 +1,120 @@
+"""RateLimiter and RateLimitedAdapter against the benchmark stub's throttling (429 + Retry-After)"""
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubServer, synthetic_item
+from open5e_sync.ratelimit import RateLimiter
+from open5e_sync.retry import RetryPolicy
+from open5e_sync.session import create_session
+
+
+class NoWaitRetryPolicy(RetryPolicy):
+    """Retries straight away, ignoring backoff and Retry-After, so a test never sleeps"""
+
+    def delay(self, attempt, retry_after=None):
+        return 0.0
+
+
+@pytest.fixture
+def stub():
+    # Two requests per second, then 429 with Retry-After: 1
+    corpus = {'/spells': [synthetic_item('/spells', index) for index in range(5)]}
+    with StubServer(corpus, throttle_rps=2) as server:
+        yield server
+
+
+def spells_url(stub):
+    return f"{stub.base_url}/spells/?limit=5"
+
+
+def test_throttled_response_halves_the_rate(stub):
+    limiter = RateLimiter(20, max_requests_per_second=40)
+    session = create_session('test', rate_limiter=limiter, retry_policy=RetryPolicy(0))
+
+    assert [session.get(spells_url(stub)).status_code for _ in range(2)] == [200, 200]
+    # Each healthy response adds a little to the rate
+    assert limiter.rate > 20
+    rate_before = limiter.rate
+
+    assert session.get(spells_url(stub)).status_code == 429
+    assert limiter.rate == pytest.approx(rate_before * 0.5)
+    assert limiter.stats == {'successes': 2, 'throttled': 1, 'peak_rate': rate_before}
+    assert stub.stats['throttled'] == 1
+
+
+def test_rate_is_cut_once_per_second_and_never_below_the_floor():
+    limiter = RateLimiter(8, min_requests_per_second=2)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    limiter.on_throttle()
+    # Requests failing together count as one sign of overload
+    assert limiter.rate == 4
+    assert limiter.stats['throttled'] == 3
+
+    for _ in range(3):
+        limiter.last_decrease -= 1.0
+        limiter.on_throttle()
+    assert limiter.rate == 2
+
+
+def test_retry_after_pauses_every_worker(stub):
+    limiter = RateLimiter(50)
+    session = create_session('test', rate_limiter=limiter, retry_policy=RetryPolicy(0))
+    for _ in range(2):
+        session.get(spells_url(stub))
+    throttled_at = time.monotonic()
+    assert session.get(spells_url(stub)).status_code == 429
+
+    # Another worker sharing the limiter waits out the stub's Retry-After: 1
+    waits = []
+    worker = threading.Thread(target=lambda: waits.append(limiter.acquire()))
+    worker.start()
+    worker.join()
+    assert time.monotonic() - throttled_at >= 0.95
+    assert waits[0] >= 0.5
+
+
+def test_retry_after_is_honoured_before_retrying(stub):
+    limiter = RateLimiter(50)
+    session = create_session('test', rate_limiter=limiter, retry_policy=RetryPolicy(2, base_delay=0.0))
+    for _ in range(2):
+        session.get(spells_url(stub))
+
+    started = time.monotonic()
+    response = session.get(spells_url(stub))
+    # Refused once, then accepted once the stub's one-second window has moved on
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.95
+    assert stub.stats['throttled'] == 1
+    assert limiter.stats['throttled'] == 1
+
+
+def test_exhausted_retries_return_the_last_throttled_response(stub):
+    session = create_session('test', retry_policy=NoWaitRetryPolicy(3))
+    for _ in range(2):
+        session.get(spells_url(stub))
+
+    response = session.get(spells_url(stub))
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+    # The first attempt and three retries, all refused
+    assert stub.stats['throttled'] == 4
+    assert stub.stats['requests'] == 6
+
+
+def test_exhausted_retries_raise_the_connection_error():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    limiter = RateLimiter(50)
+    session = create_session('test', rate_limiter=limiter, retry_policy=NoWaitRetryPolicy(2))
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(f"http://127.0.0.1:{port}/spells/", timeout=1)
+    # Every attempt told the limiter; connection errors carry no Retry-After
+    assert limiter.stats['throttled'] == 3
+    assert limiter.paused_until == 0.0
@@ -0,0 +1,89 @@
+"""normalize_equipment_page (pyarrow kernels) must build the same rows as normalize_equipment_item"""
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from fetch_equipment_data import EQUIPMENT_ENDPOINTS, Open5eEquipmentFetcher
+from open5e_sync.engine import iter_normalized
+from open5e_sync.registry import ENDPOINTS
+
+ITEMS = [
+    # Non-ASCII names and descriptions go through the per-item parsers
+    {'slug': 'epee-de-lumiere', 'name': 'Épée de Lumière', 'rarity': 'Très rare',
+     'desc': 'Une épée légère. Requires attunement by a paladin.', 'document__slug': 'tob'},
+    {'slug': 'drachenschuppe', 'name': 'Drachenschuppe', 'cost': '1.500 gp',
+     'weight': '½ lb.', 'desc': 'Schuppenpanzer, ａｃ 14', 'document__slug': 'tob'},
+    # Dict-shaped cost and damage
+    {'slug': 'longsword', 'name': 'Longsword', 'cost': {'quantity': 15, 'unit': 'gp'},
+     'damage': {'damage_dice': '1d8', 'damage_type': 'slashing'}, 'weight': 3,
+     'properties': ['versatile (1d10)'], 'desc': 'A versatile blade.', 'document__slug': 'wotc-srd'},
+    {'slug': 'dagger', 'name': 'Dagger', 'cost': '2 GP', 'damage': '1d4 piercing',
+     'weight': '1 lb.', 'properties': ['finesse', 'light', 'thrown'], 'document__slug': 'wotc-srd'},
+    {'slug': 'great-axe', 'name': 'Great Axe', 'cost': '1,500 gp', 'damage': '2d6+1 fire',
+     'desc': 'Heavy, two-handed. Not lightning.', 'document__slug': 'wotc-srd'},
+    # "x/0" weight fractions fall through to the plain number
+    {'slug': 'feather', 'name': 'Feather', 'weight': '1/0 lb.', 'cost': '—'},
+    {'slug': 'pebble', 'name': 'Pebble', 'weight': '1/4 lb.', 'cost': 'varies'},
+    {'slug': 'shadow', 'name': 'Shadow', 'weight': '0/0', 'cost': 'special'},
+    {'slug': 'bag', 'name': 'Bag', 'weight': '-', 'cost': '', 'damage': ''},
+    # 'none', empty or missing rarity means common
+    {'slug': 'rope', 'name': 'Rope', 'rarity': 'none'},
+    {'slug': 'torch', 'name': 'Torch', 'rarity': 'None'},
+    {'slug': 'chalk', 'name': 'Chalk', 'rarity': ''},
+    {'slug': 'candle', 'name': 'Candle', 'rarity': None},
+    {'slug': 'lamp', 'name': 'Lamp'},
+    # Bool-like attunement strings are kept as given; only a falsy flag reads the description
+    {'slug': 'ring-a', 'name': 'Ring A', 'requires_attunement': 'requires attunement',
+     'desc': 'A very rare ring.', 'rarity': 'very rare'},
+    {'slug': 'ring-b', 'name': 'Ring B', 'requires_attunement': 'false', 'desc': 'Requires attunement.'},
+    {'slug': 'ring-c', 'name': 'Ring C', 'requires_attunement': '', 'desc': 'REQUIRES ATTUNEMENT by a wizard'},
+    {'slug': 'ring-d', 'name': 'Ring D', 'requires_attunement': True, 'desc': None},
+    {'slug': 'ring-e', 'name': 'Ring E', 'requires_attunement': False, 'desc': 'Legendary, cursed.'},
+    # Missing text fields
+    {'slug': None, 'name': None, 'desc': None, 'cost': None, 'weight': None, 'damage': None},
+]
+
+# Shapes the API shouldn't send; non-string rarity is kept, a dict description fails its item
+MALFORMED = ITEMS[:3] + [
+    {'slug': 'orb', 'name': 'Orb', 'rarity': 3, 'cost': 15},
+    {'slug': 'gem', 'name': 'Gem', 'rarity': ['rare'], 'weight': ['1 lb.']},
+    {'slug': 'tome', 'name': 'Tome', 'desc': {'text': 'Requires attunement.'}},
+] + ITEMS[3:]
+
+
+@pytest.mark.parametrize('item_type', list(EQUIPMENT_ENDPOINTS.values()) + ['shield'])
+def test_page_rows_match_item_rows(item_type):
+    fetcher = Open5eEquipmentFetcher()
+    expected = [fetcher.normalize_equipment_item(item, item_type) for item in ITEMS]
+    assert fetcher.normalize_equipment_page(ITEMS, item_type) == expected
+
+
+@pytest.mark.parametrize('item', ITEMS, ids=lambda item: str(item['slug']))
+def test_single_item_page_matches(item):
+    fetcher = Open5eEquipmentFetcher()
+    expected = [fetcher.normalize_equipment_item(item, 'magic-item')]
+    assert fetcher.normalize_equipment_page([item], 'magic-item') == expected
+
+
+def test_items_are_not_modified():
+    fetcher = Open5eEquipmentFetcher()
+    before = repr(ITEMS)
+    fetcher.normalize_equipment_page(ITEMS, 'weapon')
+    assert repr(ITEMS) == before
+
+
+def test_malformed_items_only_lose_themselves():
+    fetcher = Open5eEquipmentFetcher(vectorized=True)
+    spec = ENDPOINTS['/magicitems']
+    expected = list(iter_normalized(MALFORMED, spec.normalize, spec.kind))
+    assert [row['slug'] for row in expected] == [item['slug'] or '' for item in MALFORMED if item['slug'] != 'tome']
+    # The page normalizer fails on the dict description, so that page is redone one item at a time
+    assert list(fetcher.normalize_items(spec, MALFORMED)) == expected
+
+
+def test_non_string_rarity_page_matches():
+    fetcher = Open5eEquipmentFetcher()
+    items = [item for item in MALFORMED if item['slug'] in ('orb', 'gem')]
+    expected = [fetcher.normalize_equipment_item(item, 'magic-item') for item in items]
+    assert fetcher.normalize_equipment_page(items, 'magic-item') == expected
+    assert [row['rarity'] for row in expected] == [3, ['rare']]